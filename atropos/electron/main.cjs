@@ -2,6 +2,8 @@ const { app, BrowserWindow, ipcMain, Tray, Menu, nativeImage, Notification, dial
 const path = require('path');
 const fs = require('fs').promises;
 const os = require('os');
+const zlib = require('zlib');
+const { promisify } = require('util');
 const chokidar = require('chokidar');
 
 let mainWindow;
@@ -193,6 +195,10 @@ async function getDataRoot() {
     return MOIRAI_DATA;
 }
 
+// Folders under a data root that hold no day folders of their own: per-device
+// roots are merged into the main tree (scripts/merge_devices.py)
+const SKIPPED_DIRS = new Set(['devices', 'pyramid', 'archive']);
+
 async function findLatestDataFolder(dir) {
     let latestDate = null;
     let latestPath = null;
@@ -208,7 +214,7 @@ async function findLatestDataFolder(dir) {
                             latestDate = entry.name;
                             latestPath = fullPath;
                         }
-                    } else {
+                    } else if (!SKIPPED_DIRS.has(entry.name)) {
                         await scan(fullPath);
                     }
                 }
@@ -219,6 +225,13 @@ async function findLatestDataFolder(dir) {
     }
 
     await scan(dir);
+    // A tree compacted up to today keeps its latest day in an archive
+    for (const { date } of await listArchivedDays(dir)) {
+        if (!latestDate || date > latestDate) {
+            latestDate = date;
+            latestPath = path.join(dir, date.slice(0, 4), date.slice(5, 7), date);
+        }
+    }
     return latestPath;
 }
 
@@ -253,15 +266,171 @@ async function ensureDemoData() {
 // ─────────────────────────────────────────────
 //  IPC Handlers — Telemetry & Data
 // ─────────────────────────────────────────────
+const gunzip = promisify(zlib.gunzip);
+const inflateRaw = promisify(zlib.inflateRaw);
+
+const TELEMETRY_NAMES = ['raw_telemetry.json', 'raw_telemetry.json.gz'];
+// The scripts can also read these, but Node's zlib cannot decode them
+const UNREADABLE_CODECS = ['.bz2', '.xz'];
+
+// Quarter archives (scripts/compact_archive.py): archive/YYYY-Qn.zip at the
+// data root holds one member per day file, "YYYY-MM-DD/<file>", plain JSON
+// deflated and .gz files stored. The central directory is read once per
+// archive version, then only the wanted member is read and inflated.
+const zipDirectories = new Map();
+
+function quarterOf(date) {
+    return `${date.slice(0, 4)}-Q${Math.floor((Number(date.slice(5, 7)) - 1) / 3) + 1}`;
+}
+
+function archivePathFor(dayDir) {
+    // Day folders sit at <root>/YYYY/MM/YYYY-MM-DD
+    const date = path.basename(dayDir);
+    return path.join(dayDir, '..', '..', '..', 'archive', `${quarterOf(date)}.zip`);
+}
+
+// {member name: {method, crc, size, offset}}; empty if the archive is missing
+async function readZipDirectory(zipPath) {
+    let handle;
+    try {
+        handle = await fs.open(zipPath, 'r');
+    } catch (err) {
+        if (err.code === 'ENOENT') return new Map();
+        throw err;
+    }
+    try {
+        const { size, mtimeMs } = await handle.stat();
+        const cached = zipDirectories.get(zipPath);
+        if (cached && cached.size === size && cached.mtimeMs === mtimeMs) return cached.members;
+
+        // End of central directory record: last 22 bytes plus an optional comment
+        const tail = Buffer.alloc(Math.min(size, 22 + 0xffff));
+        await handle.read(tail, 0, tail.length, size - tail.length);
+        let end = tail.length - 22;
+        while (end >= 0 && tail.readUInt32LE(end) !== 0x06054b50) end--;
+        if (end < 0) throw new Error(`${zipPath} is not a zip archive`);
+        const count = tail.readUInt16LE(end + 10);
+        const directory = Buffer.alloc(tail.readUInt32LE(end + 12));
+        await handle.read(directory, 0, directory.length, tail.readUInt32LE(end + 16));
+
+        const members = new Map();
+        for (let pos = 0, i = 0; i < count; i++) {
+            if (directory.readUInt32LE(pos) !== 0x02014b50) throw new Error(`${zipPath}: corrupt central directory`);
+            const nameLength = directory.readUInt16LE(pos + 28);
+            members.set(directory.toString('utf-8', pos + 46, pos + 46 + nameLength), {
+                method: directory.readUInt16LE(pos + 10),
+                crc: directory.readUInt32LE(pos + 16),
+                size: directory.readUInt32LE(pos + 20),
+                offset: directory.readUInt32LE(pos + 42),
+            });
+            pos += 46 + nameLength + directory.readUInt16LE(pos + 30) + directory.readUInt16LE(pos + 32);
+        }
+        zipDirectories.set(zipPath, { size, mtimeMs, members });
+        return members;
+    } finally {
+        await handle.close();
+    }
+}
+
+async function readZipMember(zipPath, member) {
+    const handle = await fs.open(zipPath, 'r');
+    try {
+        const header = Buffer.alloc(30);
+        await handle.read(header, 0, 30, member.offset);
+        const data = Buffer.alloc(member.size);
+        await handle.read(data, 0, member.size, member.offset + 30 + header.readUInt16LE(26) + header.readUInt16LE(28));
+        if (member.method === 0) return data;
+        if (member.method === 8) return await inflateRaw(data);
+        throw new Error(`${zipPath}: unsupported compression method ${member.method}`);
+    } finally {
+        await handle.close();
+    }
+}
+
+// [{date, zipPath, name, member}] for the telemetry of every archived day under a data root
+async function listArchivedDays(root) {
+    const days = [];
+    let archives = [];
+    try {
+        archives = (await fs.readdir(path.join(root, 'archive'))).filter((name) => name.endsWith('.zip')).sort();
+    } catch (e) { }
+    for (const archive of archives) {
+        const zipPath = path.join(root, 'archive', archive);
+        try {
+            const members = await readZipDirectory(zipPath);
+            const dates = new Set([...members.keys()].map((key) => key.split('/')[0]));
+            for (const date of [...dates].sort()) {
+                const name = TELEMETRY_NAMES.find((n) => members.has(`${date}/${n}`));
+                if (name) days.push({ date, zipPath, name, member: members.get(`${date}/${name}`) });
+            }
+        } catch (err) {
+            console.error(`Error reading ${zipPath}:`, err);
+        }
+    }
+    return days;
+}
+
+async function decodeDayFile(name, data) {
+    return (name.endsWith('.gz') ? await gunzip(data) : data).toString('utf-8');
+}
+
+// A day file as text, from its folder or, once the quarter is compacted,
+// from its archive; `names` are tried in order and .gz files decompressed
+async function readDayFile(dayDir, names) {
+    for (const name of names) {
+        try {
+            return await decodeDayFile(name, await fs.readFile(path.join(dayDir, name)));
+        } catch (err) {
+            if (err.code !== 'ENOENT') throw err;
+        }
+    }
+    const date = path.basename(dayDir);
+    const zipPath = archivePathFor(dayDir);
+    const members = await readZipDirectory(zipPath);
+    for (const name of names) {
+        const member = members.get(`${date}/${name}`);
+        if (member) return decodeDayFile(name, await readZipMember(zipPath, member));
+    }
+    for (const suffix of UNREADABLE_CODECS) {
+        const name = names[0] + suffix;
+        const inFolder = await fs.access(path.join(dayDir, name)).then(() => true, () => false);
+        if (inFolder || members.has(`${date}/${name}`)) {
+            throw new Error(`${date}: ${name} uses a codec Atropos cannot read; decompress it or use gzip`);
+        }
+    }
+    const err = new Error(`${date}: no ${names[0]}`);
+    err.code = 'ENOENT';
+    throw err;
+}
+
+// Days may be stored plain, gzip-compressed (scripts/compress_archive.py) or
+// inside a quarter archive (scripts/compact_archive.py)
+async function readTelemetryFile(dayDir) {
+    return readDayFile(dayDir, TELEMETRY_NAMES);
+}
+
 ipcMain.handle('read-latest-telemetry', async () => {
     try {
         const root = await getDataRoot();
         const dailyPath = await findLatestDataFolder(root);
         if (!dailyPath) return { error: "No data found. Please run Clotho first." };
 
-        const jsonPath = path.join(dailyPath, 'raw_telemetry.json');
-        const data = await fs.readFile(jsonPath, 'utf-8');
-        return JSON.parse(data);
+        const data = JSON.parse(await readTelemetryFile(dailyPath));
+        // Schema 2.0.0 stores "t" (ms since meta.base) instead of an ISO "ts";
+        // Date and dayjs take epoch milliseconds as readily as strings
+        if (data.meta?.version === '2.0.0' && Array.isArray(data.events)) {
+            for (const evt of data.events) evt.ts = data.meta.base + evt.t;
+        }
+        // --string-table days store indexes into meta.strings for these fields
+        const strings = data.meta?.strings;
+        if (Array.isArray(strings) && Array.isArray(data.events)) {
+            for (const evt of data.events) {
+                for (const key of ['type', 'title', 'process', 'button']) {
+                    if (typeof evt[key] === 'number') evt[key] = strings[evt[key]];
+                }
+            }
+        }
+        return data;
     } catch (err) {
         console.error("Error reading telemetry:", err);
         return { error: err.message };
@@ -274,12 +443,12 @@ ipcMain.handle('read-daily-summary', async () => {
         const dailyPath = await findLatestDataFolder(root);
         if (!dailyPath) return { error: "No data found." };
 
-        const mdPath = path.join(dailyPath, 'daily_summary.md');
-        try { await fs.access(mdPath); } catch {
+        try {
+            return { content: await readDayFile(dailyPath, ['daily_summary.md']) };
+        } catch (err) {
+            if (err.code !== 'ENOENT') throw err;
             return { error: "No summary found. Run Lachesis first." };
         }
-        const content = await fs.readFile(mdPath, 'utf-8');
-        return { content };
     } catch (err) {
         console.error("Error reading summary:", err);
         return { error: err.message };
@@ -289,9 +458,42 @@ ipcMain.handle('read-daily-summary', async () => {
 ipcMain.handle('get-calendar-data', async () => {
     try {
         const root = await getDataRoot();
-        const calendarData = [];
-        const currentYear = new Date().getFullYear();
 
+        // Fast path: index.json (scripts/build_index.py) already holds every
+        // day's metrics, so a day whose files still match its index entry is
+        // answered without parsing the day file
+        let indexed = {};
+        try {
+            const index = JSON.parse(await fs.readFile(path.join(root, 'index.json'), 'utf-8'));
+            if (index.version === 1 && index.days) indexed = index.days;
+        } catch (e) { }
+
+        const calendar = new Map();
+        function addDay(date, metrics) {
+            calendar.set(date, {
+                date,
+                flow: metrics?.flow_score_estimate || 0,
+                keystrokes: metrics?.total_keystrokes || 0
+            });
+        }
+
+        // True if the index entry still describes the day file in the folder
+        async function indexIsFresh(dayDir, entry) {
+            for (const name of TELEMETRY_NAMES) {
+                const recorded = entry.files?.[name];
+                if (!recorded) continue;
+                try {
+                    const st = await fs.stat(path.join(dayDir, name));
+                    return st.size === recorded.size && Math.abs(st.mtimeMs / 1000 - recorded.mtime) < 0.002;
+                } catch (e) {
+                    return false;
+                }
+            }
+            return false;
+        }
+
+        // Days recorded (or changed) since index.json was written are read
+        // from their day files, so Clotho's new days show up without a rebuild
         async function scanDirectory(dir) {
             try {
                 const entries = await fs.readdir(dir, { withFileTypes: true });
@@ -299,17 +501,17 @@ ipcMain.handle('get-calendar-data', async () => {
                     const fullPath = path.join(dir, entry.name);
                     if (entry.isDirectory()) {
                         if (/^\d{4}-\d{2}-\d{2}$/.test(entry.name)) {
-                            const jsonPath = path.join(fullPath, 'raw_telemetry.json');
+                            const cached = indexed[entry.name];
+                            if (cached && await indexIsFresh(fullPath, cached)) {
+                                addDay(entry.name, cached.metrics);
+                                continue;
+                            }
                             try {
-                                const content = await fs.readFile(jsonPath, 'utf-8');
-                                const data = JSON.parse(content);
-                                calendarData.push({
-                                    date: entry.name,
-                                    flow: data.metrics?.flow_score_estimate || 0,
-                                    keystrokes: data.metrics?.total_keystrokes || 0
-                                });
-                            } catch (e) { }
-                        } else {
+                                addDay(entry.name, JSON.parse(await readTelemetryFile(fullPath)).metrics);
+                            } catch (err) {
+                                if (err.code !== 'ENOENT') console.error(`Error reading ${fullPath}:`, err.message);
+                            }
+                        } else if (!SKIPPED_DIRS.has(entry.name)) {
                             await scanDirectory(fullPath);
                         }
                     }
@@ -318,7 +520,23 @@ ipcMain.handle('get-calendar-data', async () => {
         }
 
         await scanDirectory(root);
-        return calendarData;
+
+        // Compacted quarters: index entries of archived days record each
+        // member's stored size and CRC
+        for (const { date, zipPath, name, member } of await listArchivedDays(root)) {
+            if (calendar.has(date)) continue;
+            const recorded = indexed[date]?.files?.[name];
+            if (recorded && recorded.size === member.size && recorded.crc === member.crc) {
+                addDay(date, indexed[date].metrics);
+                continue;
+            }
+            try {
+                addDay(date, JSON.parse(await decodeDayFile(name, await readZipMember(zipPath, member))).metrics);
+            } catch (err) {
+                console.error(`Error reading ${date} from ${zipPath}:`, err.message);
+            }
+        }
+        return [...calendar.values()].sort((a, b) => a.date.localeCompare(b.date));
     } catch (err) {
         console.error("Error scanning calendar:", err);
         return [];
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Idle intervals and rolling flow scores of a day (activity.json)
+Usage: python activity.py [--force] [--windows 5,15,60] [--idle-gap 30] [data_dir | day_dir]
+
+The gap between two consecutive events is active time when it is at most
+--idle-gap seconds and an idle interval otherwise. Each minute of the
+day's span gets a bucket of active seconds, keystrokes, mouse pixels and
+focus switches. The flow score of a window combines those sums (see
+flow_score): how much of the window was active, how hard the user typed
+and pointed while active, and how rarely focus moved. Rolling scores for
+each window are kept as running sums over the last N minute buckets, so
+every event costs O(1) and every minute O(windows).
+
+activity.json stores the minute buckets along with the rolling series and
+24 hourly scores, so the charts can pick a series (or rolling_flow() can
+build another window from the buckets) without rescanning the events.
+The generator writes activity.json for every day; run this script to
+backfill a tree.
+"""
+
+import argparse
+import json
+from collections import deque
+from pathlib import Path
+
+from archive import load_day_json
+from sessions import IDLE_GAP_SECONDS
+from telemetry_io import DayClock, atomic_open, backfill_tree, write_sidecar
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+ACTIVITY_FILE = "activity.json"
+ACTIVITY_VERSION = 1
+WINDOWS = [5, 15, 60]  # rolling window lengths in minutes
+FIELDS = ["active_seconds", "keystrokes", "mouse_px", "focus_switches"]
+
+# Rates that earn the full typing/pointing share of the flow score
+FLOW_KEYSTROKES_PER_MIN = 150
+FLOW_MOUSE_PX_PER_MIN = 1500
+
+def flow_score(active_seconds, keystrokes, mouse_px, focus_switches, minutes):
+    """
+    0-100 flow score of a window of `minutes` from its bucket sums: the active
+    share of the window times a blend of typing (50%) and pointing (20%)
+    intensity per active minute and focus stability (30%, halved at one
+    switch per active minute)
+    """
+    if active_seconds <= 0:
+        return 0
+    active_minutes = active_seconds / 60
+    typing = min(1, keystrokes / active_minutes / FLOW_KEYSTROKES_PER_MIN)
+    pointing = min(1, mouse_px / active_minutes / FLOW_MOUSE_PX_PER_MIN)
+    stability = 1 / (1 + focus_switches / active_minutes)
+    active = min(1, active_seconds / (minutes * 60))
+    return round(100 * active * (0.5 * typing + 0.2 * pointing + 0.3 * stability))
+
+class RollingSum:
+    """Column sums over the last `size` rows pushed (older rows drop out)"""
+
+    def __init__(self, size, width=len(FIELDS)):
+        self.size = size
+        self.sums = [0] * width
+        self._rows = deque()
+
+    def push(self, row):
+        self._rows.append(row)
+        for i, value in enumerate(row):
+            self.sums[i] += value
+        if len(self._rows) > self.size:
+            for i, value in enumerate(self._rows.popleft()):
+                self.sums[i] -= value
+
+    def score(self):
+        return flow_score(*self.sums, self.size)
+
+class ActivityBuilder:
+    """Minute buckets, idle intervals and rolling flow; feed add(event) in time order (either schema), then document()"""
+
+    def __init__(self, windows=WINDOWS, idle_gap=IDLE_GAP_SECONDS):
+        self.windows = sorted(windows)
+        self.idle_gap = idle_gap
+        self.idle = []        # (start second, end second) of each idle interval
+        self.rows = []        # one [active_seconds, keystrokes, mouse_px, focus_switches] per minute
+        self.flow = {window: [] for window in self.windows}
+        self.first_minute = None
+        self._rolling = [RollingSum(window) for window in self.windows]
+        self._row = None      # bucket of the current minute
+        self._minute = None
+        self._last_second = None
+        self._clock = DayClock()
+
+    def _advance(self, minute):
+        """Close every minute bucket before `minute` and update the rolling windows"""
+        while self._minute < minute:
+            self.rows.append(self._row)
+            for window, rolling in zip(self.windows, self._rolling):
+                rolling.push(self._row)
+                self.flow[window].append(rolling.score())
+            self._row = [0, 0, 0, 0]
+            self._minute += 1
+
+    def add(self, event):
+        second = self._clock.second(event)
+        minute = second // 60
+        if self._minute is None:
+            self.first_minute = self._minute = minute
+            self._row = [0, 0, 0, 0]
+        else:
+            last = self._last_second
+            if second - last > self.idle_gap:
+                self.idle.append((last, second))
+                self._advance(minute)
+            else:
+                # A short gap is active time, split at the minute boundaries it crosses
+                while self._minute < minute:
+                    boundary = (self._minute + 1) * 60
+                    self._row[0] += boundary - last
+                    last = boundary
+                    self._advance(self._minute + 1)
+                self._row[0] += second - last
+        row = self._row
+        event_type = event["type"]
+        if event_type == "keystroke":
+            row[1] += event.get("count", 1)
+        elif event_type == "mouse_move":
+            row[2] += event.get("distance_px", 0)
+        elif event_type == "focus_change":
+            row[3] += 1
+        self._last_second = second
+
+    def document(self, date_str):
+        """The activity.json document; the last minute closes at the last event"""
+        if self._row is not None:
+            self._advance(self._minute + 1)
+            self._row = None
+        hours = [[0, 0, 0, 0] for _ in range(24)]
+        for minute, row in enumerate(self.rows, self.first_minute or 0):
+            hour = hours[minute // 60 % 24]
+            for i, value in enumerate(row):
+                hour[i] += value
+        active_seconds = sum(row[0] for row in self.rows)
+        return {
+            "version": ACTIVITY_VERSION,
+            "date": date_str,
+            "idle_gap": self.idle_gap,
+            "windows": self.windows,
+            "active_minutes": round(active_seconds / 60),
+            "idle_minutes": round(1440 - active_seconds / 60),
+            "idle": [[_clock(start), _clock(end)] for start, end in self.idle],
+            "start": _clock((self.first_minute or 0) * 60)[:5],
+            "fields": FIELDS,
+            "minutes": self.rows,
+            "flow": {str(window): series for window, series in self.flow.items()},
+            "hours": [flow_score(*hour, 60) for hour in hours],
+        }
+
+    def write(self, path, date_str):
+        document = self.document(date_str)
+        with atomic_open(path, 'w') as f:
+            json.dump(document, f, separators=(",", ":"))
+        return document
+
+def _clock(second):
+    return f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+
+def rolling_flow(document, window):
+    """A rolling flow series for any window (minutes) from an activity.json's minute buckets"""
+    if str(window) in document["flow"]:
+        return document["flow"][str(window)]
+    rolling = RollingSum(window)
+    series = []
+    for row in document["minutes"]:
+        rolling.push(row)
+        series.append(rolling.score())
+    return series
+
+def flow_points(document, window=None):
+    """[{"time": "HH:MM", "flow": score}] - the FlowChart data shape; hourly when window is None"""
+    if window is None:
+        return [{"time": f"{hour}:00", "flow": score} for hour, score in enumerate(document["hours"])]
+    hour, minute = int(document["start"][:2]), int(document["start"][3:])
+    start = hour * 60 + minute
+    return [{"time": f"{(start + i) // 60:02d}:{(start + i) % 60:02d}", "flow": score}
+            for i, score in enumerate(rolling_flow(document, window))]
+
+def load_activity(day_dir):
+    """A day's activity.json (from its folder or archive), or None if missing/unreadable"""
+    return load_day_json(day_dir, ACTIVITY_FILE, ACTIVITY_VERSION)
+
+def activity_day(day_dir, force=False, windows=WINDOWS, idle_gap=IDLE_GAP_SECONDS):
+    """Write activity.json for one day; returns False if it was up to date"""
+    def same_params():
+        current = load_activity(day_dir)
+        return current and (current["windows"], current["idle_gap"]) == (sorted(windows), idle_gap)
+    return write_sidecar(day_dir, ACTIVITY_FILE, ActivityBuilder(windows, idle_gap), force, same_params)
+
+def activity_tree(root, force=False, windows=WINDOWS, idle_gap=IDLE_GAP_SECONDS):
+    """activity.json for every day folder under root (or for root itself if it is a day folder)"""
+    return backfill_tree(root, lambda day_dir: activity_day(day_dir, force, windows, idle_gap),
+                         "computing activity for")
+
+def _windows(text):
+    return sorted({int(value) for value in text.split(",")})
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Idle intervals and rolling flow scores (activity.json)")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR,
+                        help="data root, or one YYYY-MM-DD day folder (default: assets/demo_data)")
+    parser.add_argument("--windows", type=_windows, default=WINDOWS, metavar="N,N,...",
+                        help=f"rolling window lengths in minutes (default: {','.join(map(str, WINDOWS))})")
+    parser.add_argument("--idle-gap", type=int, default=IDLE_GAP_SECONDS,
+                        help=f"seconds without events that count as idle (default: {IDLE_GAP_SECONDS})")
+    parser.add_argument("--force", action="store_true", help="rewrite activity.json even if it is up to date")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    written, skipped = activity_tree(args.data_dir, args.force, args.windows, args.idle_gap)
+    print(f"✓ Computed activity for {written} days ({skipped} already up to date) under {args.data_dir}")
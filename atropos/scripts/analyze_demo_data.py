@@ -3,64 +3,401 @@
 Quick stats viewer for generated demo data
 """
 
+import argparse
 import json
 import os
 from pathlib import Path
-from datetime import datetime
-from collections import defaultdict
+from collections import Counter
+from multiprocessing import Pool
+
+from archive import ARCHIVE_DIR, DayArchive, iter_archives, load_day_telemetry
+from build_index import INDEX_FILE, file_stats, load_index
+from columnar import fresh_columnar, read_header
+from manifest import MANIFEST_FILE
+from pyramid import LEVELS, PYRAMID_DIR, load_level, load_summary, period_bounds, period_of
+from rollup import hourly, load_rollup
+from sketches import QUANTILES, SKETCHES, SKETCHES_FILE, LogHistogram, load_sketches, merge_sketch_dicts
+from telemetry_io import DATE_DIR_RE, DEVICES_DIR, TELEMETRY_NAMES, day_dir_for
 
 OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+CACHE_FILE = ".analysis_cache.json"
+CACHE_VERSION = 6
+# Bookkeeping files at the data root, rebuilt from the day folders: storage
+# totals leave them out so every mode reports the same Total Size
+DERIVED_ROOT_FILES = {INDEX_FILE, CACHE_FILE, MANIFEST_FILE, "generation.json"}
+
+def root_bytes(root_files):
+    """Size of the data root's own files ({name: {"size", ...}}), derived ones left out"""
+    return sum(f["size"] for name, f in root_files.items() if name not in DERIVED_ROOT_FILES)
+
+def new_stats():
+    """
+    Empty accumulator for the figures the report prints.
+    Every field is a sum or a counter, so stats from disjoint sets of days
+    merge with merge_stats() in any order.
+    """
+    return {
+        "total_days": 0,
+        "total_events": 0,
+        "total_keystrokes": 0,
+        "total_mouse_dist": 0,
+        "flow_hist": Counter(),  # flow score -> days
+        "app_usage": Counter(),  # top window -> days
+        "total_size": 0,
+        "rollup_days": 0,
+        "hourly_keystrokes": [0] * 24,  # summed over days with a rollup.json
+        "devices": {},  # device_id -> {"days", "events", "keystrokes", "mouse_dist"} (merged days)
+        "sketch_days": 0,
+        "sketches": {},  # name -> merged LogHistogram dict, over days with a sketches.json
+    }
+
+def _device_partials(metrics):
+    """Per-device figures of a merged multi-device day (merge_devices.py), or None"""
+    devices = metrics.get("devices")
+    if not devices:
+        return None
+    return {device_id: {"events": m.get("events", 0), "keystrokes": m.get("total_keystrokes", 0),
+                        "mouse_dist": m.get("total_mouse_dist_pixels", 0)}
+            for device_id, m in devices.items()}
+
+def _add_devices(into, devices, days=1):
+    for device_id, figures in devices.items():
+        totals = into.setdefault(device_id, {"days": 0, "events": 0, "keystrokes": 0, "mouse_dist": 0})
+        totals["days"] += figures.get("days", days)
+        for key in ("events", "keystrokes", "mouse_dist"):
+            totals[key] += figures[key]
+
+def merge_stats(into, other):
+    """Reduce step: fold another stats accumulator into `into`"""
+    for key in ("total_days", "total_events", "total_keystrokes", "total_mouse_dist", "total_size",
+                "rollup_days", "sketch_days"):
+        into[key] += other[key]
+    into["hourly_keystrokes"] = [a + b for a, b in zip(into["hourly_keystrokes"], other["hourly_keystrokes"])]
+    into["flow_hist"].update(other["flow_hist"])
+    into["app_usage"].update(other["app_usage"])
+    _add_devices(into["devices"], other["devices"])
+    merge_sketch_dicts(into["sketches"], other["sketches"])
+    return into
+
+def day_partial(day_dir, files=None):
+    """
+    Per-day partial aggregate: everything the report needs from one day.
+    Partials are plain JSON-able dicts so they can be cached and merged.
+    Archived days (no folder left) are read from their quarter's zip. The
+    hourly profile comes only from rollup.json: days without one are left
+    out of it rather than decoded a second time.
+    """
+    columnar_file = fresh_columnar(day_dir)
+    if columnar_file:
+        header = read_header(columnar_file)
+        event_count = header["rows"]
+        metrics = header.get("metrics", {})
+    else:
+        data = load_day_telemetry(day_dir)
+        event_count = len(data.get("events", []))
+        metrics = data.get("metrics", {})
+    rollup = load_rollup(day_dir)
+    sketches = load_sketches(day_dir)
+    files = file_stats(day_dir) if files is None else files
+    return {
+        "keystrokes": metrics.get("total_keystrokes", 0),
+        "mouse_dist": metrics.get("total_mouse_dist_pixels", 0),
+        "flow_score": metrics.get("flow_score_estimate", 0),
+        "top_window": metrics.get("top_window", "Unknown"),
+        "events": event_count,
+        "bytes": sum(f["size"] for f in files.values()),
+        "hourly_keystrokes": hourly(rollup, "keystrokes") if rollup else None,
+        "devices": _device_partials(metrics),
+        "sketches": sketches["sketches"] if sketches else None,
+    }
+
+def add_partial(stats, partial):
+    """Merge one day's partial into the stats"""
+    stats["total_days"] += 1
+    stats["total_events"] += partial["events"]
+    stats["total_keystrokes"] += partial["keystrokes"]
+    stats["total_mouse_dist"] += partial["mouse_dist"]
+    stats["flow_hist"][partial["flow_score"]] += 1
+    stats["app_usage"][partial["top_window"]] += 1
+    stats["total_size"] += partial["bytes"]
+    if partial.get("hourly_keystrokes"):
+        stats["rollup_days"] += 1
+        stats["hourly_keystrokes"] = [a + b for a, b in zip(stats["hourly_keystrokes"], partial["hourly_keystrokes"])]
+    if partial.get("devices"):
+        _add_devices(stats["devices"], partial["devices"])
+    if partial.get("sketches"):
+        stats["sketch_days"] += 1
+        merge_sketch_dicts(stats["sketches"], partial["sketches"])
+
+def in_range(date_str, start=None, end=None):
+    """True if a 'YYYY-MM-DD' date lies in start..end (either end may be None)"""
+    return (start is None or date_str >= start) and (end is None or date_str <= end)
+
+def scan_tree(root):
+    """
+    Single traversal of the data tree.
+    Returns ([(day_dir, file_stats)], other_bytes): every day folder holding
+    a raw_telemetry.json (plain or compressed) with the stats of its files, plus the size of the
+    root's own files (see root_bytes), so storage totals need no second pass.
+    Archived days are listed under their would-be folder path with the stats
+    of their zip members, in date order with the rest. Per-device roots
+    (devices/) and the pyramid/ summaries are left out: device days are
+    counted through the merged day folders.
+    """
+    root = Path(root)
+    days, other_bytes = [], 0
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        if directory in (root / ARCHIVE_DIR, root / DEVICES_DIR, root / PYRAMID_DIR):
+            continue
+        files, subdirs = {}, []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(Path(entry.path))
+                elif entry.is_file():
+                    st = entry.stat()
+                    files[entry.name] = {"size": st.st_size, "mtime": round(st.st_mtime, 3)}
+        if DATE_DIR_RE.match(directory.name) and any(name in files for name in TELEMETRY_NAMES):
+            days.append((directory, files))
+        elif directory == root:
+            other_bytes = root_bytes(files)
+        stack.extend(sorted(subdirs, reverse=True))
+
+    in_folders = {day_dir.name for day_dir, _ in days}
+    archived = []
+    for path in iter_archives(root):
+        with DayArchive(path) as archive:
+            archived.extend((day_dir_for(root, date_str), archive.file_stats(date_str))
+                            for date_str in archive.dates()
+                            if date_str not in in_folders and archive.telemetry_name(date_str))
+    if archived:
+        days = sorted(days + archived, key=lambda day: day[0].name)
+    return days, other_bytes
+
+def _load_cache(root):
+    try:
+        with open(root / CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("days", {}) if cache.get("version") == CACHE_VERSION else {}
+
+def _save_cache(root, days):
+    tmp_path = root / (CACHE_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CACHE_VERSION, "days": days}, f, separators=(",", ":"))
+    os.replace(tmp_path, root / CACHE_FILE)
+
+def collect_incremental(root=None, start=None, end=None):
+    """
+    Incremental analysis backed by a persistent per-day cache.
+    Entries are keyed by the day folder's path and validated against the
+    size and mtime of its files, so only new or changed days are decoded;
+    entries for deleted days are pruned (days outside start..end are left
+    as cached). Returns (stats, recomputed, reused).
+    """
+    root = Path(root or OUTPUT_DIR)
+    cached = _load_cache(root)
+    days = {}
+    stats = new_stats()
+    recomputed = reused = 0
+    day_dirs, other_bytes = scan_tree(root)
+    for day_dir, files in day_dirs:
+        key = day_dir.relative_to(root).as_posix()
+        entry = cached.get(key)
+        if not in_range(day_dir.name, start, end):
+            if entry:
+                days[key] = entry
+            continue
+        if entry and entry["files"] == files:
+            reused += 1
+        else:
+            try:
+                entry = {"files": files, "partial": day_partial(day_dir, files)}
+            except Exception as e:
+                print(f"Error reading {day_dir}: {e}")
+                continue
+            recomputed += 1
+        days[key] = entry
+        add_partial(stats, entry["partial"])
+    if start is None and end is None:
+        stats["total_size"] += other_bytes
+    if recomputed or len(days) != len(cached):
+        _save_cache(root, days)
+    return stats, recomputed, reused
+
+def collect_sketches(root, dates, start=None, end=None):
+    """
+    (sketch_days, merged sketches) over `dates`: each year, quarter or month
+    lying wholly inside start..end comes from its pyramid summary (when that
+    covers the same days), the remaining days from their sketches.json
+    """
+    root = Path(root)
+    dates = sorted(dates)
+    if not dates:
+        return 0, {}
+    first, last = start or dates[0], end or dates[-1]
+    left = set(dates)
+    sketch_days, merged = 0, {}
+    for level in ("year", "quarter", "month"):
+        for period in sorted({period_of(level, d) for d in left}):
+            lo, hi = period_bounds(level, period)
+            if lo < first or hi > last:
+                continue
+            inside = {d for d in left if lo <= d <= hi}
+            summary = load_summary(root, level, period)
+            if summary and summary["days"] == len(inside) and "sketches" in summary:
+                sketch_days += summary["sketch_days"]
+                merge_sketch_dicts(merged, summary["sketches"])
+                left -= inside
+    for date_str in sorted(left):
+        sketches = load_sketches(day_dir_for(root, date_str))
+        if sketches:
+            sketch_days += 1
+            merge_sketch_dicts(merged, sketches["sketches"])
+    return sketch_days, merged
+
+def collect_from_index(index, root=None, start=None, end=None):
+    """
+    Answer from index.json - no day file is opened, except the sketches.json
+    of days not covered by a whole pyramid period
+    """
+    stats = new_stats()
+    days = {d: entry for d, entry in index["days"].items() if in_range(d, start, end)}
+    for entry in days.values():
+        metrics = entry.get("metrics", {})
+        add_partial(stats, {
+            "keystrokes": metrics.get("total_keystrokes", 0),
+            "mouse_dist": metrics.get("total_mouse_dist_pixels", 0),
+            "flow_score": metrics.get("flow_score_estimate", 0),
+            "top_window": metrics.get("top_window", "Unknown"),
+            "events": entry.get("events", 0),
+            "bytes": sum(f["size"] for f in entry.get("files", {}).values()),
+            "hourly_keystrokes": entry.get("hourly_keystrokes"),
+            "devices": _device_partials(metrics),
+        })
+    if start is None and end is None:
+        stats["total_size"] += root_bytes(index.get("root_files", {}))
+    stats["sketch_days"], stats["sketches"] = collect_sketches(root or OUTPUT_DIR, days, start, end)
+    return stats
+
+def _analyze_shard(shard):
+    """Map step: stats for one shard of (day_dir, files) pairs"""
+    stats = new_stats()
+    for day_dir, files in shard:
+        try:
+            add_partial(stats, day_partial(day_dir, files))
+        except Exception as e:
+            print(f"Error reading {day_dir}: {e}")
+    return stats
+
+def collect_from_tree(workers=1, root=None, start=None, end=None):
+    """
+    Read every day folder in start..end (map-reduce across processes when
+    workers > 1). Each worker reduces a shard to one stats accumulator; the
+    parent merges them.
+    """
+    days, other_bytes = scan_tree(root or OUTPUT_DIR)
+    if start is not None or end is not None:
+        days = [day for day in days if in_range(day[0].name, start, end)]
+        other_bytes = 0
+    workers = max(1, min(workers, len(days)))
+    # Contiguous date shards, merged in order, keep counter ordering (and so
+    # tie-breaks in the report) identical to a serial run
+    size = -(-len(days) // workers) if days else 1
+    shards = [days[i:i + size] for i in range(0, len(days), size)] or [[]]
+    if workers > 1:
+        with Pool(workers) as pool:
+            partials = pool.map(_analyze_shard, shards)
+    else:
+        partials = map(_analyze_shard, shards)
+
+    stats = new_stats()
+    for partial in partials:
+        merge_stats(stats, partial)
+    stats["total_size"] += other_bytes
+    return stats
 
-def analyze_data():
-    """Analyze generated demo data"""
+def collect_from_level(level, root=None):
+    """Answer from the pyramid's summaries of one level - no day folder is opened"""
+    summaries = load_level(root or OUTPUT_DIR, level)
+    stats = new_stats()
+    for summary in summaries:
+        stats["total_days"] += summary["days"]
+        stats["total_events"] += summary["events"]
+        stats["total_keystrokes"] += summary["keystrokes"]
+        stats["total_mouse_dist"] += summary["mouse_px"]
+        stats["total_size"] += summary["bytes"]
+        stats["flow_hist"].update({int(s): n for s, n in summary["flow_hist"].items()})
+        stats["app_usage"].update(summary["top_windows"])
+        stats["rollup_days"] += summary["rollup_days"]
+        stats["hourly_keystrokes"] = [a + row[0] for a, row in zip(stats["hourly_keystrokes"], summary["hours"])]
+        stats["sketch_days"] += summary["sketch_days"]
+        merge_sketch_dicts(stats["sketches"], summary["sketches"])
+    return summaries, stats
+
+def print_periods(level, summaries):
+    """One line per period of a pyramid level"""
+    print(f"\n📅 {level.upper()} SUMMARIES ({PYRAMID_DIR}/{level})")
+    print(f"{'─' * 70}")
+    print(f"  {'Period':10s} {'Days':>5s} {'Avg Flow':>9s} {'Keystrokes':>12s}  Top Application")
+    for summary in summaries:
+        days = summary["days"]
+        avg_flow = sum(int(s) * n for s, n in summary["flow_hist"].items()) / days if days else 0
+        apps = summary["app_seconds"] or summary["top_windows"]
+        top_app = max(apps.items(), key=lambda x: x[1])[0] if apps else "-"
+        print(f"  {summary['period']:10s} {days:5d} {avg_flow:9.1f} {summary['keystrokes']:12,}  {top_app}")
+
+def analyze_data(use_index=True, incremental=False, workers=1, level=None, root=None, start=None, end=None):
+    """
+    Analyze generated demo data (under `root`, default assets/demo_data),
+    optionally only the days in start..end ('YYYY-MM-DD' strings).
+    Answers from index.json when present, from the per-day cache with
+    incremental=True, from the pyramid with level=month|quarter|year, and
+    otherwise by reading every day across `workers` processes.
+    """
+    root = Path(root or OUTPUT_DIR)
     print("=" * 70)
     print("MOIRAI ATROPOS DEMO DATA ANALYSIS")
     print("=" * 70)
+    if level and (start or end):
+        print("❌ --level reports whole periods; drop --start/--end")
+        return
+    if start or end:
+        print(f"  (days {start or 'first'} to {end or 'last'})")
     
-    total_days = 0
-    total_events = 0
-    total_keystrokes = 0
-    total_mouse_dist = 0
-    flow_scores = []
-    app_usage = defaultdict(int)
-    
-    # Walk through all date directories
-    for year_dir in sorted(OUTPUT_DIR.glob("*")):
-        if not year_dir.is_dir() or year_dir.name == "user.json":
-            continue
-            
-        for month_dir in sorted(year_dir.glob("*")):
-            if not month_dir.is_dir():
-                continue
-                
-            for day_dir in sorted(month_dir.glob("*")):
-                if not day_dir.is_dir():
-                    continue
-                    
-                telemetry_file = day_dir / "raw_telemetry.json"
-                if not telemetry_file.exists():
-                    continue
-                
-                try:
-                    with open(telemetry_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    total_days += 1
-                    total_events += len(data.get("events", []))
-                    
-                    metrics = data.get("metrics", {})
-                    total_keystrokes += metrics.get("total_keystrokes", 0)
-                    total_mouse_dist += metrics.get("total_mouse_dist_pixels", 0)
-                    flow_scores.append(metrics.get("flow_score_estimate", 0))
-                    
-                    top_app = metrics.get("top_window", "Unknown")
-                    app_usage[top_app] += 1
-                    
-                except Exception as e:
-                    print(f"Error reading {telemetry_file}: {e}")
+    index = load_index(root) if use_index and not incremental and not level else None
+    if level:
+        summaries, stats = collect_from_level(level, root)
+        if not summaries:
+            print(f"❌ No {level} summaries in {root / PYRAMID_DIR}; run pyramid.py first")
+            return
+        print_periods(level, summaries)
+    elif incremental:
+        stats, recomputed, reused = collect_incremental(root, start, end)
+        print(f"  (incremental: {recomputed} days recomputed, {reused} from {CACHE_FILE})")
+    elif index:
+        print(f"  (answered from {INDEX_FILE}; run build_index.py after editing days)")
+        stats = collect_from_index(index, root, start, end)
+    else:
+        stats = collect_from_tree(workers, root, start, end)
+    print_report(stats)
+
+def print_report(stats):
+    """Print the analysis report for collected stats"""
+    total_days = stats["total_days"]
+    total_events = stats["total_events"]
+    total_keystrokes = stats["total_keystrokes"]
+    total_mouse_dist = stats["total_mouse_dist"]
+    flow_hist = stats["flow_hist"]
+    app_usage = stats["app_usage"]
+    total_size = stats["total_size"]
     
     # Calculate stats
-    avg_flow = sum(flow_scores) / len(flow_scores) if flow_scores else 0
+    scored_days = sum(flow_hist.values())
+    avg_flow = sum(s * n for s, n in flow_hist.items()) / scored_days if scored_days else 0
     avg_keystrokes = total_keystrokes / total_days if total_days else 0
     avg_events = total_events / total_days if total_days else 0
     
@@ -86,29 +423,93 @@ def analyze_data():
     # Flow score distribution
     print(f"\n📈 FLOW SCORE DISTRIBUTION")
     print(f"{'─' * 70}")
-    ranges = {
-        "90-100 (Exceptional)": sum(1 for s in flow_scores if 90 <= s <= 100),
-        "75-89  (High)":        sum(1 for s in flow_scores if 75 <= s < 90),
-        "60-74  (Good)":        sum(1 for s in flow_scores if 60 <= s < 75),
-        "45-59  (Moderate)":    sum(1 for s in flow_scores if 45 <= s < 60),
-        "0-44   (Low)":         sum(1 for s in flow_scores if s < 45),
-    }
+    bands = [(90, "90-100 (Exceptional)"), (75, "75-89  (High)"), (60, "60-74  (Good)"),
+             (45, "45-59  (Moderate)"), (0, "0-44   (Low)")]
+    ranges = dict.fromkeys((name for _, name in bands), 0)
+    for score, n in flow_hist.items():
+        ranges[next((name for floor, name in bands if score >= floor), bands[-1][1])] += n
     
     for range_name, count in ranges.items():
         percentage = (count / total_days) * 100 if total_days else 0
         bar = "█" * int(percentage / 2)
         print(f"  {range_name:20s} {count:3d} days ({percentage:5.1f}%) {bar}")
     
-    # Data size
-    total_size = sum(f.stat().st_size for f in OUTPUT_DIR.rglob("*") if f.is_file())
+    # Hourly profile, from the per-day rollups
+    rollup_days = stats["rollup_days"]
+    if rollup_days:
+        hourly_avg = [k / rollup_days for k in stats["hourly_keystrokes"]]
+        peak = max(hourly_avg) or 1
+        print(f"\n⏰ HOURLY ACTIVITY (avg keystrokes, {rollup_days} days with hourly data)")
+        print(f"{'─' * 70}")
+        for hour, avg in enumerate(hourly_avg):
+            if avg:
+                print(f"  {hour:02d}:00  {avg:8,.0f}  {'█' * int(40 * avg / peak)}")
+    
+    print_percentiles(stats)
+    
+    devices = stats.get("devices")
+    if devices:
+        device_keystrokes = sum(d["keystrokes"] for d in devices.values()) or 1
+        print(f"\n🖥️  DEVICES (merged multi-device days)")
+        print(f"{'─' * 70}")
+        print(f"  {'Device':12s} {'Days':>5s} {'Events':>12s} {'Keystrokes':>13s} {'Mouse px':>14s} {'Share':>7s}")
+        for device_id, d in sorted(devices.items()):
+            print(f"  {device_id:12s} {d['days']:5d} {d['events']:12,} {d['keystrokes']:13,} {d['mouse_dist']:14,} "
+                  f"{100 * d['keystrokes'] / device_keystrokes:6.1f}%")
+    
     print(f"\n💾 STORAGE")
     print(f"{'─' * 70}")
     print(f"  Total Size:               {total_size / (1024*1024):.1f} MB")
-    print(f"  Average per Day:          {(total_size / total_days) / 1024:.1f} KB")
+    print(f"  Average per Day:          {(total_size / total_days) / 1024 if total_days else 0:.1f} KB")
     
     print(f"\n{'=' * 70}")
     print(f"✓ Analysis Complete!")
     print(f"{'=' * 70}\n")
 
+def _flow_quantile(flow_hist, q):
+    """Day flow score at quantile q, exact from the flow histogram"""
+    rank = q * (sum(flow_hist.values()) - 1)
+    seen = 0
+    for score in sorted(flow_hist):
+        seen += flow_hist[score]
+        if rank < seen:
+            return score
+    return None
+
+def print_percentiles(stats):
+    """p50/p90/p99 of the merged sketches, and of the day flow scores"""
+    sketches = {name: LogHistogram.from_dict(data) for name, data in stats["sketches"].items()}
+    flow_hist = stats["flow_hist"]
+    if not sketches and not flow_hist:
+        return
+    print(f"\n📐 PERCENTILES ({stats['sketch_days']} days with {SKETCHES_FILE})")
+    print(f"{'─' * 70}")
+    print(f"  {'':20s}" + "".join(f"{f'p{round(q * 100)}':>10s}" for q in QUANTILES) + f"{'Samples':>14s}")
+    for name, label in SKETCHES.items():
+        sketch = sketches.get(name)
+        if sketch and sketch.count:
+            print(f"  {label:20s}" + "".join(f"{sketch.quantile(q):10,.1f}" for q in QUANTILES) + f"{sketch.count:14,}")
+    if flow_hist:
+        print(f"  {'Flow score (day)':20s}" + "".join(f"{_flow_quantile(flow_hist, q):10d}" for q in QUANTILES)
+              + f"{sum(flow_hist.values()):14,}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze Atropos demo telemetry")
+    parser.add_argument("--no-index", dest="use_index", action="store_false",
+                        help=f"ignore {INDEX_FILE} and read the day files")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"reuse per-day partials from {CACHE_FILE}")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for a full scan (default: 1)")
+    parser.add_argument("--data-dir", type=Path, default=OUTPUT_DIR,
+                        help="data root to analyze (default: assets/demo_data)")
+    parser.add_argument("--level", choices=LEVELS[1:],
+                        help=f"report per period from the {PYRAMID_DIR}/ summaries of this level")
+    parser.add_argument("--start", metavar="YYYY-MM-DD", help="first day to analyze")
+    parser.add_argument("--end", metavar="YYYY-MM-DD", help="last day to analyze")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    analyze_data()
+    args = parse_args()
+    analyze_data(use_index=args.use_index, incremental=args.incremental, workers=args.workers,
+                 level=args.level, root=args.data_dir, start=args.start, end=args.end)
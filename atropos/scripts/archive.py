@@ -0,0 +1,171 @@
+"""
+Quarterly cold-storage archives (archive/YYYY-Qn.zip at the data root)
+
+compact_archive.py packs each closed quarter's day folders into one zip
+file, members named "YYYY-MM-DD/<file>". The zip central directory is the
+table of contents: a reader opens one member and decompresses just that day
+without touching the rest. Plain JSON members are deflated; files that are
+already compressed (raw_telemetry.json.gz, ...) are stored as-is.
+
+Readers take the usual day folder path; when the folder is gone, the helpers
+here look the day up in its quarter's archive instead.
+"""
+
+import json
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from telemetry_io import CODECS, TELEMETRY_NAMES, decode_day, load_telemetry, open_telemetry, telemetry_path
+
+ARCHIVE_DIR = "archive"
+
+def quarter_of(date_str):
+    """'2025-05-14' -> '2025-Q2'"""
+    return f"{date_str[:4]}-Q{(int(date_str[5:7]) - 1) // 3 + 1}"
+
+def archive_path(root, quarter):
+    return Path(root) / ARCHIVE_DIR / f"{quarter}.zip"
+
+def iter_archives(root):
+    """Archive paths under a data root, in quarter order"""
+    archive_dir = Path(root) / ARCHIVE_DIR
+    return sorted(archive_dir.glob("*.zip")) if archive_dir.is_dir() else []
+
+class DayArchive:
+    """
+    Read access to one quarter archive.
+
+        with DayArchive(path) as archive:
+            for date_str in archive.dates():
+                data = archive.load_telemetry(date_str)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(self.path)
+        self._days = {}
+        for info in self.zip.infolist():
+            date_str, _, name = info.filename.partition("/")
+            if name:
+                self._days.setdefault(date_str, {})[name] = info
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    def __contains__(self, date_str):
+        return date_str in self._days
+
+    def dates(self):
+        return sorted(self._days)
+
+    def names(self, date_str):
+        return sorted(self._days.get(date_str, {}))
+
+    def file_stats(self, date_str):
+        """{name: {"size", "crc"}} for one day; size is the bytes it takes in the archive"""
+        return {name: {"size": info.compress_size, "crc": info.CRC}
+                for name, info in sorted(self._days[date_str].items())}
+
+    def open(self, date_str, name):
+        """Binary stream of one member, decompressing .gz/.bz2/.xz members transparently"""
+        f = self.zip.open(self._days[date_str][name])
+        opener = CODECS.get(Path(name).suffix)
+        return opener(f, "r") if opener else f
+
+    def copy_day(self, date_str, out):
+        """Copy one day's members into another open ZipFile, compression unchanged"""
+        for name, info in sorted(self._days[date_str].items()):
+            out.writestr(info, self.zip.read(info), info.compress_type)
+
+    def telemetry_name(self, date_str):
+        names = self._days.get(date_str, {})
+        return next((name for name in TELEMETRY_NAMES if name in names), None)
+
+    def open_telemetry(self, date_str):
+        return self.open(date_str, self.telemetry_name(date_str))
+
+    def load_telemetry(self, date_str):
+        with self.open_telemetry(date_str) as f:
+            return decode_day(json.load(f))
+
+    def load_json(self, date_str, name):
+        """A JSON member, or None if the day has no such file"""
+        if name not in self._days.get(date_str, {}):
+            return None
+        with self.open(date_str, name) as f:
+            return json.load(f)
+
+    def read_text(self, date_str, name):
+        """A text member, or None if the day has no such file"""
+        if name not in self._days.get(date_str, {}):
+            return None
+        with self.open(date_str, name) as f:
+            return f.read().decode("utf-8")
+
+def _root_of(day_dir):
+    return Path(day_dir).parent.parent.parent
+
+def find_archive(day_dir):
+    """Quarter archive that holds the day, or None"""
+    date_str = Path(day_dir).name
+    path = archive_path(_root_of(day_dir), quarter_of(date_str))
+    if not path.exists():
+        return None
+    with DayArchive(path) as archive:
+        return path if date_str in archive else None
+
+def day_exists(day_dir):
+    """True if the day has a telemetry file, in its folder or archived"""
+    return telemetry_path(day_dir) is not None or find_archive(day_dir) is not None
+
+def load_day_telemetry(day_dir):
+    """Parse a day's telemetry from its folder or, failing that, its archive"""
+    path = telemetry_path(day_dir)
+    if path:
+        return load_telemetry(path)
+    archive = find_archive(day_dir)
+    if archive is None:
+        raise FileNotFoundError(f"No telemetry for {Path(day_dir).name}")
+    with DayArchive(archive) as a:
+        return a.load_telemetry(Path(day_dir).name)
+
+@contextmanager
+def open_day_telemetry(day_dir):
+    """Binary stream of a day's telemetry from its folder or its archive (seekable either way)"""
+    path = telemetry_path(day_dir)
+    if path:
+        with open_telemetry(path) as f:
+            yield f
+        return
+    archive = find_archive(day_dir)
+    if archive is None:
+        raise FileNotFoundError(f"No telemetry for {Path(day_dir).name}")
+    with DayArchive(archive) as a, a.open_telemetry(Path(day_dir).name) as f:
+        yield f
+
+def read_day_file(day_dir, name):
+    """Text of a small per-day file (summary, rollup) from the folder or the archive"""
+    path = Path(day_dir) / name
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+    archive = find_archive(day_dir)
+    if archive is None:
+        return None
+    with DayArchive(archive) as a:
+        return a.read_text(Path(day_dir).name, name)
+
+def load_day_json(day_dir, name, version):
+    """A versioned per-day JSON file (rollup.json, sessions.json, ...), or None if missing/unreadable/outdated"""
+    try:
+        text = read_day_file(day_dir, name)
+        document = json.loads(text) if text else None
+    except (OSError, ValueError, KeyError):
+        return None
+    return document if document and document.get("version") == version else None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Build (or refresh) the dataset-wide metrics index at the data root
+Usage: python build_index.py [--rebuild] [data_dir]
+
+index.json holds, per date: the metrics block, event counts per type and the
+size/mtime of every file in the day folder. Readers such as
+analyze_demo_data.py and the Electron calendar handler answer from it
+instead of parsing every raw_telemetry.json. Days packed into
+archive/YYYY-Qn.zip are indexed too, keyed on each member's size and CRC.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from archive import ARCHIVE_DIR, DayArchive, iter_archives
+from columnar import ColumnarDay, fresh_columnar
+from rollup import ROLLUP_FILE, ROLLUP_VERSION, hourly, load_rollup
+from telemetry_io import iter_day_dirs, load_telemetry, telemetry_path
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+def file_stats(directory):
+    """{name: {"size", "mtime"}} for the regular files directly in a folder"""
+    stats = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                st = entry.stat()
+                stats[entry.name] = {"size": st.st_size, "mtime": round(st.st_mtime, 3)}
+    return stats
+
+def count_events(events):
+    """{event type: count} for a list of events"""
+    event_counts = {}
+    for event in events:
+        event_type = event.get("type", "unknown")
+        event_counts[event_type] = event_counts.get(event_type, 0) + 1
+    return event_counts
+
+def _entry(date_str, path, metrics, event_counts, rollup, files):
+    return {
+        "date": date_str,
+        "path": path,
+        "metrics": metrics,
+        "event_counts": event_counts,
+        "events": sum(event_counts.values()),
+        "hourly_keystrokes": hourly(rollup, "keystrokes") if rollup else None,
+        "files": files,
+    }
+
+def day_entry(day_dir, metrics=None, event_counts=None):
+    """
+    Index entry for one day folder. Pass metrics/event_counts when the caller
+    already has them (the generator does); otherwise they are read from the
+    columnar file or, failing that, raw_telemetry.json. Days with a
+    rollup.json also carry their per-hour keystrokes.
+    """
+    if metrics is None or event_counts is None:
+        columnar_file = fresh_columnar(day_dir)
+        if columnar_file:
+            with ColumnarDay(columnar_file) as day:
+                metrics, event_counts = day.metrics, day.type_counts()
+        else:
+            data = load_telemetry(telemetry_path(day_dir))
+            metrics = data.get("metrics", {})
+            event_counts = count_events(data.get("events", []))
+    path = f"{day_dir.name[:4]}/{day_dir.name[5:7]}/{day_dir.name}"
+    return _entry(day_dir.name, path, metrics, event_counts, load_rollup(day_dir), file_stats(day_dir))
+
+def archived_day_entry(archive, date_str, metrics=None, event_counts=None):
+    """Index entry for a day inside an open DayArchive; "path" points into the zip"""
+    if metrics is None or event_counts is None:
+        data = archive.load_telemetry(date_str)
+        metrics = data.get("metrics", {})
+        event_counts = count_events(data.get("events", []))
+    rollup = archive.load_json(date_str, ROLLUP_FILE)
+    if rollup and rollup.get("version") != ROLLUP_VERSION:
+        rollup = None
+    path = f"{ARCHIVE_DIR}/{archive.path.name}/{date_str}"
+    return _entry(date_str, path, metrics, event_counts, rollup, archive.file_stats(date_str))
+
+def load_index(root):
+    """Load index.json from a data root, or None if missing/unreadable"""
+    try:
+        with open(Path(root) / INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+def save_index(root, index):
+    """Write index.json atomically (temp file, then rename)"""
+    root = Path(root)
+    index["version"] = INDEX_VERSION
+    index["updated_at"] = datetime.now().isoformat() + "Z"
+    index["days"] = dict(sorted(index.get("days", {}).items()))
+    index["root_files"] = {name: st for name, st in file_stats(root).items() if name != INDEX_FILE}
+    tmp_path = root / (INDEX_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, root / INDEX_FILE)
+    return index
+
+def update_index(root, entries):
+    """Merge fresh day entries into the index at root and save it"""
+    index = load_index(root) or {"days": {}}
+    for entry in entries:
+        index["days"][entry["date"]] = entry
+    return save_index(root, index)
+
+def build_index(root, rebuild=False):
+    """
+    Scan the tree and bring the index up to date. Days whose files have the
+    same sizes and mtimes as the indexed entry are reused without reading
+    them (archived days: same sizes and CRCs); entries for vanished days
+    are dropped.
+    Returns (index, refreshed, reused).
+    """
+    previous = {} if rebuild else (load_index(root) or {}).get("days", {})
+    days = {}
+    refreshed = reused = 0
+    for day_dir in iter_day_dirs(root):
+        if telemetry_path(day_dir) is None:
+            continue
+        old = previous.get(day_dir.name)
+        if old and old.get("files") == file_stats(day_dir):
+            days[day_dir.name] = old
+            reused += 1
+            continue
+        try:
+            days[day_dir.name] = day_entry(day_dir)
+            refreshed += 1
+        except Exception as e:
+            print(f"Error indexing {day_dir}: {e}")
+    for archive_path in iter_archives(root):
+        with DayArchive(archive_path) as archive:
+            for date_str in archive.dates():
+                if date_str in days or archive.telemetry_name(date_str) is None:
+                    continue
+                old = previous.get(date_str)
+                if old and old.get("files") == archive.file_stats(date_str):
+                    days[date_str] = old
+                    reused += 1
+                    continue
+                try:
+                    days[date_str] = archived_day_entry(archive, date_str)
+                    refreshed += 1
+                except Exception as e:
+                    print(f"Error indexing {date_str} in {archive_path}: {e}")
+    return save_index(root, {"days": days}), refreshed, reused
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--rebuild"]
+    root = Path(args[0]) if args else OUTPUT_DIR
+    index, refreshed, reused = build_index(root, rebuild="--rebuild" in sys.argv)
+    print(f"✓ Indexed {len(index['days'])} days ({refreshed} refreshed, {reused} unchanged)")
+    print(f"  Output: {root / INDEX_FILE}")
@@ -0,0 +1,304 @@
+"""
+Columnar, memory-mappable day format (raw_telemetry.col)
+
+One file per day next to raw_telemetry.json:
+
+    b"ATRCOL01" | uint32 header length | JSON header | padding | columns...
+
+The JSON header carries meta, metrics, the row count, the string tables and
+the byte offset of every column. Each column is a little-endian typed array
+aligned to 8 bytes, so a reader can mmap the file and scan one column (e.g.
+sum keystrokes over a year) while touching only that column's pages.
+Written by generate_demo_data.py --columnar and convert_columnar.py.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # readers fall back to memoryview columns
+    np = None
+
+from telemetry_io import atomic_open, epoch_ms_to_iso, iso_to_epoch_ms, schema_base, telemetry_path
+
+COLUMNAR_FILE = "raw_telemetry.col"
+MAGIC = b"ATRCOL01"
+
+# Stable type codes; unknown types are appended to the per-file table
+EVENT_TYPE_CODES = ["focus_change", "keystroke", "mouse_move", "mouse_click", "scroll"]
+BUTTON_CODES = ["", "left", "right", "middle"]
+NO_STRING = 0xFFFF
+
+# name -> (array typecode, numpy dtype)
+COLUMNS = {
+    "ts": ("q", "<i8"),           # epoch milliseconds
+    "type": ("B", "u1"),          # index into header["types"]
+    "count": ("i", "<i4"),        # keystroke count (0 for other types)
+    "distance_px": ("i", "<i4"),  # mouse_move distance (0 for other types)
+    "delta": ("i", "<i4"),        # scroll delta (0 for other types)
+    "button": ("B", "u1"),        # index into header["buttons"]
+    "title": ("H", "<u2"),        # index into header["strings"]
+    "process": ("H", "<u2"),      # index into header["strings"]
+}
+
+class ColumnarWriter:
+    """
+    Accumulates events into typed columns; feed with add(), then write().
+    Pass the day's meta.base when feeding 2.0.0 (epoch-delta) events.
+    """
+
+    def __init__(self, base=None):
+        self.base = base
+        self.columns = {name: array(code) for name, (code, _) in COLUMNS.items()}
+        self.types = list(EVENT_TYPE_CODES)
+        self.buttons = list(BUTTON_CODES)
+        self.strings = []
+        self._type_index = {t: i for i, t in enumerate(self.types)}
+        self._button_index = {b: i for i, b in enumerate(self.buttons)}
+        self._string_index = {}
+        self._last_ts = (None, 0)
+
+    def _code(self, table, index, value):
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        return code
+
+    def _string(self, value):
+        if value is None:
+            return NO_STRING
+        code = self._code(self.strings, self._string_index, value)
+        if code >= NO_STRING:
+            raise ValueError("Too many distinct strings for a columnar day file")
+        return code
+
+    def add(self, event):
+        c = self.columns
+        t = event.get("t")
+        if t is not None:
+            c["ts"].append(self.base + t)
+        else:
+            ts = event["ts"]
+            # Events arrive in runs sharing a tick, so memoise the last parse
+            if ts != self._last_ts[0]:
+                self._last_ts = (ts, iso_to_epoch_ms(ts))
+            c["ts"].append(self._last_ts[1])
+        c["type"].append(self._code(self.types, self._type_index, event.get("type", "unknown")))
+        c["count"].append(event.get("count", 0))
+        c["distance_px"].append(event.get("distance_px", 0))
+        c["delta"].append(event.get("delta", 0))
+        c["button"].append(self._code(self.buttons, self._button_index, event.get("button", "")))
+        c["title"].append(self._string(event.get("title")))
+        c["process"].append(self._string(event.get("process")))
+
+    def extend(self, events):
+        """add() for every event, with the column appends bound to locals"""
+        c = self.columns
+        add_ts, add_type, add_count = c["ts"].append, c["type"].append, c["count"].append
+        add_distance, add_delta, add_button = c["distance_px"].append, c["delta"].append, c["button"].append
+        add_title, add_process = c["title"].append, c["process"].append
+        type_index, button_index = self._type_index, self._button_index
+        string = self._string
+        base = self.base
+        last_ts, last_ms = self._last_ts
+        for event in events:
+            t = event.get("t")
+            if t is not None:
+                add_ts(base + t)
+            else:
+                ts = event["ts"]
+                if ts != last_ts:
+                    last_ts, last_ms = ts, iso_to_epoch_ms(ts)
+                add_ts(last_ms)
+            event_type = event.get("type", "unknown")
+            code = type_index.get(event_type)
+            add_type(self._code(self.types, type_index, event_type) if code is None else code)
+            add_count(event.get("count", 0))
+            add_distance(event.get("distance_px", 0))
+            add_delta(event.get("delta", 0))
+            button = event.get("button", "")
+            code = button_index.get(button)
+            add_button(self._code(self.buttons, button_index, button) if code is None else code)
+            title = event.get("title")
+            add_title(NO_STRING if title is None else string(title))
+            process = event.get("process")
+            add_process(NO_STRING if process is None else string(process))
+        self._last_ts = (last_ts, last_ms)
+
+    def write(self, path, meta=None, metrics=None):
+        """Write the file; the header is sized first so column offsets are final"""
+        rows = len(self.columns["ts"])
+        header = {
+            "version": 1,
+            "rows": rows,
+            "meta": meta or {},
+            "metrics": metrics or {},
+            "types": self.types,
+            "buttons": self.buttons,
+            "strings": self.strings,
+            "columns": {},
+        }
+        # Offsets depend on the header length, which depends on the offsets;
+        # iterate until the encoded header stops growing
+        header_len = 0
+        while True:
+            offset = _align(len(MAGIC) + 4 + header_len)
+            for name, (code, _) in COLUMNS.items():
+                size = rows * array(code).itemsize
+                header["columns"][name] = {"dtype": COLUMNS[name][1], "offset": offset, "bytes": size}
+                offset = _align(offset + size)
+            encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+            if len(encoded) <= header_len:
+                break
+            header_len = len(encoded)
+        encoded = encoded.ljust(header_len)
+
+        with atomic_open(path) as f:
+            f.write(MAGIC + struct.pack("<I", header_len) + encoded)
+            for name in COLUMNS:
+                f.write(b"\0" * (header["columns"][name]["offset"] - f.tell()))
+                column = self.columns[name]
+                if sys.byteorder != "little":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                column.tofile(f)
+        return header
+
+def _align(n, to=8):
+    return (n + to - 1) // to * to
+
+def read_header(path):
+    """Read only the JSON header (meta, metrics, row count, tables)"""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a columnar day file: {path}")
+        (header_len,) = struct.unpack("<I", prefix[len(MAGIC):])
+        return json.loads(f.read(header_len))
+
+class ColumnarDay:
+    """
+    Memory-mapped reader. Columns are zero-copy views over the mapping:
+    NumPy arrays when NumPy is installed, memoryviews otherwise.
+
+        with ColumnarDay(path) as day:
+            keystrokes = sum(day.column("count"))
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._views = []
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a columnar day file: {path}")
+        (header_len,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        self.header = json.loads(self._map[len(MAGIC) + 4:len(MAGIC) + 4 + header_len])
+        self.rows = self.header["rows"]
+        self.meta = self.header["meta"]
+        self.metrics = self.header["metrics"]
+        self.types = self.header["types"]
+        self.buttons = self.header["buttons"]
+        self.strings = self.header["strings"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # memoryviews pin the mapping; release them before closing it
+        for view in self._views:
+            view.release()
+        self._views = []
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # NumPy columns still alive; the mapping goes with them
+        self._file.close()
+
+    def column(self, name):
+        """Zero-copy view of one column"""
+        spec = self.header["columns"][name]
+        if np is not None:
+            return np.frombuffer(self._map, dtype=spec["dtype"], count=self.rows, offset=spec["offset"])
+        code = COLUMNS[name][0]
+        if sys.byteorder != "little" and array(code).itemsize > 1:
+            values = array(code, self._map[spec["offset"]:spec["offset"] + spec["bytes"]])
+            values.byteswap()
+            return values
+        view = memoryview(self._map)[spec["offset"]:spec["offset"] + spec["bytes"]].cast(code)
+        self._views.append(view)
+        return view
+
+    def column_array(self, name):
+        """Copy of one column as an array.array, detached from the mapping"""
+        spec = self.header["columns"][name]
+        values = array(COLUMNS[name][0])
+        values.frombytes(self._map[spec["offset"]:spec["offset"] + spec["bytes"]])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def type_counts(self):
+        """{event_type: count} from a single scan of the one-byte type column"""
+        spec = self.header["columns"]["type"]
+        raw = self._map[spec["offset"]:spec["offset"] + spec["bytes"]]
+        counts = {t: raw.count(bytes([i])) for i, t in enumerate(self.types)}
+        return {t: n for t, n in counts.items() if n}
+
+    def event(self, i):
+        """Decode row i back into the raw_telemetry.json event shape"""
+        return next(self.iter_events(i, i + 1))
+
+    def iter_events(self, start=0, stop=None):
+        """Decode rows [start, stop) into event dicts"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        start = max(0, min(start, stop))
+        cols = {name: self.column(name)[start:stop].tolist() for name in COLUMNS}
+        for i in range(stop - start):
+            event_type = self.types[cols["type"][i]]
+            event = {"ts": epoch_ms_to_iso(cols["ts"][i]), "type": event_type}
+            if event_type == "focus_change":
+                event["title"] = self._string(cols["title"][i])
+                event["process"] = self._string(cols["process"][i])
+            elif event_type == "keystroke":
+                event["count"] = cols["count"][i]
+            elif event_type == "mouse_move":
+                event["distance_px"] = cols["distance_px"][i]
+            elif event_type == "mouse_click":
+                event["button"] = self.buttons[cols["button"][i]]
+            elif event_type == "scroll":
+                event["delta"] = cols["delta"][i]
+            yield event
+
+    def _string(self, code):
+        return None if code == NO_STRING else self.strings[code]
+
+def write_columnar_day(path, events, meta=None, metrics=None):
+    """Convert an iterable of events (either schema) into a columnar day file"""
+    writer = ColumnarWriter(schema_base(meta))
+    writer.extend(events)
+    return writer.write(path, meta, metrics)
+
+def fresh_columnar(day_dir):
+    """Path of the day's columnar file if it is at least as new as the JSON (plain or compressed), else None"""
+    target = day_dir / COLUMNAR_FILE
+    source = telemetry_path(day_dir)
+    try:
+        if source is None or target.stat().st_mtime >= source.stat().st_mtime:
+            return target if target.exists() else None
+    except FileNotFoundError:
+        pass
+    return None
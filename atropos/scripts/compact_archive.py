@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Pack each closed quarter's day folders into archive/YYYY-Qn.zip
+Usage: python compact_archive.py [--hot-days 7] [--today YYYY-MM-DD] [data_dir]
+
+A quarter is closed once its last day is more than --hot-days old. Its days
+are written into one zip whose central directory is the table of contents,
+so readers (view_day.py, analyze_demo_data.py, ...) open a single day
+without unpacking the rest. The zip is written to a temp file, fsynced and
+renamed into place before any folder is removed: a crash leaves either the
+folders, or the folders plus a complete archive, and the next run folds
+whatever folders remain into the archive. Re-running over a compacted tree
+does nothing.
+"""
+
+import argparse
+import os
+import shutil
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from archive import DayArchive, archive_path, quarter_of
+from build_index import archived_day_entry, load_index, update_index
+from event_index import load_offset_index
+from manifest import refresh_manifest
+from pyramid import build_pyramid
+from telemetry_io import CODECS, iter_day_dirs, telemetry_path
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+
+def quarter_end(quarter):
+    """'2025-Q2' -> date(2025, 6, 30)"""
+    year, q = int(quarter[:4]), int(quarter[-1])
+    if q == 4:
+        return date(year, 12, 31)
+    return date(year, 3 * q + 1, 1) - timedelta(days=1)
+
+def closed_quarters(root, hot_days=7, today=None):
+    """{quarter: [day_dir, ...]} for quarters whose last day is older than hot_days"""
+    cutoff = (today or date.today()) - timedelta(days=hot_days)
+    quarters = {}
+    for day_dir in iter_day_dirs(root):
+        quarter = quarter_of(day_dir.name)
+        if quarter_end(quarter) < cutoff and telemetry_path(day_dir) is not None:
+            quarters.setdefault(quarter, []).append(day_dir)
+    return quarters
+
+def _member_type(name):
+    """Already-compressed day files are stored; everything else is deflated"""
+    return zipfile.ZIP_STORED if Path(name).suffix in CODECS else zipfile.ZIP_DEFLATED
+
+def compact_quarter(root, quarter, day_dirs):
+    """
+    Write the quarter's archive (merging days already in it), then remove
+    the packed folders. Returns the archive path.
+    """
+    target = archive_path(root, quarter)
+    target.parent.mkdir(exist_ok=True)
+    tmp_path = target.with_name(target.name + ".tmp")
+    folders = {day_dir.name: day_dir for day_dir in day_dirs}
+    previous = DayArchive(target) if target.exists() else None
+    try:
+        dates = sorted(folders.keys() | set(previous.dates() if previous else []))
+        with open(tmp_path, "wb") as raw:
+            with zipfile.ZipFile(raw, "w") as out:
+                for date_str in dates:
+                    day_dir = folders.get(date_str)
+                    if day_dir is None:
+                        previous.copy_day(date_str, out)  # archived by an earlier run
+                        continue
+                    load_offset_index(day_dir)  # so the packed sidecar matches the packed file
+                    for path in sorted(p for p in day_dir.iterdir() if p.is_file() and p.suffix != ".tmp"):
+                        out.write(path, f"{date_str}/{path.name}", _member_type(path.name))
+            raw.flush()
+            os.fsync(raw.fileno())
+    finally:
+        if previous:
+            previous.close()
+    os.replace(tmp_path, target)
+
+    for day_dir in day_dirs:
+        shutil.rmtree(day_dir)
+        for parent in (day_dir.parent, day_dir.parent.parent):
+            try:
+                parent.rmdir()  # only succeeds once the month/year is empty
+            except OSError:
+                break
+    return target
+
+def compact_tree(root, hot_days=7, today=None):
+    """
+    Compact every closed quarter, then point the index entries of the moved
+    days at their archive and refresh the pyramid and manifest.
+    Returns {quarter: days packed}.
+    """
+    root = Path(root)
+    packed = {}
+    for quarter, day_dirs in sorted(closed_quarters(root, hot_days, today).items()):
+        try:
+            path = compact_quarter(root, quarter, day_dirs)
+        except Exception as e:
+            print(f"Error compacting {quarter}: {e}")
+            continue
+        packed[quarter] = (path, [day_dir.name for day_dir in day_dirs])
+
+    index = load_index(root)
+    if index and packed:
+        entries = []
+        for path, dates in packed.values():
+            with DayArchive(path) as archive:
+                for date_str in dates:
+                    old = index["days"].get(date_str)
+                    if old:
+                        entries.append(archived_day_entry(archive, date_str, old["metrics"], old["event_counts"]))
+                    else:
+                        entries.append(archived_day_entry(archive, date_str))
+        build_pyramid(root, update_index(root, entries))
+    if packed:
+        refresh_manifest(root)
+    return {quarter: len(dates) for quarter, (_, dates) in packed.items()}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pack closed quarters of Atropos data into zip archives")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--hot-days", type=int, default=7, metavar="DAYS",
+                        help="keep a quarter unpacked until its last day is this many days old (default: 7)")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="reference date for --hot-days (default: today)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    packed = compact_tree(args.data_dir, args.hot_days, args.today)
+    if not packed:
+        print("✓ Nothing to compact (no closed quarter with day folders left)")
+    for quarter, days in packed.items():
+        print(f"✓ Packed {days} days into {archive_path(args.data_dir, quarter)}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Compress day files older than N days in place
+Usage: python compress_archive.py [--older-than 7] [--codec gz] [data_dir]
+       python compress_archive.py --benchmark [--days 5] [data_dir]
+
+raw_telemetry.json becomes raw_telemetry.json.<codec>, keeping the original
+mtime so derived files (rollup.json, raw_telemetry.col) stay fresh. Every
+reader opens plain and compressed days alike through telemetry_io.
+--benchmark compares size and decode throughput of each stdlib codec on
+sample days; only gz is written, since the Electron app cannot decode the
+others.
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from build_index import day_entry, load_index, update_index
+from pyramid import build_pyramid
+from telemetry_io import APP_COMPRESSIONS, CODECS, TELEMETRY_FILE, iter_day_dirs
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+
+# In-memory (compress, decompress) pairs for the benchmark
+BENCH_CODECS = {
+    "none": (bytes, bytes),
+    "gz": (lambda data: gzip.compress(data, mtime=0), gzip.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "xz": (lzma.compress, lzma.decompress),
+}
+
+def compress_day(day_dir, codec="gz"):
+    """Replace the day's plain file with a compressed one; returns False if there was none"""
+    source = day_dir / TELEMETRY_FILE
+    if not source.exists():
+        return False
+    target = day_dir / f"{TELEMETRY_FILE}.{codec}"
+    tmp_path = day_dir / f"{target.name}.tmp"
+    with open(source, "rb") as src, CODECS[f".{codec}"](tmp_path, "w") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    st = source.stat()
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp_path, target)
+    source.unlink()
+    return True
+
+def compress_tree(root, older_than=7, codec="gz", today=None):
+    """
+    Compress every day older than `older_than` days, then refresh the
+    affected index.json entries and pyramid summaries.
+    Returns (compressed, kept, before_bytes, after_bytes).
+    """
+    root = Path(root)
+    cutoff = ((today or date.today()) - timedelta(days=older_than)).isoformat()
+    compressed = kept = before = after = 0
+    changed = []
+    for day_dir in iter_day_dirs(root):
+        source = day_dir / TELEMETRY_FILE
+        if day_dir.name >= cutoff or not source.exists():
+            kept += 1
+            continue
+        size = source.stat().st_size
+        try:
+            compress_day(day_dir, codec)
+        except Exception as e:
+            print(f"Error compressing {day_dir}: {e}")
+            continue
+        compressed += 1
+        before += size
+        after += (day_dir / f"{TELEMETRY_FILE}.{codec}").stat().st_size
+        changed.append(day_dir)
+
+    index = load_index(root)
+    if index and changed:
+        entries = []
+        for day_dir in changed:
+            old = index["days"].get(day_dir.name)
+            entries.append(day_entry(day_dir, old["metrics"], old["event_counts"]) if old else day_entry(day_dir))
+        build_pyramid(root, update_index(root, entries))
+    return compressed, kept, before, after
+
+def benchmark(root, days=5):
+    """Size vs. decode throughput for each codec over the first `days` day files"""
+    samples = []
+    for day_dir in iter_day_dirs(root):
+        source = day_dir / TELEMETRY_FILE
+        if source.exists():
+            samples.append(source.read_bytes())
+        if len(samples) >= days:
+            break
+    if not samples:
+        print(f"❌ No plain {TELEMETRY_FILE} files under {root}")
+        return
+    raw_bytes = sum(len(s) for s in samples)
+
+    print("=" * 70)
+    print(f"📦 CODEC BENCHMARK ({len(samples)} days, {raw_bytes / (1024*1024):.1f} MB raw)")
+    print("=" * 70)
+    print(f"  {'Codec':6s} {'Size':>9s} {'Ratio':>7s} {'Compress':>12s} {'Decompress':>12s} {'Decode+parse':>14s}")
+    for name, (compress, decompress) in BENCH_CODECS.items():
+        start = time.perf_counter()
+        packed = [compress(s) for s in samples]
+        compress_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for p in packed:
+            decompress(p)
+        decompress_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for p in packed:
+            json.loads(decompress(p))
+        parse_time = time.perf_counter() - start
+        size = sum(len(p) for p in packed)
+        mb = raw_bytes / (1024 * 1024)
+        if name == "none":
+            codec_cols = f"{'-':>12s} {'-':>12s}"
+        else:
+            codec_cols = f"{mb / compress_time:8.1f}MB/s {mb / decompress_time:8.1f}MB/s"
+        print(f"  {name:6s} {size / 1024:7.0f}KB {raw_bytes / size:6.1f}x {codec_cols} {mb / parse_time:10.1f}MB/s")
+    print("─" * 70)
+    print("  Throughputs are per MB of uncompressed JSON")
+    print("=" * 70 + "\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compress old Atropos day files in place")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--older-than", type=int, default=7, metavar="DAYS",
+                        help="only compress days more than this many days old (default: 7)")
+    parser.add_argument("--codec", choices=APP_COMPRESSIONS, default="gz",
+                        help="compression codec (default: gz; --benchmark also compares bz2 and xz)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare codecs on sample days instead of compressing")
+    parser.add_argument("--days", type=int, default=5,
+                        help="sample days for --benchmark (default: 5)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.benchmark:
+        benchmark(args.data_dir, args.days)
+    else:
+        compressed, kept, before, after = compress_tree(args.data_dir, args.older_than, args.codec)
+        print(f"✓ Compressed {compressed} days with {args.codec} ({kept} recent or already compressed)")
+        if compressed:
+            print(f"  {before / (1024*1024):.1f} MB -> {after / (1024*1024):.1f} MB ({before / after:.1f}x)")
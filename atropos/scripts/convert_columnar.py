@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Backfill raw_telemetry.col (columnar day format) over an existing data tree
+Usage: python convert_columnar.py [--force] [data_dir]
+"""
+
+import sys
+from pathlib import Path
+
+from columnar import COLUMNAR_FILE, write_columnar_day
+from telemetry_io import iter_day_dirs, load_telemetry, telemetry_path
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+
+def convert_day(day_dir, force=False):
+    """Write the columnar file for one day; returns False if it was up to date"""
+    source = telemetry_path(day_dir)
+    target = day_dir / COLUMNAR_FILE
+    if source is None:
+        return False
+    if not force and target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        return False
+    data = load_telemetry(source)
+    write_columnar_day(target, data.get("events", []), data.get("meta"), data.get("metrics"))
+    return True
+
+def convert_tree(root, force=False):
+    converted = skipped = 0
+    for day_dir in iter_day_dirs(root):
+        try:
+            if convert_day(day_dir, force):
+                converted += 1
+            else:
+                skipped += 1
+        except Exception as e:
+            print(f"Error converting {day_dir}: {e}")
+    return converted, skipped
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    root = Path(args[0]) if args else OUTPUT_DIR
+    converted, skipped = convert_tree(root, force="--force" in sys.argv)
+    print(f"✓ Converted {converted} days ({skipped} already up to date) under {root}")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Convert day files between event schemas in place, or benchmark them
+Usage: python convert_schema.py [--schema 2.0.0] [--[no-]string-table] [data_dir]
+       python convert_schema.py --benchmark [--days 5] [data_dir]
+
+Schema 1.0.0 events carry an ISO "ts" string that every reader parses back
+into a time; 2.0.0 stores meta.base once per day and an integer "t"
+(milliseconds since base) per event. --string-table dictionary-encodes
+the string fields of events into meta.strings (--no-string-table undoes it);
+without either flag the files are converted to 2.0.0 and keep their
+encoding. Converted files keep their layout (pretty files become "lines")
+and compression suffix, and get a new mtime like any other rewrite. The
+events themselves are unchanged, so the day's derived files (rollup.json,
+raw_telemetry.col, sessions.json, activity.json, sketches.json) that were
+up to date before the conversion are re-stamped afterwards; stale ones stay
+stale. The offset sidecar notices the size change and rebuilds itself.
+--benchmark compares both schemas on sample days and projects the saving
+over every indexed event.
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from activity import ACTIVITY_FILE
+from build_index import day_entry, load_index, update_index
+from columnar import COLUMNAR_FILE
+from pyramid import build_pyramid
+from rollup import ROLLUP_FILE
+from sessions import SESSIONS_FILE
+from sketches import SKETCHES_FILE
+from telemetry_io import (EPOCH_SCHEMA_VERSION, SCHEMA_VERSION, SCHEMA_VERSIONS, EventStream, StringTable, atomic_open,
+                          day_base, epoch_events, iso_event, iter_day_dirs, load_telemetry, open_telemetry,
+                          schema_base, telemetry_path, write_telemetry_stream)
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+# Per-day files computed from the events, fresh while at least as new as the day file
+DERIVED_FILES = [ROLLUP_FILE, COLUMNAR_FILE, SESSIONS_FILE, ACTIVITY_FILE, SKETCHES_FILE]
+
+def _collect_strings(f):
+    """First pass for a new string table: every string field value in file order"""
+    strings = StringTable()
+    for _, event in EventStream(f):
+        strings.encode(event)
+    return strings
+
+def convert_day(day_dir, schema=None, string_table=None):
+    """
+    Rewrite the day file in `schema`, with or without a string table
+    (None keeps what the file has); returns False if nothing changed.
+    """
+    source = telemetry_path(day_dir)
+    if source is None:
+        return False
+    with open_telemetry(source) as f:
+        meta = dict(EventStream(f).header.get("meta", {}))
+    current = meta.get("version", SCHEMA_VERSION)
+    encoded = "strings" in meta
+    schema = schema or current
+    string_table = encoded if string_table is None else string_table
+    if schema == current and string_table == encoded:
+        return False
+    mtime = source.stat().st_mtime
+    fresh = [path for path in (day_dir / name for name in DERIVED_FILES)
+             if path.exists() and path.stat().st_mtime >= mtime]
+
+    # The reader closes before atomic_open renames the new file over it
+    with atomic_open(source) as out:
+        with open_telemetry(source) as f:
+            strings = None
+            if string_table:
+                strings = StringTable(meta["strings"]) if encoded else _collect_strings(f)
+            meta.pop("strings", None)
+
+            stream = EventStream(f)
+            base = schema_base(meta)
+            if schema == current:
+                events = (event for _, event in stream)
+            elif schema == EPOCH_SCHEMA_VERSION:
+                meta["base"] = day_base(meta.get("date", day_dir.name))
+                events = epoch_events((event for _, event in stream), meta["base"])
+            else:
+                meta.pop("base", None)
+                events = (iso_event(event, base) for _, event in stream)
+            meta["version"] = schema
+            # metrics precede "events" in pretty files and follow them otherwise
+            if "metrics" in stream.header:
+                metrics = lambda: stream.header["metrics"]
+            else:
+                metrics = lambda: _trailer(f, stream).get("metrics", {})
+            write_telemetry_stream(out, meta, events, metrics=metrics, strings=strings)
+    # Same events in a new encoding: what was derived from them still holds
+    for path in fresh:
+        os.utime(path)
+    return True
+
+def _trailer(f, stream):
+    """Top-level values written after the events array (once the stream is exhausted)"""
+    f.seek(stream.end_offset)
+    rest = f.read().decode("utf-8").lstrip(" \t\r\n,")
+    return json.loads("{" + rest) if rest.startswith('"') else {}
+
+def convert_tree(root, schema=None, string_table=None):
+    """
+    Convert every day folder, then refresh the affected index.json entries
+    and pyramid summaries. Returns (converted, kept).
+    """
+    root = Path(root)
+    converted = kept = 0
+    changed = []
+    for day_dir in iter_day_dirs(root):
+        try:
+            if convert_day(day_dir, schema, string_table):
+                converted += 1
+                changed.append(day_dir)
+            else:
+                kept += 1
+        except Exception as e:
+            print(f"Error converting {day_dir}: {e}")
+    index = load_index(root)
+    if index and changed:
+        entries = []
+        for day_dir in changed:
+            old = index["days"].get(day_dir.name)
+            entries.append(day_entry(day_dir, old["metrics"], old["event_counts"]) if old else day_entry(day_dir))
+        build_pyramid(root, update_index(root, entries))
+    return converted, kept
+
+def _encode(meta, events):
+    lines = ",\n".join(json.dumps(event, separators=(",", ":")) for event in events)
+    return f'{{"meta":{json.dumps(meta)},\n"events":[\n{lines}\n]}}\n'.encode("utf-8")
+
+def benchmark(root, days=5):
+    """Load + timestamp cost of both schemas over the first `days` day files"""
+    samples, events = [], 0
+    for day_dir in iter_day_dirs(root):
+        source = telemetry_path(day_dir)
+        if source is None:
+            continue
+        data = load_telemetry(source)
+        meta = data.get("meta", {})
+        base = day_base(meta.get("date", day_dir.name))
+        iso = [iso_event(event, schema_base(meta)) for event in data.get("events", [])]
+        events += len(iso)
+        samples.append((base, _encode(dict(meta, version=SCHEMA_VERSION), iso),
+                        _encode(dict(meta, version=EPOCH_SCHEMA_VERSION, base=base), epoch_events(iso, base))))
+        if len(samples) >= days:
+            break
+    if not samples:
+        print(f"❌ No day files under {root}")
+        return
+
+    # What readers do with each schema: parse "ts" into a datetime, or add "t" to base
+    timestamp_readers = {
+        SCHEMA_VERSION: lambda base, data: [datetime.fromisoformat(e["ts"].replace("Z", "")) for e in data["events"]],
+        EPOCH_SCHEMA_VERSION: lambda base, data: [base + e["t"] for e in data["events"]],
+    }
+    results = {}
+    for i, schema in enumerate(SCHEMA_VERSIONS):
+        blobs = [(base, encoded[i]) for base, *encoded in samples]
+        start = time.perf_counter()
+        parsed = [(base, json.loads(blob)) for base, blob in blobs]
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for base, data in parsed:
+            timestamp_readers[schema](base, data)
+        ts_time = time.perf_counter() - start
+        results[schema] = (sum(len(blob) for _, blob in blobs), load_time, ts_time)
+
+    index = load_index(root)
+    if index:
+        total = sum(entry.get("events", 0) for entry in index["days"].values())
+        source = "index.json"
+    else:
+        day_count = sum(1 for _ in iter_day_dirs(root))
+        total = round(events / len(samples) * day_count)
+        source = f"estimated for {day_count} days"
+
+    print("=" * 70)
+    print(f"⏱️  TIMESTAMP SCHEMA BENCHMARK ({len(samples)} days, {events:,} events)")
+    print("=" * 70)
+    print(f"  {'Schema':7s} {'Size':>9s} {'JSON load':>11s} {'Timestamps':>12s} {'Per event':>11s}")
+    for schema, (size, load_time, ts_time) in results.items():
+        per_event = (load_time + ts_time) / events * 1e6
+        print(f"  {schema:7s} {size / 1024:7.0f}KB {load_time * 1000:9.1f}ms {ts_time * 1000:10.1f}ms "
+              f"{per_event:9.2f}µs")
+    print("─" * 70)
+    old, new = results[SCHEMA_VERSION], results[EPOCH_SCHEMA_VERSION]
+    scale = total / events
+    print(f"  Projected over {total:,} events ({source}):")
+    print(f"    timestamps       {old[2] * scale:6.1f}s -> {new[2] * scale:6.1f}s")
+    print(f"    load+timestamps  {(old[1] + old[2]) * scale:6.1f}s -> {(new[1] + new[2]) * scale:6.1f}s")
+    print(f"    size             {old[0] * scale / (1024*1024):6.0f}MB -> {new[0] * scale / (1024*1024):6.0f}MB")
+    print("=" * 70 + "\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Atropos day files between event schemas")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--schema", choices=SCHEMA_VERSIONS,
+                        help=f"target schema (default: {EPOCH_SCHEMA_VERSION}, or unchanged with --[no-]string-table)")
+    parser.add_argument("--string-table", action=argparse.BooleanOptionalAction, default=None,
+                        help="dictionary-encode the string fields of events (default: unchanged)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare both schemas on sample days instead of converting")
+    parser.add_argument("--days", type=int, default=5,
+                        help="sample days for --benchmark (default: 5)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.benchmark:
+        benchmark(args.data_dir, args.days)
+    else:
+        schema = args.schema or (EPOCH_SCHEMA_VERSION if args.string_table is None else None)
+        converted, kept = convert_tree(args.data_dir, schema, args.string_table)
+        target = [f"schema {schema}"] if schema else []
+        if args.string_table is not None:
+            target.append("string table" if args.string_table else "plain strings")
+        print(f"✓ Converted {converted} days to {', '.join(target)} ({kept} already converted)")
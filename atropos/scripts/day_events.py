@@ -0,0 +1,235 @@
+"""
+Compact in-memory events for one day (DayEvents)
+
+A parsed raw_telemetry.json keeps every event as a dict of boxed values,
+several hundred bytes each. DayEvents holds the same day as the parallel
+typed columns of the columnar format (columnar.COLUMNS, 26 bytes a row)
+plus the shared type/button/string tables, so a month or a year of days
+fits in memory. Rows are read through EventView, a two-slot view that
+answers get()/[] like the event dict it stands for; whole-day questions
+(sum_by_type, between, focus_segments) work on the columns directly.
+
+    day = load_day_events(day_dir)
+    keystrokes = day.sum_by_type("count")["keystroke"]
+    for start, end, title, process in day.between("2025-01-03T09:00:00Z", "2025-01-03T12:00:00Z").focus_segments():
+        ...
+"""
+
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:  # sums fall back to a Python loop
+    np = None
+
+from archive import load_day_telemetry
+from columnar import COLUMNS, NO_STRING, ColumnarDay, ColumnarWriter, fresh_columnar
+from telemetry_io import epoch_ms_to_iso, iso_to_epoch_ms, schema_base
+
+# Fields each event type carries besides "ts" and "type" (the dict shape)
+EVENT_FIELDS = {
+    "focus_change": ("title", "process"),
+    "keystroke": ("count",),
+    "mouse_move": ("distance_px",),
+    "mouse_click": ("button",),
+    "scroll": ("delta",),
+}
+
+_MISSING = object()
+
+class EventView:
+    """One row of a DayEvents; "ts" is formatted only when asked for"""
+
+    __slots__ = ("day", "row")
+
+    def __init__(self, day, row):
+        self.day = day
+        self.row = row
+
+    @property
+    def ms(self):
+        """Epoch milliseconds"""
+        return self.day.columns["ts"][self.row]
+
+    @property
+    def type(self):
+        return self.day.types[self.day.columns["type"][self.row]]
+
+    def get(self, key, default=None):
+        if key == "type":
+            return self.type
+        if key == "ts":
+            return epoch_ms_to_iso(self.ms)
+        if key not in EVENT_FIELDS.get(self.type, ()):
+            return default
+        code = self.day.columns[key][self.row]
+        if key == "button":
+            return self.day.buttons[code]
+        if key in ("title", "process"):
+            return None if code == NO_STRING else self.day.strings[code]
+        return code
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self):
+        """The raw_telemetry.json (1.0.0) event this row was built from"""
+        event = {"ts": self.get("ts"), "type": self.type}
+        for key in EVENT_FIELDS.get(event["type"], ()):
+            event[key] = self.get(key)
+        return event
+
+class DayEvents:
+    """
+    A day's events as parallel array.array columns (see columnar.COLUMNS):
+    "ts" in epoch milliseconds, "type"/"button" as codes into types/buttons,
+    "title"/"process" as codes into strings (NO_STRING when absent).
+    """
+
+    def __init__(self, columns, types, buttons, strings, meta=None, metrics=None):
+        self.columns = columns
+        self.types = types
+        self.buttons = buttons
+        self.strings = strings
+        self.meta = meta or {}
+        self.metrics = metrics or {}
+
+    @classmethod
+    def from_events(cls, events, meta=None, metrics=None):
+        """Build from event dicts in either schema (pass the day's meta for 2.0.0)"""
+        writer = ColumnarWriter(schema_base(meta))
+        writer.extend(events)
+        return cls(writer.columns, writer.types, writer.buttons, writer.strings, meta, metrics)
+
+    @classmethod
+    def from_columnar(cls, day):
+        """Copy the columns out of an open ColumnarDay"""
+        return cls({name: day.column_array(name) for name in COLUMNS},
+                   day.types, day.buttons, day.strings, day.meta, day.metrics)
+
+    def __len__(self):
+        return len(self.columns["ts"])
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield EventView(self, row)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            start, stop, step = row.indices(len(self))
+            if step != 1:
+                raise ValueError("DayEvents slices must be contiguous")
+            return self._rows(start, stop)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("DayEvents index out of range")
+        return EventView(self, row)
+
+    def _rows(self, start, stop):
+        columns = {name: column[start:stop] for name, column in self.columns.items()}
+        return DayEvents(columns, self.types, self.buttons, self.strings, self.meta, self.metrics)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the columns (the tables are shared and small)"""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def span(self):
+        """(first, last) event time in epoch milliseconds, or None for an empty day"""
+        ts = self.columns["ts"]
+        return (ts[0], ts[-1]) if ts else None
+
+    def iter_dicts(self):
+        """Event dicts in the 1.0.0 shape, one at a time"""
+        for view in self:
+            yield view.to_dict()
+
+    def type_counts(self):
+        """{event_type: count} from one scan of the type column"""
+        raw = self.columns["type"].tobytes()
+        counts = {t: raw.count(bytes([code])) for code, t in enumerate(self.types)}
+        return {t: n for t, n in counts.items() if n}
+
+    def sum_by_type(self, name):
+        """{event_type: total of column `name`}, e.g. sum_by_type("count")["keystroke"]"""
+        types, values = self.columns["type"], self.columns[name]
+        if np is not None:
+            totals = np.bincount(np.frombuffer(types, dtype=np.uint8),
+                                 weights=np.frombuffer(values, dtype=values.typecode), minlength=len(self.types))
+            totals = [int(total) for total in totals]
+        else:
+            totals = [0] * len(self.types)
+            for code, value in zip(types, values):
+                totals[code] += value
+        return {t: total for t, total in zip(self.types, totals) if total}
+
+    def sum_by_hour(self, name):
+        """24-slot list of column `name` totalled per UTC hour (the rollup.json hours)"""
+        ts, values = self.columns["ts"], self.columns[name]
+        if np is not None:
+            hours = np.frombuffer(ts, dtype=np.int64) // 3_600_000 % 24
+            totals = np.bincount(hours, weights=np.frombuffer(values, dtype=values.typecode), minlength=24)
+            return [int(total) for total in totals]
+        totals = [0] * 24
+        for ms, value in zip(ts, values):
+            totals[ms // 3_600_000 % 24] += value
+        return totals
+
+    def between(self, t0=None, t1=None):
+        """
+        Events with t0 <= time < t1 (epoch milliseconds or ISO 'ts' strings;
+        None leaves that end open), found by bisecting the sorted ts column.
+        """
+        ts = self.columns["ts"]
+        start = 0 if t0 is None else bisect_left(ts, _ms(t0))
+        stop = len(ts) if t1 is None else bisect_left(ts, _ms(t1), start)
+        return self._rows(start, stop)
+
+    def rows_of(self, event_type):
+        """Row numbers of one event type, in order"""
+        if event_type not in self.types:
+            return []
+        raw = self.columns["type"].tobytes()
+        code = bytes([self.types.index(event_type)])
+        rows = []
+        row = raw.find(code)
+        while row != -1:
+            rows.append(row)
+            row = raw.find(code, row + 1)
+        return rows
+
+    def focus_segments(self):
+        """
+        [(start_ms, end_ms, title, process)] - one per focus_change, lasting
+        until the next one (the last until the day's final event)
+        """
+        rows = self.rows_of("focus_change")
+        if not rows:
+            return []
+        ts, titles, processes = self.columns["ts"], self.columns["title"], self.columns["process"]
+        ends = [ts[row] for row in rows[1:]] + [ts[-1]]
+        return [(ts[row], end, self._string(titles[row]), self._string(processes[row]))
+                for row, end in zip(rows, ends)]
+
+    def _string(self, code):
+        return None if code == NO_STRING else self.strings[code]
+
+def _ms(value):
+    return iso_to_epoch_ms(value) if isinstance(value, str) else value
+
+def load_day_events(day_dir):
+    """
+    A day as DayEvents: copied from a fresh raw_telemetry.col, or built from
+    the day file (folder or archive). Only the columns outlive the call; the
+    parsed dicts are dropped before it returns.
+    """
+    columnar_file = fresh_columnar(day_dir)
+    if columnar_file:
+        with ColumnarDay(columnar_file) as day:
+            return DayEvents.from_columnar(day)
+    data = load_day_telemetry(day_dir)
+    return DayEvents.from_events(data.get("events", []), data.get("meta"), data.get("metrics"))
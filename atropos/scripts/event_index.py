@@ -0,0 +1,165 @@
+"""
+Random access into a day's events (raw_telemetry.idx.json sidecar)
+
+The sidecar samples the byte offset of an event every N events and at the
+first event of every minute, as [event_number, byte_offset, ts] rows. A page
+(offset/limit) or time-window query seeks to the nearest preceding sample
+and parses forward from there, so only the bytes around the answer are read.
+Columnar days need no sidecar: the sorted ts column is bisected directly.
+Archived days use the sidecar packed alongside them. Samples always hold ISO
+timestamps; for 2.0.0 (epoch-delta) days the sidecar also records meta.base
+and events read through it come back in 1.0.0 form.
+"""
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+from archive import DayArchive, find_archive, open_day_telemetry
+from columnar import ColumnarDay, fresh_columnar, iso_to_epoch_ms
+from telemetry_io import (EventStream, atomic_open, epoch_ms_to_iso, iso_event, open_telemetry, schema_base,
+                          telemetry_path)
+
+OFFSET_INDEX_FILE = "raw_telemetry.idx.json"
+DEFAULT_EVERY = 500
+
+class OffsetIndexBuilder:
+    """Collects sample rows; feed add(byte_offset, event) in file order"""
+
+    def __init__(self, every=DEFAULT_EVERY, base=None):
+        self.every = every
+        self.base = base  # meta.base of a 2.0.0 day file
+        self.samples = []
+        self.count = 0
+        self._minute = None
+
+    def add(self, byte_offset, event):
+        t = event.get("t")
+        minute = event.get("ts", "")[:16] if t is None else t // 60000
+        if self.count % self.every == 0 or minute != self._minute:
+            ts = event.get("ts", "") if t is None else epoch_ms_to_iso(self.base + t)
+            self.samples.append([self.count, byte_offset, ts])
+            self._minute = minute
+        self.count += 1
+
+    def write(self, source_path, index_path=None):
+        """Save the sidecar, stamped with the source file's size and mtime"""
+        st = os.stat(source_path)
+        index = {
+            "version": 1,
+            "source": {"size": st.st_size, "mtime_ns": st.st_mtime_ns},
+            "every": self.every,
+            "base": self.base,
+            "events": self.count,
+            "samples": self.samples,
+        }
+        index_path = index_path or os.path.join(os.path.dirname(source_path), OFFSET_INDEX_FILE)
+        with atomic_open(index_path, 'w') as f:
+            json.dump(index, f, separators=(",", ":"))
+        return index
+
+def build_offset_index(source_path, every=DEFAULT_EVERY):
+    """Scan a day file once and write its sidecar"""
+    with open_telemetry(source_path) as f:
+        stream = EventStream(f)
+        builder = OffsetIndexBuilder(every, schema_base(stream.header.get("meta")))
+        for byte_offset, event in stream:
+            builder.add(byte_offset, event)
+    return builder.write(source_path)
+
+def load_offset_index(day_dir, build=True):
+    """The day's sidecar if it matches its day file, (re)building it if allowed"""
+    source_path = telemetry_path(day_dir)
+    if source_path is None:
+        return _archived_offset_index(day_dir)
+    try:
+        with open(day_dir / OFFSET_INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        st = os.stat(source_path)
+        if index["source"] == {"size": st.st_size, "mtime_ns": st.st_mtime_ns}:
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    return build_offset_index(source_path) if build else None
+
+def _archived_offset_index(day_dir):
+    """Archived days never change: use their packed sidecar, or scan once without saving"""
+    archive = find_archive(day_dir)
+    if archive is None:
+        raise FileNotFoundError(f"No telemetry for {day_dir.name}")
+    with DayArchive(archive) as a:
+        index = a.load_json(day_dir.name, OFFSET_INDEX_FILE)
+    if index:
+        return index
+    with open_day_telemetry(day_dir) as f:
+        stream = EventStream(f)
+        builder = OffsetIndexBuilder(base=schema_base(stream.header.get("meta")))
+        for byte_offset, event in stream:
+            builder.add(byte_offset, event)
+    return {"base": builder.base, "events": builder.count, "samples": builder.samples}
+
+def _read_from(day_dir, sample, base=None):
+    """Yield (event_number, event) starting at a sample row, events in 1.0.0 form"""
+    number = sample[0]
+    with open_day_telemetry(day_dir) as f:
+        for _, event in EventStream(f, offset=sample[1]):
+            yield number, iso_event(event, base)
+            number += 1
+
+def read_page(day_dir, offset, limit):
+    """Events [offset, offset + limit) as [(event_number, event)]"""
+    columnar_file = fresh_columnar(day_dir)
+    if columnar_file:
+        with ColumnarDay(columnar_file) as day:
+            return list(enumerate(day.iter_events(offset, offset + limit), start=offset))
+
+    index = load_offset_index(day_dir)
+    samples = index["samples"]
+    if not samples or offset >= index["events"]:
+        return []
+    sample = samples[max(0, bisect_right([s[0] for s in samples], offset) - 1)]
+    page = []
+    for number, event in _read_from(day_dir, sample, index.get("base")):
+        if number >= offset + limit:
+            break
+        if number >= offset:
+            page.append((number, event))
+    return page
+
+def read_window(day_dir, start, end):
+    """
+    Events with start <= ts < end as [(event_number, event)].
+    start/end are 'YYYY-MM-DDTHH:MM[:SS]' strings (None = open-ended).
+    """
+    start = _normalize(start)
+    end = _normalize(end)
+    columnar_file = fresh_columnar(day_dir)
+    if columnar_file:
+        with ColumnarDay(columnar_file) as day:
+            ts = day.column("ts")
+            lo = bisect_left(ts, iso_to_epoch_ms(start)) if start else 0
+            hi = bisect_left(ts, iso_to_epoch_ms(end)) if end else day.rows
+            return list(enumerate(day.iter_events(lo, hi), start=lo))
+
+    index = load_offset_index(day_dir)
+    samples = index["samples"]
+    if not samples:
+        return []
+    # Start from the last sample strictly before `start`: events sharing a
+    # timestamp may precede the first sample that carries it
+    i = bisect_left([s[2][:19] for s in samples], start) - 1 if start else 0
+    window = []
+    for number, event in _read_from(day_dir, samples[max(0, i)], index.get("base")):
+        ts = event.get("ts", "")[:19]
+        if end and ts >= end:
+            break
+        if not start or ts >= start:
+            window.append((number, event))
+    return window
+
+def _normalize(ts):
+    """'2025-01-02T14:00' -> '2025-01-02T14:00:00' (comparable with event ts)"""
+    if ts is None:
+        return None
+    ts = ts.rstrip("Z")
+    return ts + ":00" if len(ts) == 16 else ts
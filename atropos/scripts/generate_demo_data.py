@@ -4,13 +4,36 @@ Moirai Atropos Demo Data Generator
 Generates realistic telemetry data for 2025-01-01 to 2026-02-10
 """
 
+import argparse
+import hashlib
 import json
 import random
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+from multiprocessing import Pool
 from pathlib import Path
 import math
 
+from activity import ACTIVITY_FILE, ActivityBuilder
+from build_index import INDEX_FILE, day_entry, update_index
+from columnar import COLUMNAR_FILE, ColumnarWriter
+from day_events import DayEvents
+from event_index import OffsetIndexBuilder
+from manifest import MANIFEST_FILE, manifest_dates, refresh_manifest
+from pyramid import PYRAMID_DIR, build_pyramid
+from rollup import ROLLUP_FILE, RollupBuilder
+from sessions import SESSIONS_FILE, SessionBuilder
+from sketches import SKETCHES_FILE, SketchBuilder
+from telemetry_io import (APP_COMPRESSIONS, DEVICES_DIR, EPOCH_SCHEMA_VERSION, LAYOUTS, SCHEMA_VERSION, SCHEMA_VERSIONS,
+                          TELEMETRY_FILE, TELEMETRY_NAMES, StringTable, atomic_open, day_base, epoch_events,
+                          write_telemetry_stream)
+
+try:
+    import numpy as np
+except ImportError:  # the batched engine is optional
+    np = None
+
 # ─────────────────────────────────────────────
 #  Configuration
 # ─────────────────────────────────────────────
@@ -18,6 +41,14 @@ START_DATE = datetime(2025, 1, 1)
 END_DATE = datetime(2026, 2, 10)
 OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
 
+# Checksums of every day's outputs and the options that produced them, for --resume
+GENERATION_FILE = "generation.json"
+GENERATION_VERSION = 1
+
+# Every day draws from its own RNG stream derived from this seed, so the
+# output does not depend on generation order or worker count
+MASTER_SEED = 20250101
+
 # Application pools for realistic usage patterns
 CODING_APPS = [
     "Visual Studio Code",
@@ -78,13 +109,82 @@ PRODUCTIVITY_APPS = [
 
 ALL_APPS = CODING_APPS + BROWSER_APPS + COMMUNICATION_APPS + DESIGN_APPS + PRODUCTIVITY_APPS
 
+# Summary categories, checked in this order: a title belongs to the first
+# category with an app name contained in it ("productivity" is the fallback)
+CATEGORIES = ["coding", "browsing", "communication", "design", "productivity"]
+_CATEGORY_MATCHERS = [
+    ("coding", CODING_APPS),
+    ("browsing", BROWSER_APPS),
+    ("communication", COMMUNICATION_APPS),
+    ("design", DESIGN_APPS),
+]
+
+def _match_category(title):
+    for category, apps in _CATEGORY_MATCHERS:
+        if any(app in title for app in apps):
+            return category
+    return "productivity"
+
+# title -> category, precomputed for every known app; unknown titles are
+# matched by substring once and memoised here
+APP_CATEGORY = {app: _match_category(app) for app in ALL_APPS}
+
+def app_category(title):
+    """Summary category of a window title"""
+    category = APP_CATEGORY.get(title)
+    if category is None:
+        category = APP_CATEGORY[title] = _match_category(title)
+    return category
+
 # Event types
 EVENT_TYPES = ["focus_change", "keystroke", "mouse_move", "mouse_click", "scroll"]
 
+# Event generation engines: the scalar reference loop and the batched NumPy one
+ENGINES = ["python", "numpy"]
+
+# Simulated machines for --devices: the os (Go's runtime.GOOS) and timezone
+# that Clotho's MetaInfo records, assigned round-robin
+DEVICE_PROFILES = [
+    ("windows", "America/New_York"),
+    ("darwin", "Europe/London"),
+    ("linux", "Asia/Kolkata"),
+    ("windows", "America/Los_Angeles"),
+    ("darwin", "Asia/Tokyo"),
+    ("linux", "Europe/Berlin"),
+]
+
 # ─────────────────────────────────────────────
 #  Helper Functions
 # ─────────────────────────────────────────────
 
+def day_seed(master_seed, date, device_id=None):
+    """Derive a stable per-day (and per-device) RNG seed from the master seed and the date"""
+    key = f"{master_seed}:{device_id + ':' if device_id else ''}{date.strftime('%Y-%m-%d')}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+def device_info(number):
+    """MetaInfo fields of simulated device `number` (0-based): dev-001, dev-002, ..."""
+    os_name, tz = DEVICE_PROFILES[number % len(DEVICE_PROFILES)]
+    return {"device_id": f"dev-{number + 1:03d}", "os": os_name, "timezone": tz}
+
+def years_after(start, years):
+    """Last day of a span of whole years beginning at start"""
+    try:
+        following = start.replace(year=start.year + years)
+    except ValueError:  # Feb 29 into a non-leap year
+        following = start.replace(year=start.year + years, day=28)
+    return following - timedelta(days=1)
+
+def run_timestamp():
+    """
+    Timestamp stamped into every day's meta.generated_at for this run.
+    Honours SOURCE_DATE_EPOCH so repeated runs can be byte-identical.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+    return datetime.now().isoformat() + "Z"
+
 def is_weekday(date):
     """Check if date is a weekday (Mon-Fri)"""
     return date.weekday() < 5
@@ -142,9 +242,27 @@ def select_app_for_time(hour, is_weekday_flag):
     
     return random.choice(app_pool)
 
-def generate_events_for_day(date):
+def generate_events_for_day(date, engine="python", rate=1):
     """Generate realistic events for a single day"""
-    events = []
+    if engine == "numpy":
+        return generate_events_for_day_numpy(date, rate=rate)
+    return list(iter_events_for_day(date, engine, rate))
+
+def iter_events_for_day(date, engine="python", rate=1):
+    """
+    Yield the day's events in timestamp order.
+    The scalar engine produces them lazily, one tick at a time, so streaming
+    writers never hold the whole day; the numpy engine is batched per day.
+    rate multiplies how often the simulated user acts (load testing): every
+    gap between ticks is divided by it, so a day holds about rate times the
+    events. Timestamps keep whole seconds, so fast ticks share them.
+    """
+    if engine == "numpy":
+        yield from generate_events_for_day_numpy(date, rate=rate)
+        return
+    if engine != "python":
+        raise ValueError(f"Unknown event engine: {engine}")
+
     is_weekday_flag = is_weekday(date)
     
     # Determine work hours for this day
@@ -163,60 +281,189 @@ def generate_events_for_day(date):
     while current_time < end_time:
         hour = current_time.hour
         intensity = get_work_intensity(hour, is_weekday_flag)
+        ts = current_time.isoformat(timespec="seconds") + "Z"
         
         # Focus change events (switching apps)
         if random.random() < 0.15 * intensity:
             new_app = select_app_for_time(hour, is_weekday_flag)
             if new_app != current_app:
-                events.append({
-                    "ts": current_time.isoformat() + "Z",
+                yield {
+                    "ts": ts,
                     "type": "focus_change",
                     "title": new_app,
                     "process": new_app.split()[0].lower()
-                })
+                }
                 current_app = new_app
         
         # Keystroke events
         keystroke_count = int(random.gauss(30, 10) * intensity)
         if keystroke_count > 0:
-            events.append({
-                "ts": current_time.isoformat() + "Z",
+            yield {
+                "ts": ts,
                 "type": "keystroke",
                 "count": max(1, keystroke_count)
-            })
+            }
         
         # Mouse events
         if random.random() < 0.6 * intensity:
-            events.append({
-                "ts": current_time.isoformat() + "Z",
+            yield {
+                "ts": ts,
                 "type": "mouse_move",
                 "distance_px": int(random.gauss(500, 200))
-            })
+            }
         
         if random.random() < 0.3 * intensity:
-            events.append({
-                "ts": current_time.isoformat() + "Z",
+            yield {
+                "ts": ts,
                 "type": "mouse_click",
                 "button": random.choice(["left", "left", "left", "right"])
-            })
+            }
         
         # Scroll events
         if random.random() < 0.2 * intensity:
-            events.append({
-                "ts": current_time.isoformat() + "Z",
+            yield {
+                "ts": ts,
                 "type": "scroll",
                 "delta": random.randint(-300, 300)
-            })
+            }
         
         # Time increment (2-15 seconds based on intensity)
         increment = random.randint(2, int(15 / max(intensity, 0.1)))
-        current_time += timedelta(seconds=increment)
-    
-    # Sort events by timestamp
-    events.sort(key=lambda x: x["ts"])
-    
+        current_time += timedelta(seconds=increment / rate)
+
+# Per-tick event order of the scalar loop, used to interleave batched output
+_TICK_ORDER = {event_type: i for i, event_type in enumerate(EVENT_TYPES)}
+
+_APP_POOLS = [CODING_APPS, BROWSER_APPS, COMMUNICATION_APPS, DESIGN_APPS, PRODUCTIVITY_APPS]
+_APP_INDEX = [app for pool in _APP_POOLS for app in pool]
+_APP_POOL_OFFSETS = [sum(len(pool) for pool in _APP_POOLS[:i]) for i in range(len(_APP_POOLS))]
+
+# Every string field value either engine can emit: the string table of
+# dictionary-encoded (--string-table) streamed days
+APP_STRINGS = EVENT_TYPES + ["left", "right"] + [
+    value for app in _APP_INDEX for value in (app, app.split()[0].lower())]
+
+def _pool_weights(intensity):
+    """Category weights used by select_app_for_time for a given intensity"""
+    if intensity > 0.7:
+        return [0.5, 0.2, 0.1, 0.05, 0.15]
+    elif intensity > 0.4:
+        return [0.3, 0.3, 0.15, 0.1, 0.15]
+    return [0.1, 0.3, 0.25, 0.15, 0.2]
+
+def _select_apps_numpy(rng, intensities):
+    """Vectorized select_app_for_time: one app index per entry of intensities"""
+    pools = np.empty(len(intensities), dtype=np.int64)
+    for level in np.unique(intensities):
+        mask = intensities == level
+        pools[mask] = rng.choice(len(_APP_POOLS), size=int(mask.sum()), p=_pool_weights(level))
+    sizes = np.array([len(pool) for pool in _APP_POOLS])[pools]
+    offsets = np.array(_APP_POOL_OFFSETS)[pools]
+    return offsets + (rng.random(len(pools)) * sizes).astype(np.int64)
+
+def _tick_times_numpy(rng, start_sec, end_sec, is_weekday_flag, rate=1):
+    """
+    Draw every tick of the day at once, in milliseconds.
+    Increments depend on the hour's intensity, so each hour is drawn as one
+    batch and the tick that crosses into the next hour seeds the next batch.
+    Each increment is divided by rate (see iter_events_for_day).
+    """
+    times = []
+    t, end_ms = start_sec * 1000, end_sec * 1000
+    while t < end_ms:
+        hour = t // 3_600_000
+        intensity = get_work_intensity(hour, is_weekday_flag)
+        segment_end = min((hour + 1) * 3_600_000, end_ms)
+        increments = rng.integers(2, int(15 / max(intensity, 0.1)) + 1,
+                                  size=int((segment_end - t) * rate) // 2000 + 1)
+        increments = np.maximum((increments * (1000 / rate)).astype(np.int64), 1)
+        offsets = np.concatenate(([0], np.cumsum(increments[:-1])))
+        segment = t + offsets
+        kept = int(np.searchsorted(segment, segment_end))
+        times.append(segment[:kept])
+        t = int(segment[kept - 1] + increments[kept - 1])
+    return np.concatenate(times) if times else np.empty(0, dtype=np.int64)
+
+def generate_events_for_day_numpy(date, rng=None, rate=1):
+    """
+    Batched equivalent of generate_events_for_day.
+    Draws tick increments, intensities and event masks for the whole day as
+    NumPy arrays, formats timestamps in bulk and only builds dicts at the end.
+    The RNG defaults to one derived from the (per-day seeded) global stream.
+    """
+    if np is None:
+        raise RuntimeError("The numpy engine requires NumPy (pip install numpy)")
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+
+    is_weekday_flag = is_weekday(date)
+    if is_weekday_flag:
+        start_hour = int(rng.integers(8, 11))
+        end_hour = int(rng.integers(18, 24))
+    else:
+        start_hour = int(rng.integers(10, 13))
+        end_hour = int(rng.integers(16, 23))
+    start_sec = start_hour * 3600 + int(rng.integers(0, 60)) * 60
+    end_sec = end_hour * 3600 + int(rng.integers(0, 60)) * 60
+
+    ticks = _tick_times_numpy(rng, start_sec, end_sec, is_weekday_flag, rate) // 1000
+    n = len(ticks)
+    hourly = np.array([get_work_intensity(h, is_weekday_flag) for h in range(24)])
+    intensity = hourly[ticks // 3600] if n else np.empty(0)
+
+    # Focus changes: the current app is always the last candidate drawn, so a
+    # change is emitted wherever a candidate differs from the previous one
+    first_app = _select_apps_numpy(rng, hourly[[start_hour]])
+    focus_ticks = np.flatnonzero(rng.random(n) < 0.15 * intensity)
+    candidates = _select_apps_numpy(rng, intensity[focus_ticks])
+    previous = np.concatenate((first_app, candidates[:-1]))
+    switched = candidates != previous
+    focus_ticks, focus_apps = focus_ticks[switched], candidates[switched]
+
+    counts = np.trunc(rng.normal(30, 10, n) * intensity).astype(np.int64)
+    key_ticks = np.flatnonzero(counts > 0)
+
+    move_ticks = np.flatnonzero(rng.random(n) < 0.6 * intensity)
+    distances = np.trunc(rng.normal(500, 200, len(move_ticks))).astype(np.int64)
+
+    click_ticks = np.flatnonzero(rng.random(n) < 0.3 * intensity)
+    right_clicks = rng.random(len(click_ticks)) < 0.25
+
+    scroll_ticks = np.flatnonzero(rng.random(n) < 0.2 * intensity)
+    deltas = rng.integers(-300, 301, len(scroll_ticks))
+
+    base = np.datetime64(date.strftime("%Y-%m-%d"), "s")
+    stamps = [ts + "Z" for ts in np.datetime_as_string(base + ticks.astype("timedelta64[s]"), unit="s").tolist()]
+
+    def at(ticks):
+        return [stamps[t] for t in ticks.tolist()]
+
+    per_type = [
+        ("focus_change", focus_ticks, [
+            {"ts": ts, "type": "focus_change", "title": _APP_INDEX[a], "process": _APP_INDEX[a].split()[0].lower()}
+            for ts, a in zip(at(focus_ticks), focus_apps.tolist())]),
+        ("keystroke", key_ticks, [
+            {"ts": ts, "type": "keystroke", "count": c}
+            for ts, c in zip(at(key_ticks), counts[key_ticks].tolist())]),
+        ("mouse_move", move_ticks, [
+            {"ts": ts, "type": "mouse_move", "distance_px": d}
+            for ts, d in zip(at(move_ticks), distances.tolist())]),
+        ("mouse_click", click_ticks, [
+            {"ts": ts, "type": "mouse_click", "button": "right" if r else "left"}
+            for ts, r in zip(at(click_ticks), right_clicks.tolist())]),
+        ("scroll", scroll_ticks, [
+            {"ts": ts, "type": "scroll", "delta": d}
+            for ts, d in zip(at(scroll_ticks), deltas.tolist())]),
+    ]
+
+    # Interleave exactly like the scalar loop: by tick, then by per-tick order
+    tick_index = np.concatenate([t for _, t, _ in per_type])
+    type_order = np.concatenate([np.full(len(t), _TICK_ORDER[name]) for name, t, _ in per_type])
+    unordered = [event for _, _, group in per_type for event in group]
+    events = [unordered[i] for i in np.lexsort((type_order, tick_index)).tolist()]
     return events
 
+
 def should_skip_day(date):
     """Determine if this day should be skipped (vacation, sick day, etc.)"""
     # Skip some random days for realism (vacations, sick days)
@@ -237,22 +484,42 @@ def should_skip_day(date):
     
     return False
 
-def calculate_metrics(events, date):
-    """Calculate daily metrics from events"""
-    total_keystrokes = sum(e.get("count", 1) for e in events if e["type"] == "keystroke")
-    total_mouse_dist = sum(e.get("distance_px", 0) for e in events if e["type"] == "mouse_move")
-    
-    # Calculate active time (time between first and last event)
-    if events:
-        first_time = datetime.fromisoformat(events[0]["ts"].replace("Z", ""))
-        last_time = datetime.fromisoformat(events[-1]["ts"].replace("Z", ""))
+def calculate_metrics(events, date, by_device=False):
+    """
+    Calculate daily metrics from events (event dicts or a DayEvents).
+    With by_device=True (event dicts of a merged multi-device day), the
+    metrics gain "devices": each device's measured metrics and event count.
+    """
+    if by_device:
+        stats = DeviceAccumulator()
+        stats.extend(events)
+        return dict(stats.total.metrics(date), devices=stats.device_metrics())
+    stats = DayAccumulator()
+    if isinstance(events, DayEvents):
+        stats.add_day(events)
+    else:
+        stats.extend(events)
+    return stats.metrics(date)
+
+def session_metrics(total_keystrokes, total_mouse_dist, first_ts, last_ts, app_usage):
+    """
+    The metrics block as measured: flow score from activity alone, without
+    the synthetic day-to-day variation (used as-is for live day files)
+    """
+    # Calculate active time (time between first and last event); the
+    # timestamps are ISO strings, or "t" millisecond offsets for 2.0.0 days
+    if isinstance(first_ts, int):
+        active_minutes = (last_ts - first_ts) / 60000
+        idle_minutes = max(0, 1440 - active_minutes)  # 1440 = 24 hours
+    elif first_ts:
+        first_time = datetime.fromisoformat(first_ts.replace("Z", ""))
+        last_time = datetime.fromisoformat(last_ts.replace("Z", ""))
         active_minutes = (last_time - first_time).total_seconds() / 60
         idle_minutes = max(0, 1440 - active_minutes)  # 1440 = 24 hours
     else:
         active_minutes = 0
         idle_minutes = 1440
     
-    # Calculate flow score (0-100) with MORE REALISTIC variation
     # Base score from activity
     base_score = min(100, int(
         (total_keystrokes / 100) * 0.4 +
@@ -260,9 +527,24 @@ def calculate_metrics(events, date):
         (active_minutes / 10) * 0.4
     ))
     
+    top_window = max(app_usage.items(), key=lambda x: x[1])[0] if app_usage else "Unknown"
+    
+    return {
+        "total_keystrokes": total_keystrokes,
+        "total_mouse_dist_pixels": total_mouse_dist,
+        "idle_minutes": int(idle_minutes),
+        "flow_score_estimate": base_score,
+        "top_window": top_window
+    }
+
+def finalize_metrics(date, total_keystrokes, total_mouse_dist, first_ts, last_ts, app_usage):
+    """Turn raw day totals into the metrics block (flow score, idle time, top app)"""
+    metrics = session_metrics(total_keystrokes, total_mouse_dist, first_ts, last_ts, app_usage)
+    
+    # Calculate flow score (0-100) with MORE REALISTIC variation
     # Add natural daily variation (-15 to +5)
     variation = random.randint(-15, 5)
-    flow_score = max(0, min(100, base_score + variation))
+    flow_score = max(0, min(100, metrics["flow_score_estimate"] + variation))
     
     # Weekends tend to be lower
     if not is_weekday(date):
@@ -272,51 +554,162 @@ def calculate_metrics(events, date):
     if random.random() < 0.1:
         flow_score = int(flow_score * random.uniform(0.5, 0.8))
     
-    # Find most used app
-    app_usage = {}
-    for event in events:
-        if event["type"] == "focus_change":
+    metrics["flow_score_estimate"] = flow_score
+    return metrics
+
+class DayAccumulator:
+    """
+    Single-pass day totals: metrics, event counts, focus counts per app and
+    per summary category. Feed events one at a time with add() (streaming
+    writers) or all at once with extend(), in either schema but not mixed:
+    first_ts/last_ts keep whatever the events carry ("ts" or "t"). A whole
+    DayEvents goes through add_day(), which sums its columns instead.
+    """
+
+    def __init__(self):
+        self.total_keystrokes = 0
+        self.total_mouse_dist = 0
+        self.first_ts = None
+        self.last_ts = None
+        self.event_count = 0
+        self.event_counts = {}
+        self.app_usage = {}
+        self.category_counts = dict.fromkeys(CATEGORIES, 0)
+
+    def add(self, event):
+        event_type = event["type"]
+        if event_type == "keystroke":
+            self.total_keystrokes += event.get("count", 1)
+        elif event_type == "mouse_move":
+            self.total_mouse_dist += event.get("distance_px", 0)
+        elif event_type == "focus_change":
             app = event.get("title", "Unknown")
-            app_usage[app] = app_usage.get(app, 0) + 1
-    
-    top_window = max(app_usage.items(), key=lambda x: x[1])[0] if app_usage else "Unknown"
-    
-    return {
-        "total_keystrokes": total_keystrokes,
-        "total_mouse_dist_pixels": total_mouse_dist,
-        "idle_minutes": int(idle_minutes),
-        "flow_score_estimate": flow_score,
-        "top_window": top_window
-    }
+            self.app_usage[app] = self.app_usage.get(app, 0) + 1
+            self.category_counts[app_category(app)] += 1
+        ts = event.get("ts")
+        if ts is None:
+            ts = event["t"]
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.event_count += 1
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+
+    def extend(self, events):
+        """add() for every event, with the loop state kept in locals"""
+        keystrokes = mouse_dist = count = 0
+        first = last = None
+        event_counts = self.event_counts
+        app_usage = self.app_usage
+        category_counts = self.category_counts
+        for event in events:
+            event_type = event["type"]
+            if event_type == "keystroke":
+                keystrokes += event.get("count", 1)
+            elif event_type == "mouse_move":
+                mouse_dist += event.get("distance_px", 0)
+            elif event_type == "focus_change":
+                app = event.get("title", "Unknown")
+                app_usage[app] = app_usage.get(app, 0) + 1
+                category_counts[app_category(app)] += 1
+            if first is None:
+                first = event
+            last = event
+            count += 1
+            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        if first is None:
+            return
+        self.total_keystrokes += keystrokes
+        self.total_mouse_dist += mouse_dist
+        if self.first_ts is None:
+            self.first_ts = first.get("ts", first.get("t"))
+        self.last_ts = last.get("ts", last.get("t"))
+        self.event_count += count
+
+    def add_day(self, day):
+        """extend() for a DayEvents; first_ts/last_ts become epoch milliseconds"""
+        self.total_keystrokes += day.sum_by_type("count").get("keystroke", 0)
+        self.total_mouse_dist += day.sum_by_type("distance_px").get("mouse_move", 0)
+        for _, _, app, _ in day.focus_segments():
+            app = app or "Unknown"
+            self.app_usage[app] = self.app_usage.get(app, 0) + 1
+            self.category_counts[app_category(app)] += 1
+        for event_type, count in day.type_counts().items():
+            self.event_counts[event_type] = self.event_counts.get(event_type, 0) + count
+            self.event_count += count
+        span = day.span()
+        if span:
+            if self.first_ts is None:
+                self.first_ts = span[0]
+            self.last_ts = span[1]
+
+    def metrics(self, date):
+        """The metrics block (draws the flow-score variation from `random`)"""
+        return finalize_metrics(date, self.total_keystrokes, self.total_mouse_dist,
+                                self.first_ts, self.last_ts, self.app_usage)
+
+    def session_metrics(self):
+        """The metrics block without synthetic variation (live day files)"""
+        return session_metrics(self.total_keystrokes, self.total_mouse_dist,
+                               self.first_ts, self.last_ts, self.app_usage)
+
+    def state(self):
+        """JSON-able copy of the running totals, for checkpoints"""
+        return {key: (dict(value) if isinstance(value, dict) else value)
+                for key, value in vars(self).items()}
+
+    @classmethod
+    def from_state(cls, state):
+        """Resume an accumulator from state()"""
+        accumulator = cls()
+        for key, value in state.items():
+            if hasattr(accumulator, key):
+                setattr(accumulator, key, value)
+        return accumulator
+
+class DeviceAccumulator:
+    """
+    DayAccumulator for a merged multi-device day: one over the whole stream
+    plus one per "device_id" the events carry (see merge_devices.py).
+    """
+
+    def __init__(self):
+        self.total = DayAccumulator()
+        self.devices = {}
+
+    def add(self, event):
+        self.total.add(event)
+        device_id = event.get("device_id", "unknown")
+        stats = self.devices.get(device_id)
+        if stats is None:
+            stats = self.devices[device_id] = DayAccumulator()
+        stats.add(event)
 
-def generate_summary(date, metrics, events):
-    """Generate AI-style daily summary"""
+    def extend(self, events):
+        for event in events:
+            self.add(event)
+
+    def device_metrics(self):
+        """{device_id: measured metrics block plus the device's event count}"""
+        return {device_id: dict(stats.session_metrics(), events=stats.event_count)
+                for device_id, stats in sorted(self.devices.items())}
+
+    def session_metrics(self):
+        """The merged day's measured metrics with the per-device breakdown"""
+        return dict(self.total.session_metrics(), devices=self.device_metrics())
+
+def generate_summary(date, metrics, category_counts):
+    """
+    Generate AI-style daily summary.
+    `category_counts` maps each of CATEGORIES to its focus changes
+    (DayAccumulator.category_counts).
+    """
     flow_score = metrics["flow_score_estimate"]
     keystrokes = metrics["total_keystrokes"]
     top_app = metrics["top_window"]
     
     # Determine dominant activity
-    app_types = {
-        "coding": 0,
-        "browsing": 0,
-        "communication": 0,
-        "design": 0,
-        "productivity": 0
-    }
-    
-    for event in events:
-        if event["type"] == "focus_change":
-            app = event.get("title", "")
-            if any(coding_app in app for coding_app in CODING_APPS):
-                app_types["coding"] += 1
-            elif any(browser in app for browser in BROWSER_APPS):
-                app_types["browsing"] += 1
-            elif any(comm in app for comm in COMMUNICATION_APPS):
-                app_types["communication"] += 1
-            elif any(design in app for design in DESIGN_APPS):
-                app_types["design"] += 1
-            else:
-                app_types["productivity"] += 1
+    app_types = {category: category_counts.get(category, 0) for category in CATEGORIES}
     
     dominant_activity = max(app_types.items(), key=lambda x: x[1])[0]
     
@@ -396,43 +789,103 @@ The day's pattern suggests a focus on {dominant_activity} with {'sustained' if f
 *Generated by Lachesis AI Engine*
 """
 
-def generate_data_for_date(date):
-    """Generate complete data package for a single date"""
-    print(f"Generating data for {date.strftime('%Y-%m-%d')}...")
+def generate_data_for_date(date, generated_at=None, verbose=True, engine="python", layout="lines",
+                           columnar=False, compression=None, schema=SCHEMA_VERSION, string_table=False,
+                           output_dir=None, rate=1, device=None):
+    """
+    Generate complete data package for a single date.
+    The default "lines"/"compact" layouts stream events straight from the
+    engine to disk and record the raw_telemetry.idx.json offset sidecar;
+    "pretty" keeps the legacy in-memory indent=2 writer.
+    Every day gets its rollup.json, sessions.json, activity.json and
+    sketches.json; with columnar=True the day is also written as
+    raw_telemetry.col.
+    compression="gz"/"bz2"/"xz" writes raw_telemetry.json.<codec> instead
+    of the plain file. schema="2.0.0" stores integer millisecond offsets
+    from meta.base instead of ISO "ts"; string_table=True stores the
+    string field values once in meta.strings and refers to them by index.
+    rate scales the event rate (load testing) and device adds a simulated
+    machine's device_id/os/timezone to meta.
+    Every file is written to a temp name and renamed into place, so a crash
+    leaves each output either complete or absent.
+    Returns (metrics, summary, event_counts).
+    """
+    if verbose:
+        print(f"Generating data for {date.strftime('%Y-%m-%d')}...")
     
     # Create directory structure
-    date_dir = OUTPUT_DIR / date.strftime("%Y") / date.strftime("%m") / date.strftime("%Y-%m-%d")
+    date_dir = day_dir_of(output_dir or OUTPUT_DIR, date)
     date_dir.mkdir(parents=True, exist_ok=True)
     
-    # Generate events
-    events = generate_events_for_day(date)
-    
-    # Calculate metrics
-    metrics = calculate_metrics(events, date)
-    
-    # Create telemetry JSON
-    telemetry = {
-        "meta": {
-            "date": date.strftime("%Y-%m-%d"),
-            "generated_at": datetime.now().isoformat() + "Z",
-            "version": "1.0.0"
-        },
-        "metrics": metrics,
-        "events": events
+    meta = {
+        "date": date.strftime("%Y-%m-%d"),
+        **(device or {}),
+        "generated_at": generated_at or run_timestamp(),
+        "version": schema
     }
+    base = None
+    if schema == EPOCH_SCHEMA_VERSION:
+        base = meta["base"] = day_base(meta["date"])
+    telemetry_path = date_dir / (TELEMETRY_FILE + (f".{compression}" if compression else ""))
+    # Drop other variants of the day file so readers cannot pick a stale one
+    for name in TELEMETRY_NAMES:
+        if name != telemetry_path.name:
+            (date_dir / name).unlink(missing_ok=True)
+    columns = ColumnarWriter(base) if columnar else None
+    stats = DayAccumulator()
+    rollup = RollupBuilder()
+    sessions = SessionBuilder()
+    activity = ActivityBuilder()
+    sketches = SketchBuilder()
+    sinks = [stats.add, rollup.add, sessions.add, activity.add, sketches.add] + ([columns.add] if columns else [])
     
-    # Write telemetry file
-    telemetry_path = date_dir / "raw_telemetry.json"
-    with open(telemetry_path, 'w', encoding='utf-8') as f:
-        json.dump(telemetry, f, indent=2)
+    if layout == "pretty":
+        events = generate_events_for_day(date, engine=engine, rate=rate)
+        if base is not None:
+            events = list(epoch_events(events, base))
+        for event in events:
+            for sink in sinks:
+                sink(event)
+        metrics = stats.metrics(date)
+        if string_table:
+            strings = StringTable()
+            events = [strings.encode(event) for event in events]
+            telemetry = {"meta": dict(meta, strings=strings.strings), "metrics": metrics, "events": events}
+        else:
+            telemetry = {"meta": meta, "metrics": metrics, "events": events}
+        with atomic_open(telemetry_path, 'w') as f:
+            json.dump(telemetry, f, indent=2)
+        summary = generate_summary(date, metrics, stats.category_counts)
+    else:
+        # Metrics and the per-day sidecars (and columns) are accumulated while the events are written
+        def on_event(event):
+            for sink in sinks:
+                sink(event)
+        events = iter_events_for_day(date, engine, rate)
+        if base is not None:
+            events = epoch_events(events, base)
+        offsets = OffsetIndexBuilder(base=base)
+        metrics = write_telemetry_stream(
+            telemetry_path, meta, events,
+            on_event=on_event, metrics=lambda: stats.metrics(date), layout=layout,
+            on_offset=offsets.add, strings=StringTable(APP_STRINGS) if string_table else None
+        )
+        offsets.write(telemetry_path)
+        summary = generate_summary(date, metrics, stats.category_counts)
     
-    # Generate and write summary
-    summary = generate_summary(date, metrics, events)
+    rollup.write(date_dir / ROLLUP_FILE, meta["date"])
+    sessions.write(date_dir / SESSIONS_FILE, meta["date"])
+    activity.write(date_dir / ACTIVITY_FILE, meta["date"])
+    sketches.write(date_dir / SKETCHES_FILE, meta["date"])
+    if columns:
+        columns.write(date_dir / COLUMNAR_FILE, meta, metrics)
+    
+    # Write summary
     summary_path = date_dir / "daily_summary.md"
-    with open(summary_path, 'w', encoding='utf-8') as f:
+    with atomic_open(summary_path, 'w') as f:
         f.write(summary)
     
-    return telemetry, summary
+    return metrics, summary, stats.event_counts
 
 def generate_tasks():
     """Generate realistic tasks for the demo user"""
@@ -544,57 +997,276 @@ def generate_tasks():
         "tasks": tasks
     }
 
-def main():
+def day_dir_of(root, date):
+    return Path(root) / date.strftime("%Y") / date.strftime("%m") / date.strftime("%Y-%m-%d")
+
+def file_checksums(day_dir):
+    """{name: sha256 hex} for every finished file in a day folder"""
+    checksums = {}
+    for path in sorted(Path(day_dir).iterdir()):
+        if path.is_file() and path.suffix != ".tmp":
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            checksums[path.name] = digest.hexdigest()
+    return checksums
+
+def outputs_match(day_dir, files):
+    """True if every recorded output is still on disk with its recorded checksum"""
+    try:
+        current = file_checksums(day_dir)
+    except OSError:
+        return False
+    return bool(files) and all(current.get(name) == checksum for name, checksum in files.items())
+
+def load_generation(root):
+    """generation.json from a data root ({"days": {date: record}}), or None if missing/unreadable"""
+    try:
+        with open(Path(root) / GENERATION_FILE, 'r', encoding='utf-8') as f:
+            generation = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return generation if generation.get("version") == GENERATION_VERSION else None
+
+def save_generation(root, generation):
+    """Write generation.json atomically"""
+    generation["version"] = GENERATION_VERSION
+    with atomic_open(Path(root) / GENERATION_FILE, 'w') as f:
+        json.dump(dict(generation, days=dict(sorted(generation["days"].items()))), f, separators=(",", ":"))
+    return generation
+
+def generate_day(date, master_seed=MASTER_SEED, generated_at=None, engine="python", layout="lines",
+                 columnar=False, compression=None, schema=SCHEMA_VERSION, string_table=False,
+                 output_dir=None, resume=None, rate=1, device=None):
+    """
+    Generate (or skip) one day on its own deterministic RNG stream (one per
+    device when `device` is given).
+    `resume` is the day's generation.json record: if it was made with the
+    same options and the files still match its checksums, the day is kept.
+    Returns (status, index_entry, record); entry and record are None for
+    skipped days.
+    """
+    random.seed(day_seed(master_seed, date, device and device["device_id"]))
+    if should_skip_day(date):
+        return "skipped", None, None
+    date_dir = day_dir_of(output_dir or OUTPUT_DIR, date)
+    options = {"seed": master_seed, "engine": engine, "layout": layout, "columnar": columnar,
+               "compression": compression, "schema": schema, "string_table": string_table,
+               "rate": rate, "device": device}
+    if resume and resume["options"] == options and outputs_match(date_dir, resume["files"]):
+        return "kept", day_entry(date_dir, resume["metrics"], resume["event_counts"]), resume
+    metrics, _, event_counts = generate_data_for_date(
+        date, generated_at=generated_at, verbose=False, engine=engine, layout=layout, columnar=columnar,
+        compression=compression, schema=schema, string_table=string_table, output_dir=output_dir,
+        rate=rate, device=device
+    )
+    record = {"options": options, "metrics": metrics, "event_counts": event_counts,
+              "files": file_checksums(date_dir)}
+    return "generated", day_entry(date_dir, metrics, event_counts), record
+
+def _generate_day_task(task):
+    """Worker entry point: returns (root, date_str, status, index_entry, record, error) for the parent"""
+    date, options = task
+    root = options["output_dir"]
+    try:
+        return (root, date.strftime("%Y-%m-%d"), *generate_day(date, **options), None)
+    except Exception as e:
+        return root, date.strftime("%Y-%m-%d"), "error", None, None, str(e)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Atropos demo telemetry")
+    parser.add_argument("--start", type=datetime.fromisoformat, metavar="YYYY-MM-DD",
+                        help=f"first day to generate (default: {START_DATE:%Y-%m-%d})")
+    span = parser.add_mutually_exclusive_group()
+    span.add_argument("--end", type=datetime.fromisoformat, metavar="YYYY-MM-DD",
+                      help=f"last day to generate (default: {END_DATE:%Y-%m-%d})")
+    span.add_argument("--years", type=int, metavar="N",
+                      help="generate N whole years from --start instead of up to --end")
+    parser.add_argument("--out", type=Path, metavar="DIR",
+                        help="data root to write (default: assets/demo_data)")
+    parser.add_argument("--seed", type=int, default=MASTER_SEED,
+                        help=f"master seed every day's RNG stream derives from (default: {MASTER_SEED})")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"keep days whose outputs still match the checksums in {GENERATION_FILE}")
+    parser.add_argument("--rate", type=float, default=1,
+                        help="event rate multiplier for load testing, e.g. 10 for ~10x events per day (default: 1)")
+    parser.add_argument("--devices", type=int, default=1,
+                        help=f"simulated machines; more than one writes a data root per device "
+                             f"under {DEVICES_DIR}/<device_id>/ (default: 1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (default: 1, serial)")
+    parser.add_argument("--engine", choices=ENGINES, default="python",
+                        help="event engine: scalar reference loop or batched NumPy")
+    parser.add_argument("--format", dest="layout", choices=LAYOUTS, default="lines",
+                        help="raw_telemetry.json layout (default: lines, one event per line)")
+    parser.add_argument("--columnar", action="store_true",
+                        help=f"also write the memory-mappable {COLUMNAR_FILE} per day")
+    parser.add_argument("--compress", dest="compression", choices=APP_COMPRESSIONS,
+                        help=f"write {TELEMETRY_FILE}.<codec> instead of the plain file")
+    parser.add_argument("--schema", choices=SCHEMA_VERSIONS, default=SCHEMA_VERSION,
+                        help=f"event schema: ISO 'ts' strings ({SCHEMA_VERSION}) or integer "
+                             f"millisecond offsets from meta.base ({EPOCH_SCHEMA_VERSION})")
+    parser.add_argument("--string-table", action="store_true",
+                        help="store event types, titles, process names and buttons once per day "
+                             "in meta.strings; events refer to them by index")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main generation function"""
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    if args.engine == "numpy" and np is None:
+        raise SystemExit("--engine numpy requires NumPy (pip install numpy)")
+    if args.rate <= 0 or args.devices < 1 or (args.years is not None and args.years < 1):
+        raise SystemExit("--rate, --devices and --years must be positive")
+    start = args.start or START_DATE
+    end = years_after(start, args.years) if args.years else args.end or END_DATE
+    if end < start:
+        raise SystemExit(f"--end {end:%Y-%m-%d} is before --start {start:%Y-%m-%d}")
+    root = args.out or OUTPUT_DIR
+    # One data root per simulated device, or the plain tree for a single machine
+    if args.devices > 1:
+        devices = [device_info(i) for i in range(args.devices)]
+        roots = [(root / DEVICES_DIR / device["device_id"], device) for device in devices]
+    else:
+        roots = [(root, None)]
+
     print("=" * 60)
     print("Moirai Atropos Demo Data Generator")
     print("=" * 60)
-    print(f"Start Date: {START_DATE.strftime('%Y-%m-%d')}")
-    print(f"End Date: {END_DATE.strftime('%Y-%m-%d')}")
-    print(f"Output Directory: {OUTPUT_DIR}")
+    print(f"Start Date: {start.strftime('%Y-%m-%d')}")
+    print(f"End Date: {end.strftime('%Y-%m-%d')}")
+    print(f"Output Directory: {root}")
+    print(f"Workers: {workers}")
+    print(f"Engine: {args.engine}")
+    print(f"Format: {args.layout}")
+    if args.compression:
+        print(f"Compression: {args.compression}")
+    if args.schema != SCHEMA_VERSION:
+        print(f"Schema: {args.schema}")
+    if args.string_table:
+        print("String table: on")
+    if args.seed != MASTER_SEED:
+        print(f"Seed: {args.seed}")
+    if args.rate != 1:
+        print(f"Event Rate: {args.rate:g}x")
+    if args.devices > 1:
+        print(f"Devices: {args.devices} (under {DEVICES_DIR}/)")
+    if args.resume:
+        print(f"Resume: keeping days that match {GENERATION_FILE}")
     print("=" * 60)
     
     # Ensure output directory exists
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    root.mkdir(parents=True, exist_ok=True)
     
     # Generate tasks.json
     print("\nGenerating tasks.json...")
+    random.seed(args.seed)
     tasks_data = generate_tasks()
-    tasks_path = OUTPUT_DIR / "tasks.json"
-    with open(tasks_path, 'w', encoding='utf-8') as f:
+    tasks_path = root / "tasks.json"
+    with atomic_open(tasks_path, 'w') as f:
         json.dump(tasks_data, f, indent=2)
     print(f"✓ Created {len(tasks_data['tasks'])} tasks")
     
-    # Generate data for each day
-    current_date = START_DATE
-    total_days = (END_DATE - START_DATE).days + 1
+    # Generate data for each day (and device)
+    total_days = (end - start).days + 1
+    total_tasks = total_days * len(roots)
+    options = {"master_seed": args.seed, "generated_at": run_timestamp(), "engine": args.engine,
+               "layout": args.layout, "columnar": args.columnar, "compression": args.compression,
+               "schema": args.schema, "string_table": args.string_table, "rate": args.rate}
+    generations = {}
+    index_entries = {}
+    for device_root, _ in roots:
+        device_root.mkdir(parents=True, exist_ok=True)
+        generations[device_root] = load_generation(device_root) or {"days": {}}
+        index_entries[device_root] = []
+    day_tasks = []
+    for i in range(total_days):
+        date = start + timedelta(days=i)
+        for device_root, device in roots:
+            resume = generations[device_root]["days"].get(date.strftime("%Y-%m-%d")) if args.resume else None
+            day_tasks.append((date, dict(options, output_dir=device_root, device=device, resume=resume)))
     generated = 0
+    kept = 0
     skipped = 0
+    failed = 0
+    events_written = 0
+    bytes_written = 0
+    saved_at = started = time.monotonic()
     
     print("\nGenerating daily data...")
-    while current_date <= END_DATE:
-        try:
-            # Skip certain days for realism
-            if should_skip_day(current_date):
-                print(f"Skipping {current_date.strftime('%Y-%m-%d')} (vacation/holiday)")
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        if pool:
+            # Shard the range into contiguous chunks; results stream back per day
+            chunksize = max(1, total_tasks // (workers * 4))
+            results = pool.imap_unordered(_generate_day_task, day_tasks, chunksize)
+        else:
+            results = map(_generate_day_task, day_tasks)
+
+        for done, (device_root, date_str, status, entry, record, error) in enumerate(results, 1):
+            progress = f"[{done}/{total_tasks}]"
+            label = date_str if device_root == root else f"{date_str} ({device_root.name})"
+            records = generations[device_root]["days"]
+            if status == "skipped":
+                print(f"{progress} Skipping {label} (vacation/holiday)")
                 skipped += 1
+            elif status == "error":
+                print(f"{progress} ERROR generating data for {label}: {error}")
+                records.pop(date_str, None)
+                failed += 1
             else:
-                generate_data_for_date(current_date)
-                generated += 1
-        except Exception as e:
-            print(f"ERROR generating data for {current_date}: {e}")
-        
-        current_date += timedelta(days=1)
+                if status == "kept":
+                    print(f"{progress} Kept {label} (outputs match {GENERATION_FILE})")
+                    kept += 1
+                else:
+                    print(f"{progress} Generated data for {label}")
+                    generated += 1
+                    events_written += entry["events"]
+                    bytes_written += sum(stat["size"] for stat in entry["files"].values())
+                records[date_str] = record
+                index_entries[device_root].append(entry)
+            # Checkpoint the records about once a second: a crash costs at most
+            # the days finished since, which --resume then regenerates
+            if time.monotonic() - saved_at >= 1:
+                for device_root, generation in generations.items():
+                    save_generation(device_root, generation)
+                saved_at = time.monotonic()
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        for device_root, generation in generations.items():
+            save_generation(device_root, generation)
+    elapsed = time.monotonic() - started
+    
+    for device_root, entries in index_entries.items():
+        where = "" if device_root == root else f"{device_root.relative_to(root)}/"
+        index = update_index(device_root, entries)
+        print(f"✓ Updated {where}{INDEX_FILE} ({len(entries)} days)")
+        rebuilt = sum(n for n, _ in build_pyramid(device_root, index).values())
+        print(f"✓ Updated {where}{PYRAMID_DIR}/ ({rebuilt} summaries rebuilt)")
+        manifest, _ = refresh_manifest(device_root)
+        print(f"✓ Updated {where}{MANIFEST_FILE} ({len(manifest_dates(manifest))} dates)")
     
     print("=" * 60)
     print(f"✓ Generation Complete!")
     print(f"  Total Days in Range: {total_days}")
+    if len(roots) > 1:
+        print(f"  Devices: {len(roots)} ({total_tasks} device-days)")
     print(f"  Successfully Generated: {generated}")
+    if kept:
+        print(f"  Kept (already up to date): {kept}")
     print(f"  Skipped (holidays/vacation): {skipped}")
+    if failed:
+        print(f"  Failed: {failed}")
     print(f"  Tasks Created: {len(tasks_data['tasks'])}")
-    print(f"  Output: {OUTPUT_DIR}")
+    if events_written and elapsed > 0:
+        print(f"  Throughput: {events_written:,} events, {bytes_written / (1024*1024):,.1f} MB in {elapsed:.1f}s "
+              f"({events_written / elapsed:,.0f} events/s, {bytes_written / (1024*1024) / elapsed:,.1f} MB/s)")
+    print(f"  Output: {root}")
     print("=" * 60)
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Incremental metrics for a day file that is still growing
+Usage: python live_metrics.py [--reset] [YYYY-MM-DD | path/to/raw_telemetry.json]
+
+Clotho appends to the current day every 30 seconds. Instead of re-reading
+the whole file, the running totals are checkpointed next to it
+(raw_telemetry.ckpt.json) together with the byte offset just past the last
+event processed; each refresh parses only the events appended since. The
+checkpoint also keeps a hash of the last event's bytes: if the file was
+rewritten underneath it, the day is recomputed from the start.
+
+Live metrics use the activity-based flow score without the generator's
+synthetic day-to-day variation.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from generate_demo_data import DayAccumulator
+from telemetry_io import TELEMETRY_FILE, EventStream, day_dir_for
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+CHECKPOINT_FILE = "raw_telemetry.ckpt.json"
+CHECKPOINT_VERSION = 1
+
+def _anchor(f, start, end):
+    f.seek(start)
+    return hashlib.sha1(f.read(end - start)).hexdigest()
+
+def load_checkpoint(path):
+    """Checkpoint for a day file, or None if missing/unreadable"""
+    try:
+        with open(Path(path).parent / CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return checkpoint if checkpoint.get("version") == CHECKPOINT_VERSION else None
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically (temp file, then rename)"""
+    target = Path(path).parent / CHECKPOINT_FILE
+    tmp_path = target.with_suffix(".json.tmp")
+    checkpoint["version"] = CHECKPOINT_VERSION
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, separators=(",", ":"))
+    os.replace(tmp_path, target)
+
+def _resumable(checkpoint, f, size):
+    """True if the bytes the checkpoint ended on are still where it left them"""
+    if not checkpoint or checkpoint.get("offset") is None:
+        return False
+    start, end = checkpoint["anchor_start"], checkpoint["offset"]
+    return end <= size and _anchor(f, start, end) == checkpoint["anchor"]
+
+def refresh_live_metrics(path, reset=False):
+    """
+    Bring the day's metrics up to date, parsing only events appended since
+    the last checkpoint. Returns (metrics, new_events, resumed).
+    """
+    path = Path(path)
+    checkpoint = None if reset else load_checkpoint(path)
+    with open(path, "rb") as f:
+        resumed = _resumable(checkpoint, f, os.fstat(f.fileno()).st_size)
+        if resumed:
+            stats = DayAccumulator.from_state(checkpoint["state"])
+            offset, anchor_start = checkpoint["offset"], checkpoint["anchor_start"]
+        else:
+            stats = DayAccumulator()
+            offset = anchor_start = None
+
+        stream = EventStream(f, offset)
+        new_events = 0
+        for start, event in stream:
+            stats.add(event)
+            new_events += 1
+            anchor_start, offset = start, stream.offset()
+
+        if new_events or not resumed:
+            save_checkpoint(path, {
+                "offset": offset,
+                "anchor_start": anchor_start,
+                "anchor": _anchor(f, anchor_start, offset) if offset is not None else None,
+                "events": stats.event_count,
+                "state": stats.state(),
+            })
+    return stats.session_metrics(), new_events, resumed
+
+def _resolve(arg):
+    if arg is None:
+        arg = datetime.now().strftime("%Y-%m-%d")
+    path = Path(arg)
+    if path.suffix == ".json":
+        return path
+    return day_dir_for(OUTPUT_DIR, arg) / TELEMETRY_FILE
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--reset"]
+    path = _resolve(args[0] if args else None)
+    if not path.exists():
+        print(f"❌ No day file at {path}")
+        sys.exit(1)
+    metrics, new_events, resumed = refresh_live_metrics(path, reset="--reset" in sys.argv)
+    source = "resumed from checkpoint" if resumed else "full pass"
+    print(f"✓ {new_events:,} new events ({source})")
+    print(f"  Flow Score:        {metrics['flow_score_estimate']}/100")
+    print(f"  Total Keystrokes:  {metrics['total_keystrokes']:,}")
+    print(f"  Mouse Distance:    {metrics['total_mouse_dist_pixels']:,} pixels")
+    print(f"  Idle Time:         {metrics['idle_minutes']:,} minutes")
+    print(f"  Top Application:   {metrics['top_window']}")
@@ -0,0 +1,119 @@
+"""
+Manifest of available dates (manifest.json at the data root)
+
+Lists every date that has a raw_telemetry.json (plain or compressed), grouped by YYYY/MM with the
+newest mtime of the month folder and its day folders. Adding or removing a
+day folder bumps its month's mtime, and adding or removing a day file bumps
+its day folder's, so refresh_manifest() only rescans months that changed.
+That costs one stat per day folder, cheap enough to run on every lookup, so
+a reader can pick a random date without walking the tree. Archived quarters
+(archive/YYYY-Qn.zip) are listed the same way, keyed on the zip's mtime.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from archive import ARCHIVE_DIR, DayArchive, day_exists, iter_archives
+from telemetry_io import DATE_DIR_RE, TELEMETRY_NAMES, day_dir_for
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+def load_manifest(root):
+    """Load manifest.json from a data root, or None if missing/unreadable"""
+    try:
+        with open(Path(root) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+def save_manifest(root, manifest):
+    """Write manifest.json atomically (temp file, then rename)"""
+    root = Path(root)
+    manifest["version"] = MANIFEST_VERSION
+    manifest["months"] = dict(sorted(manifest.get("months", {}).items()))
+    manifest["archives"] = dict(sorted(manifest.get("archives", {}).items()))
+    tmp_path = root / (MANIFEST_FILE + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_path, root / MANIFEST_FILE)
+    return manifest
+
+def _scan_month(month_dir):
+    return sorted(
+        entry.name for entry in os.scandir(month_dir)
+        if entry.is_dir() and DATE_DIR_RE.match(entry.name)
+        and any(os.path.exists(os.path.join(entry.path, name)) for name in TELEMETRY_NAMES)
+    )
+
+def _month_mtime(month):
+    """Newest mtime of a month folder (os.DirEntry) and of the day folders in it"""
+    mtime = month.stat().st_mtime
+    with os.scandir(month.path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                mtime = max(mtime, entry.stat().st_mtime)
+    return mtime
+
+def refresh_manifest(root, force=False):
+    """
+    Bring the manifest up to date, rescanning only month folders whose mtime
+    (see _month_mtime) differs from the recorded one (all of them with force=True).
+    Returns (manifest, rescanned), counting months and archives rescanned.
+    """
+    root = Path(root)
+    manifest = (None if force else load_manifest(root)) or {"months": {}}
+    old_months = manifest["months"]
+    months = {}
+    rescanned = 0
+    for year in os.scandir(root):
+        if not (year.is_dir() and year.name.isdigit()):
+            continue
+        for month in os.scandir(year.path):
+            if not month.is_dir():
+                continue
+            key = f"{year.name}/{month.name}"
+            mtime = _month_mtime(month)
+            old = old_months.get(key)
+            if old and old["mtime"] == mtime:
+                months[key] = old
+                continue
+            dates = _scan_month(month.path)
+            rescanned += 1
+            if dates:
+                months[key] = {"mtime": mtime, "dates": dates}
+    manifest["months"] = months
+
+    old_archives = manifest.get("archives", {})
+    archives = {}
+    for path in iter_archives(root):
+        key = f"{ARCHIVE_DIR}/{path.name}"
+        mtime = path.stat().st_mtime
+        old = old_archives.get(key)
+        if old and old["mtime"] == mtime:
+            archives[key] = old
+            continue
+        with DayArchive(path) as archive:
+            dates = [d for d in archive.dates() if archive.telemetry_name(d)]
+        rescanned += 1
+        if dates:
+            archives[key] = {"mtime": mtime, "dates": dates}
+    manifest["archives"] = archives
+    if rescanned or months.keys() != old_months.keys() or archives.keys() != old_archives.keys():
+        save_manifest(root, manifest)
+    return manifest, rescanned
+
+def manifest_dates(manifest):
+    """All dates in a manifest, folders and archives alike, in order"""
+    groups = list(manifest["months"].values()) + list(manifest.get("archives", {}).values())
+    return sorted({date for group in groups for date in group["dates"]})
+
+def available_dates(root):
+    """Dates with telemetry under root, from the manifest after a refresh"""
+    return manifest_dates(refresh_manifest(root)[0])
+
+def date_exists(root, date_str):
+    """Cheap check that a manifest date still has its telemetry file (or archive member)"""
+    return day_exists(day_dir_for(root, date_str))
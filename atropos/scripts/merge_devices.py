@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Merge per-device day files into one chronological timeline per day
+Usage: python merge_devices.py [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--schema 2.0.0] [--force] [data_dir]
+
+Clotho writes one raw_telemetry.json per machine and day. Per-device data
+roots live under devices/<device_id>/ (generate_demo_data.py --devices
+writes them this way), and every other tool expects one day file per date
+folder. This stage writes that file: for each date, the devices' day files
+are merged into data_dir/YYYY/MM/YYYY-MM-DD with a heap-based k-way merge
+on event time.
+
+Each device file is read with EventStream, so the merge holds one read
+chunk and one pending event per device. Memory grows with the number of
+devices, not the number of events. Merged events are in the 1.0.0 shape
+(or 2.0.0 with --schema) and carry "device_id". meta.devices lists each
+device's MetaInfo, and the metrics block adds a per-device breakdown
+("devices": {device_id: metrics}). The merged folder gets the usual
+offset sidecar, rollup.json, sessions.json, activity.json, sketches.json
+and daily summary, and the root's index.json, pyramid and manifest are
+refreshed. A date is merged again only when a device file is newer than
+the merged one or the set of devices changed.
+"""
+
+import argparse
+import heapq
+import random
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+
+from activity import ACTIVITY_FILE, ActivityBuilder
+from archive import DayArchive, find_archive, iter_archives, open_day_telemetry
+from build_index import INDEX_FILE, day_entry, update_index
+from event_index import OffsetIndexBuilder
+from generate_demo_data import (MASTER_SEED, DeviceAccumulator, day_seed, generate_summary, run_timestamp)
+from manifest import MANIFEST_FILE, manifest_dates, refresh_manifest
+from pyramid import PYRAMID_DIR, build_pyramid
+from rollup import ROLLUP_FILE, RollupBuilder
+from sessions import SESSIONS_FILE, SessionBuilder
+from sketches import SKETCHES_FILE, SketchBuilder
+from telemetry_io import (DEVICES_DIR, EPOCH_SCHEMA_VERSION, SCHEMA_VERSION, SCHEMA_VERSIONS, SUMMARY_FILE,
+                          TELEMETRY_FILE, TELEMETRY_NAMES, EventStream, atomic_open, day_base, day_dir_for,
+                          epoch_events, event_ms, iso_event, iter_day_dirs, open_telemetry, schema_base,
+                          telemetry_path, write_telemetry_stream)
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+
+# Clotho MetaInfo fields describing the machine a day file came from
+DEVICE_FIELDS = ("device_id", "os", "timezone")
+
+def device_roots(root):
+    """Per-device data roots under root/devices/, in device_id order"""
+    devices_dir = Path(root) / DEVICES_DIR
+    return sorted(p for p in devices_dir.iterdir() if p.is_dir()) if devices_dir.is_dir() else []
+
+def device_dates(device_root):
+    """Dates with a day file in one device root, in folders or archives"""
+    dates = {day_dir.name for day_dir in iter_day_dirs(device_root) if telemetry_path(day_dir)}
+    for path in iter_archives(device_root):
+        with DayArchive(path) as archive:
+            dates.update(d for d in archive.dates() if archive.telemetry_name(d))
+    return dates
+
+def _timed_events(stream, base, device_id):
+    """(epoch ms, 1.0.0 event tagged with device_id) for one device's day"""
+    for _, event in stream:
+        ms = event_ms(event, base)
+        if base is not None:
+            event = iso_event(event, base)
+        event["device_id"] = device_id
+        yield ms, event
+
+@contextmanager
+def merged_events(day_dirs):
+    """
+    (devices, events) for one date across devices: the MetaInfo fields of
+    each device day, and an iterator over all their events in time order.
+    Every day file stays open while the iterator runs; events with the same
+    time keep the order of day_dirs.
+    """
+    with ExitStack() as stack:
+        devices, streams = [], []
+        for day_dir in day_dirs:
+            f = stack.enter_context(open_day_telemetry(day_dir))
+            stream = EventStream(f)
+            meta = stream.header.get("meta", {})
+            # day_dir is devices/<device_id>/YYYY/MM/YYYY-MM-DD: the folder names the device
+            device = {field: meta.get(field) for field in DEVICE_FIELDS}
+            device["device_id"] = Path(day_dir).parents[2].name
+            devices.append(device)
+            streams.append(_timed_events(stream, schema_base(meta), device["device_id"]))
+        yield devices, (event for _, event in heapq.merge(*streams, key=itemgetter(0)))
+
+def _source_mtime(day_dir):
+    path = telemetry_path(day_dir) or find_archive(day_dir)
+    return path.stat().st_mtime
+
+def merged_is_fresh(out_dir, day_dirs):
+    """True if the merged day covers exactly these devices and is newer than each of their files"""
+    target = telemetry_path(out_dir)
+    if target is None:
+        return False
+    with open_telemetry(target) as f:
+        meta = EventStream(f).header.get("meta", {})
+    merged = [device.get("device_id") for device in meta.get("devices", [])]
+    if merged != [Path(day_dir).parents[2].name for day_dir in day_dirs]:
+        return False
+    mtime = target.stat().st_mtime
+    return all(_source_mtime(day_dir) <= mtime for day_dir in day_dirs)
+
+def merge_day(day_dirs, out_dir, schema=SCHEMA_VERSION, generated_at=None):
+    """
+    Merge one date's device day folders into out_dir (raw_telemetry.json,
+    its offset sidecar, rollup.json, sessions.json, activity.json,
+    sketches.json, daily_summary.md).
+    Returns (metrics, event_counts).
+    """
+    out_dir = Path(out_dir)
+    date_str = out_dir.name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / TELEMETRY_FILE
+    for name in TELEMETRY_NAMES:
+        if name != path.name:
+            (out_dir / name).unlink(missing_ok=True)
+
+    stats = DeviceAccumulator()
+    rollup = RollupBuilder()
+    sessions = SessionBuilder()
+    activity = ActivityBuilder()
+    sketches = SketchBuilder()
+    base = day_base(date_str) if schema == EPOCH_SCHEMA_VERSION else None
+    offsets = OffsetIndexBuilder(base=base)
+
+    def on_event(event):
+        stats.add(event)
+        rollup.add(event)
+        sessions.add(event)
+        activity.add(event)
+        sketches.add(event)
+
+    with merged_events(day_dirs) as (devices, events):
+        meta = {"date": date_str, "devices": devices, "generated_at": generated_at or run_timestamp(),
+                "version": schema}
+        if base is not None:
+            meta["base"] = base
+            events = epoch_events(events, base)
+        metrics = write_telemetry_stream(path, meta, events, on_event=on_event,
+                                         metrics=stats.session_metrics, on_offset=offsets.add)
+    offsets.write(path)
+    rollup.write(out_dir / ROLLUP_FILE, date_str)
+    sessions.write(out_dir / SESSIONS_FILE, date_str)
+    activity.write(out_dir / ACTIVITY_FILE, date_str)
+    sketches.write(out_dir / SKETCHES_FILE, date_str)
+
+    # The summary draws its wording from `random`: seed it per date so re-merges are stable
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    random.seed(day_seed(MASTER_SEED, date, "merged"))
+    with atomic_open(out_dir / SUMMARY_FILE, 'w') as f:
+        f.write(generate_summary(date, metrics, stats.total.category_counts))
+    return metrics, stats.total.event_counts
+
+def merge_tree(root, start=None, end=None, schema=SCHEMA_VERSION, force=False):
+    """
+    Merge every date found in the device roots under root (optionally only
+    start..end, 'YYYY-MM-DD' strings), then refresh the root's index,
+    pyramid and manifest. Returns (merged, fresh, devices).
+    """
+    root = Path(root)
+    roots = device_roots(root)
+    by_date = {}
+    for device_root in roots:
+        for date_str in device_dates(device_root):
+            if (start is None or date_str >= start) and (end is None or date_str <= end):
+                by_date.setdefault(date_str, []).append(day_dir_for(device_root, date_str))
+
+    generated_at = run_timestamp()
+    merged = fresh = 0
+    entries = []
+    for date_str in sorted(by_date):
+        day_dirs = by_date[date_str]
+        out_dir = day_dir_for(root, date_str)
+        try:
+            if not force and merged_is_fresh(out_dir, day_dirs):
+                fresh += 1
+                continue
+            metrics, event_counts = merge_day(day_dirs, out_dir, schema, generated_at)
+        except Exception as e:
+            print(f"Error merging {date_str}: {e}")
+            continue
+        merged += 1
+        entries.append(day_entry(out_dir, metrics, event_counts))
+        print(f"  Merged {date_str} ({len(day_dirs)} devices, {sum(event_counts.values()):,} events)")
+
+    if entries:
+        index = update_index(root, entries)
+        print(f"✓ Updated {INDEX_FILE} ({len(entries)} days)")
+        rebuilt = sum(n for n, _ in build_pyramid(root, index).values())
+        print(f"✓ Updated {PYRAMID_DIR}/ ({rebuilt} summaries rebuilt)")
+        manifest, _ = refresh_manifest(root)
+        print(f"✓ Updated {MANIFEST_FILE} ({len(manifest_dates(manifest))} dates)")
+    return merged, fresh, len(roots)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Merge per-device Atropos day files into one timeline per day")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR,
+                        help=f"data root holding {DEVICES_DIR}/<device_id>/ (default: assets/demo_data)")
+    parser.add_argument("--start", metavar="YYYY-MM-DD", help="first date to merge")
+    parser.add_argument("--end", metavar="YYYY-MM-DD", help="last date to merge")
+    parser.add_argument("--schema", choices=SCHEMA_VERSIONS, default=SCHEMA_VERSION,
+                        help=f"schema of the merged day files (default: {SCHEMA_VERSION})")
+    parser.add_argument("--force", action="store_true",
+                        help="merge every date again, even if the merged day is up to date")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    merged, fresh, devices = merge_tree(args.data_dir, args.start, args.end, args.schema, args.force)
+    if not devices:
+        print(f"❌ No device roots under {args.data_dir / DEVICES_DIR}")
+    else:
+        print(f"✓ Merged {merged} days from {devices} devices ({fresh} already up to date)")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Build (or refresh) the week/month/quarter/year summary pyramid
+Usage: python pyramid.py [--rebuild] [data_dir]
+
+Summaries live under pyramid/<level>/<period>.json at the data root and are
+computed from the level below, never from raw events:
+
+    day (index.json + rollup.json + sketches.json) -> week
+    day                            -> month -> quarter -> year
+
+ISO weeks straddle month (and year) boundaries, so months are built from
+days rather than weeks. Each summary records a fingerprint per child; a
+period is rebuilt only when a child's fingerprint changed, so editing one
+day rebuilds just its week, month, quarter and year.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+from build_index import build_index, load_index
+from rollup import FIELDS, load_rollup
+from sketches import load_sketches, merge_sketch_dicts
+from telemetry_io import day_dir_for
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+PYRAMID_DIR = "pyramid"
+PYRAMID_VERSION = 2
+LEVELS = ["week", "month", "quarter", "year"]
+# level -> the level it is built from
+CHILD_LEVEL = {"week": "day", "month": "day", "quarter": "month", "year": "quarter"}
+HOUR_FIELDS = FIELDS[:5]  # the numeric rollup fields; app seconds are kept by name
+
+def period_of(level, key):
+    """Period containing a date ('2025-01-15') or a lower period key ('2025-01', '2025-Q1')"""
+    if level == "week":
+        year, week, _ = date.fromisoformat(key).isocalendar()
+        return f"{year}-W{week:02d}"
+    if level == "month":
+        return key[:7]
+    if level == "quarter":
+        return f"{key[:4]}-Q{(int(key[5:7]) - 1) // 3 + 1}"
+    return key[:4]
+
+def period_bounds(level, period):
+    """(first, last) date of a month/quarter/year period as 'YYYY-MM-DD' strings"""
+    year = int(period[:4])
+    if level == "month":
+        first_month = last_month = int(period[5:7])
+    elif level == "quarter":
+        first_month = (int(period[-1]) - 1) * 3 + 1
+        last_month = first_month + 2
+    else:
+        first_month, last_month = 1, 12
+    end = date(year + 1, 1, 1) if last_month == 12 else date(year, last_month + 1, 1)
+    return date(year, first_month, 1).isoformat(), date.fromordinal(end.toordinal() - 1).isoformat()
+
+def _fingerprint(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()).hexdigest()[:16]
+
+def new_summary(level, period):
+    """
+    Empty summary. Every field is a sum, a counter or a min/max, so
+    summaries of disjoint periods merge with merge_summary() in any order.
+    """
+    return {
+        "version": PYRAMID_VERSION,
+        "level": level,
+        "period": period,
+        "start": None,
+        "end": None,
+        "days": 0,
+        "events": 0,
+        "keystrokes": 0,
+        "mouse_px": 0,
+        "bytes": 0,
+        "flow_hist": {},     # flow score -> days
+        "top_windows": {},   # top window -> days
+        "event_counts": {},  # event type -> events
+        "rollup_days": 0,
+        "hours": [[0] * len(HOUR_FIELDS) for _ in range(24)],
+        "app_seconds": {},   # app -> seconds focused
+        "sketch_days": 0,
+        "sketches": {},      # name -> merged LogHistogram dict (sketches.py)
+    }
+
+def _add_counts(into, other):
+    for key, n in other.items():
+        into[key] = into.get(key, 0) + n
+
+def merge_summary(into, other):
+    """Fold a child summary into `into`"""
+    into["start"] = min(filter(None, (into["start"], other["start"])), default=None)
+    into["end"] = max(filter(None, (into["end"], other["end"])), default=None)
+    for key in ("days", "events", "keystrokes", "mouse_px", "bytes", "rollup_days", "sketch_days"):
+        into[key] += other[key]
+    for key in ("flow_hist", "top_windows", "event_counts", "app_seconds"):
+        _add_counts(into[key], other[key])
+    into["hours"] = [[a + b for a, b in zip(mine, theirs)] for mine, theirs in zip(into["hours"], other["hours"])]
+    merge_sketch_dicts(into["sketches"], other["sketches"])
+    return into
+
+def day_summary(root, entry):
+    """Leaf summary for one day: its index.json entry plus its rollup.json and sketches.json"""
+    metrics = entry.get("metrics", {})
+    summary = new_summary("day", entry["date"])
+    summary.update({
+        "start": entry["date"],
+        "end": entry["date"],
+        "days": 1,
+        "events": entry.get("events", 0),
+        "keystrokes": metrics.get("total_keystrokes", 0),
+        "mouse_px": metrics.get("total_mouse_dist_pixels", 0),
+        "bytes": sum(f["size"] for f in entry.get("files", {}).values()),
+        "flow_hist": {str(metrics.get("flow_score_estimate", 0)): 1},
+        "top_windows": {metrics.get("top_window", "Unknown"): 1},
+        "event_counts": dict(entry.get("event_counts", {})),
+    })
+    rollup = load_rollup(day_dir_for(root, entry["date"]))
+    if rollup:
+        summary["rollup_days"] = 1
+        for hour, row in rollup["hours"].items():
+            summary["hours"][int(hour)] = row[:len(HOUR_FIELDS)]
+            for code, seconds in row[len(HOUR_FIELDS)].items():
+                app = rollup["apps"][int(code)]
+                summary["app_seconds"][app] = summary["app_seconds"].get(app, 0) + seconds
+    sketches = load_sketches(day_dir_for(root, entry["date"]))
+    if sketches:
+        summary["sketch_days"] = 1
+        summary["sketches"] = sketches["sketches"]
+    return summary
+
+def summary_path(root, level, period):
+    return Path(root) / PYRAMID_DIR / level / f"{period}.json"
+
+def load_summary(root, level, period):
+    """One summary file, or None if missing/unreadable"""
+    try:
+        with open(summary_path(root, level, period), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return summary if summary.get("version") == PYRAMID_VERSION else None
+
+def load_level(root, level):
+    """Every summary of a level, in period order"""
+    level_dir = Path(root) / PYRAMID_DIR / level
+    if not level_dir.is_dir():
+        return []
+    periods = sorted(p.stem for p in level_dir.glob("*.json"))
+    return [s for s in (load_summary(root, level, p) for p in periods) if s]
+
+def save_summary(root, summary):
+    """Write a summary atomically (temp file, then rename)"""
+    path = summary_path(root, summary["level"], summary["period"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def build_pyramid(root, index=None, rebuild=False):
+    """
+    Bring every level up to date from index.json (loaded if not given).
+    Returns {level: (rebuilt, unchanged)}.
+    """
+    root = Path(root)
+    index = index or load_index(root) or {"days": {}}
+    days = index["days"]
+    # Fingerprints per level: a day's comes from its file stats, a period's
+    # from the fingerprints of its children
+    fingerprints = {"day": {d: _fingerprint(e.get("files", {})) for d, e in days.items()}}
+    counts = {}
+    for level in LEVELS:
+        child_level = CHILD_LEVEL[level]
+        groups = {}
+        for key, fp in fingerprints[child_level].items():
+            groups.setdefault(period_of(level, key), {})[key] = fp
+        fingerprints[level] = {}
+        rebuilt = unchanged = 0
+        for period, sources in sorted(groups.items()):
+            fingerprints[level][period] = _fingerprint(sources)
+            existing = None if rebuild else load_summary(root, level, period)
+            if existing and existing.get("sources") == sources:
+                unchanged += 1
+                continue
+            summary = new_summary(level, period)
+            for key in sorted(sources):
+                child = (day_summary(root, days[key]) if child_level == "day"
+                         else load_summary(root, child_level, key))
+                merge_summary(summary, child)
+            summary["sources"] = sources
+            save_summary(root, summary)
+            rebuilt += 1
+        # Periods whose days all vanished
+        level_dir = root / PYRAMID_DIR / level
+        if level_dir.is_dir():
+            for path in level_dir.glob("*.json"):
+                if path.stem not in groups:
+                    path.unlink()
+        counts[level] = (rebuilt, unchanged)
+    return counts
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--rebuild"]
+    root = Path(args[0]) if args else OUTPUT_DIR
+    index, _, _ = build_index(root)
+    counts = build_pyramid(root, index, rebuild="--rebuild" in sys.argv)
+    for level, (rebuilt, unchanged) in counts.items():
+        print(f"✓ {level:8s} {rebuilt:4d} rebuilt, {unchanged:4d} unchanged")
+    print(f"  Output: {root / PYRAMID_DIR}")
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Replay a stored day as a live Clotho event feed on localhost
+Usage: python replay_server.py 2025-06-15 [--speed 60 | --max] [--from 14:00] [--loop]
+       python replay_server.py 2025-06-15 --synthetic [--rate 10] [--engine numpy]
+       python replay_server.py 2025-06-15 --protocol tcp --port 9000 --clients 20
+
+Clotho pushes events to Atropos over a localhost WebSocket. This server
+plays a day from the data tree back over the same kind of socket. The day
+can be a folder, an archive, any schema or string table, or a fresh
+synthetic stream from the generator's event engine. Each connection
+receives {"meta": {...}} and then one event per message in the
+raw_telemetry.json (1.0.0) shape: WebSocket text frames, or
+newline-delimited JSON with --protocol tcp.
+
+Events go out at their recorded pace (--speed 1), N times faster
+(--speed N) or as fast as the clients take them (--max). Every client has
+its own send queue of at most --buffer events; a client that falls further
+behind has the overflow dropped and counted rather than slowing the feed
+for everyone. A report line every --report seconds shows the achieved
+events/s, the worst per-client lag (time from an event being due to it
+reaching the socket) and the drops. The final report breaks these down per
+client.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+
+from archive import day_exists
+from day_events import load_day_events
+from generate_demo_data import ENGINES, MASTER_SEED, day_seed, iter_events_for_day
+from telemetry_io import SCHEMA_VERSION, day_dir_for, iso_to_epoch_ms
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+PROTOCOLS = ["ws", "tcp"]
+DEFAULT_PORT = 8765
+
+# Events handed to the clients' queues in one go (per-event work stays O(1)
+# in the number of clients)
+BATCH_EVENTS = 256
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# ─────────────────────────────────────────────
+#  Event sources
+# ─────────────────────────────────────────────
+
+# A source is (meta, events) where events() starts a new pass over the day,
+# yielding (epoch ms, event dict) in order; --loop calls it again
+
+def stored_source(day_dir, start=None):
+    """The stored day from `start` (epoch ms) on, held as DayEvents columns"""
+    day = load_day_events(day_dir)
+    if start is not None:
+        day = day.between(start)
+    return day.meta, lambda: ((view.ms, view.to_dict()) for view in day)
+
+def synthetic_source(date, engine="python", rate=1, master_seed=MASTER_SEED, start=None):
+    """Events drawn from the generator's engine on the day's RNG stream (the same every pass)"""
+    meta = {"date": date.strftime("%Y-%m-%d"), "version": SCHEMA_VERSION, "synthetic": True}
+
+    def events():
+        random.seed(day_seed(master_seed, date))
+        for event in iter_events_for_day(date, engine, rate):
+            ms = iso_to_epoch_ms(event["ts"])
+            if start is None or ms >= start:
+                yield ms, event
+    return meta, events
+
+# ─────────────────────────────────────────────
+#  Wire formats
+# ─────────────────────────────────────────────
+
+def ws_frame(payload, opcode=0x1):
+    """One unmasked, final WebSocket frame (server to client)"""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+async def read_ws_frame(reader):
+    """(opcode, payload) of the next client frame (clients always mask)"""
+    first, second = await reader.readexactly(2)
+    n = second & 0x7F
+    if n == 126:
+        n, = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        n, = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(n)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+async def ws_handshake(reader, writer):
+    """Answer the HTTP upgrade request; False (after a 400) if it is not one"""
+    request = await reader.readuntil(b"\r\n\r\n")
+    headers = {}
+    for line in request.decode("latin-1").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    key = headers.get("sec-websocket-key")
+    if headers.get("upgrade", "").lower() != "websocket" or not key:
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        return False
+    accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+    await writer.drain()
+    return True
+
+def encode_message(obj, protocol):
+    """One feed message as the bytes sent for it"""
+    data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    return ws_frame(data) if protocol == "ws" else data + b"\n"
+
+# ─────────────────────────────────────────────
+#  Server
+# ─────────────────────────────────────────────
+
+class Client:
+    """One connection: its send queue and delivery counters"""
+
+    def __init__(self, number, peer, writer):
+        self.number = number
+        self.peer = peer
+        self.writer = writer
+        self.queue = asyncio.Queue()
+        self.pending = 0   # events queued, not yet written
+        self.sent = 0
+        self.dropped = 0
+        self.lag = 0.0     # seconds, last batch written
+        self.max_lag = 0.0
+        self.connected = True
+
+    def row(self):
+        return (f"  #{self.number:<4d} {self.peer:21s} {self.sent:>12,} {self.dropped:>10,} "
+                f"{self.lag * 1000:>10.1f}ms {self.max_lag * 1000:>10.1f}ms")
+
+class ReplayServer:
+    """Paces one event source out to every connected client"""
+
+    def __init__(self, meta, events, protocol="ws", speed=1.0, buffer=10_000, wait_clients=1, report=1.0,
+                 loop=False):
+        self.meta = meta
+        self.events = events  # callable starting a pass, see stored_source
+        self.protocol = protocol
+        self.speed = speed  # None: as fast as possible
+        self.buffer = buffer
+        self.wait_clients = wait_clients
+        self.report_every = report
+        self.loop = loop
+        self.clients = []      # connected, plus those still open when the replay ended
+        self.connections = 0
+        self.gone_sent = 0     # totals of clients that left mid-replay
+        self.gone_dropped = 0
+        self.produced = 0
+        self.started = None
+        self.finished = None
+        self._hello = encode_message({"meta": meta}, protocol)
+        self._enough_clients = asyncio.Event()
+        self._closing = False
+
+    # Connections
+
+    async def handle(self, reader, writer):
+        peer = "%s:%s" % writer.get_extra_info("peername")[:2]
+        if self.protocol == "ws" and not await ws_handshake(reader, writer):
+            writer.close()
+            return
+        self.connections += 1
+        client = Client(self.connections, peer, writer)
+        self.clients.append(client)
+        if sum(c.connected for c in self.clients) >= self.wait_clients:
+            self._enough_clients.set()
+        writer.write(self._hello)
+        sender = asyncio.create_task(self._send(client))
+        try:
+            await self._receive(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass  # disconnected, or the server is shutting down
+        finally:
+            client.connected = False
+            sender.cancel()
+            writer.close()
+            if not self._closing:
+                # Gone mid-replay (reconnecting clients under --loop): keep
+                # its totals, not the client
+                self.clients.remove(client)
+                self.gone_sent += client.sent
+                self.gone_dropped += client.dropped
+
+    def sent(self):
+        return self.gone_sent + sum(c.sent for c in self.clients)
+
+    def dropped(self):
+        return self.gone_dropped + sum(c.dropped for c in self.clients)
+
+    async def _receive(self, reader, writer):
+        """Consume what the client sends until it goes away (answers ping and close)"""
+        if self.protocol == "tcp":
+            while await reader.read(4096):
+                pass
+            return
+        while True:
+            opcode, payload = await read_ws_frame(reader)
+            if opcode == 0x8:
+                writer.write(ws_frame(payload[:2], 0x8))
+                return
+            if opcode == 0x9:
+                writer.write(ws_frame(payload, 0xA))
+
+    async def _send(self, client):
+        loop = asyncio.get_running_loop()
+        while True:
+            due, n, data = await client.queue.get()
+            client.writer.write(data)
+            await client.writer.drain()
+            client.pending -= n
+            client.sent += n
+            client.lag = max(0.0, loop.time() - due)
+            client.max_lag = max(client.max_lag, client.lag)
+
+    def _broadcast(self, due, batch):
+        """Queue a batch for every client, dropping it for those already --buffer behind"""
+        n, data = len(batch), b"".join(batch)
+        for client in self.clients:
+            if not client.connected:
+                continue
+            if client.pending + n > self.buffer:
+                client.dropped += n
+            else:
+                client.pending += n
+                client.queue.put_nowait((due, n, data))
+        self.produced += n
+
+    # Pacing
+
+    async def _play(self, events):
+        loop = asyncio.get_running_loop()
+        first_ms = t0 = None
+        batch, due = [], 0.0
+        for ms, event in events:
+            if self.speed is None:
+                due = loop.time()
+            else:
+                if first_ms is None:
+                    first_ms, t0 = ms, loop.time()
+                due = t0 + (ms - first_ms) / 1000 / self.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    if batch:
+                        self._broadcast(due, batch)
+                        batch = []
+                    await asyncio.sleep(delay)
+            batch.append(encode_message(event, self.protocol))
+            if len(batch) >= BATCH_EVENTS:
+                self._broadcast(due, batch)
+                batch = []
+                await asyncio.sleep(0)  # let the senders run
+        if batch:
+            self._broadcast(due, batch)
+
+    async def _drain(self, timeout=10):
+        """Wait (bounded) for the queues to empty once the source is exhausted"""
+        deadline = time.monotonic() + timeout
+        while any(c.connected and c.pending for c in self.clients) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def _close_all(self):
+        """Say goodbye to every client still connected (close frame / EOF)"""
+        self._closing = True
+        for client in self.clients:
+            if client.connected:
+                client.connected = False
+                if self.protocol == "ws":
+                    client.writer.write(ws_frame(struct.pack("!H", 1000), 0x8))
+                client.writer.close()
+        await asyncio.sleep(0)
+
+    async def _reporter(self):
+        last_time, last_produced, last_sent = time.monotonic(), 0, 0
+        while True:
+            await asyncio.sleep(self.report_every)
+            now = time.monotonic()
+            sent = self.sent()
+            connected = [c for c in self.clients if c.connected]
+            worst = max((c.lag for c in connected), default=0.0)
+            print(f"  {now - self.started:7.1f}s  {self.produced:>11,} events "
+                  f"{(self.produced - last_produced) / (now - last_time):>9,.0f} ev/s out "
+                  f"{(sent - last_sent) / (now - last_time):>10,.0f} ev/s delivered  "
+                  f"clients {len(connected):>3}  worst lag {worst * 1000:8.1f}ms  "
+                  f"drops {self.dropped():,}", flush=True)
+            last_time, last_produced, last_sent = now, self.produced, sent
+
+    async def run(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        mode = "as fast as possible" if self.speed is None else f"{self.speed:g}x real time"
+        print(f"📡 Serving {self.meta.get('date', '?')} on {self.protocol}://{host}:{port} ({mode})")
+        print(f"   Waiting for {self.wait_clients} client(s)...", flush=True)
+        reporter = None
+        async with server:
+            await self._enough_clients.wait()
+            self.started = time.monotonic()
+            reporter = asyncio.create_task(self._reporter())
+            try:
+                while True:
+                    await self._play(self.events())
+                    if not self.loop:
+                        break
+                await self._drain()
+                await self._close_all()
+            finally:
+                self.finished = time.monotonic()
+                reporter.cancel()
+
+    def print_report(self):
+        elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+        sent = self.sent()
+        print("\n" + "=" * 70)
+        print("📡 REPLAY REPORT")
+        print("=" * 70)
+        print(f"  Duration:          {elapsed:.1f}s")
+        print(f"  Events Produced:   {self.produced:,} ({self.produced / elapsed if elapsed else 0:,.0f} events/s)")
+        print(f"  Events Delivered:  {sent:,} ({sent / elapsed if elapsed else 0:,.0f} events/s, all clients)")
+        print(f"  Dropped:           {self.dropped():,} (backpressure, --buffer {self.buffer:,})")
+        print(f"  Clients:           {self.connections} ({self.connections - len(self.clients)} left mid-replay)")
+        if self.clients:
+            print("─" * 70)
+            print(f"  {'Client':5s} {'Peer':21s} {'Delivered':>12s} {'Dropped':>10s} {'Last lag':>12s} {'Max lag':>12s}")
+            ranked = sorted(self.clients, key=lambda c: (c.dropped, c.max_lag), reverse=True)
+            for client in ranked[:20]:
+                print(client.row())
+            if len(ranked) > 20:
+                print(f"  ... and {len(ranked) - 20} more")
+        print("=" * 70 + "\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a day as a live Clotho event feed")
+    parser.add_argument("date", help="day to replay (YYYY-MM-DD)")
+    parser.add_argument("--data-dir", type=Path, default=OUTPUT_DIR,
+                        help="data root holding the day (default: assets/demo_data)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="stream freshly generated events for the date instead of the stored day")
+    parser.add_argument("--engine", choices=ENGINES, default="python",
+                        help="event engine for --synthetic (default: python)")
+    parser.add_argument("--rate", type=float, default=1,
+                        help="event rate multiplier for --synthetic (default: 1)")
+    pace = parser.add_mutually_exclusive_group()
+    pace.add_argument("--speed", type=float, default=1.0,
+                      help="replay N times faster than recorded (default: 1, real time)")
+    pace.add_argument("--max", action="store_true",
+                      help="send as fast as the clients take events")
+    parser.add_argument("--from", dest="start", metavar="HH:MM[:SS]",
+                        help="start the replay at this time of day")
+    parser.add_argument("--loop", action="store_true",
+                        help="start over when the day ends (stop with Ctrl-C)")
+    parser.add_argument("--protocol", choices=PROTOCOLS, default="ws",
+                        help="WebSocket text frames or newline-delimited JSON over TCP (default: ws)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=1,
+                        help="clients to wait for before starting (default: 1)")
+    parser.add_argument("--buffer", type=int, default=10_000,
+                        help="events queued per client before dropping (default: 10000)")
+    parser.add_argument("--report", type=float, default=1.0,
+                        help="seconds between report lines (default: 1)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        date = datetime.strptime(args.date, "%Y-%m-%d")
+    except ValueError:
+        raise SystemExit("❌ Invalid date format. Use YYYY-MM-DD (e.g., 2025-06-15)")
+    if args.speed <= 0:
+        raise SystemExit("--speed must be positive")
+    start = None
+    if args.start:
+        try:
+            clock = datetime.strptime(args.start, "%H:%M:%S" if args.start.count(":") == 2 else "%H:%M")
+        except ValueError:
+            raise SystemExit("❌ Invalid --from time. Use HH:MM or HH:MM:SS (e.g., 14:00)")
+        start = iso_to_epoch_ms(f"{args.date}T{clock:%H:%M:%S}")
+
+    if args.synthetic:
+        meta, events = synthetic_source(date, args.engine, args.rate, start=start)
+    else:
+        day_dir = day_dir_for(args.data_dir, args.date)
+        if not day_exists(day_dir):
+            raise SystemExit(f"❌ No data found for {args.date} (looking in {day_dir})")
+        meta, events = stored_source(day_dir, start)
+
+    replay = ReplayServer(meta, events, protocol=args.protocol, speed=None if args.max else args.speed,
+                          buffer=args.buffer, wait_clients=max(1, args.clients), report=args.report,
+                          loop=args.loop)
+    try:
+        asyncio.run(replay.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    replay.print_report()
+
+if __name__ == "__main__":
+    main()
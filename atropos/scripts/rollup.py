@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Per-minute and per-hour rollups of a day's events (rollup.json)
+Usage: python rollup.py [--force] [data_dir | day_dir]
+
+Each bucket holds keystrokes, mouse pixels, clicks, scroll magnitude, focus
+switches and the seconds attributed to each app (from one focus_change to
+the next, the last span ending at the day's final event). Charts and the
+analyzer read these few KB instead of the full event log. The generator
+writes rollup.json for every day; run this script to backfill a tree.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from archive import load_day_json
+from telemetry_io import DayClock, atomic_open, backfill_tree, write_sidecar
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+ROLLUP_FILE = "rollup.json"
+ROLLUP_VERSION = 1
+FIELDS = ["keystrokes", "mouse_px", "clicks", "scroll", "focus_switches", "app_seconds"]
+
+class RollupBuilder:
+    """Buckets events by minute; feed add(event) in time order (either schema), then rollup()"""
+
+    def __init__(self):
+        self.minutes = {}      # minute of day -> [keystrokes, mouse_px, clicks, scroll, switches]
+        self.app_seconds = {}  # minute of day -> {app code: seconds}
+        self.apps = []
+        self._app_index = {}
+        self._focus = None     # (app code, second the span started)
+        self._last_second = None
+        self._clock = DayClock()
+
+    def _row(self, minute):
+        row = self.minutes.get(minute)
+        if row is None:
+            row = self.minutes[minute] = [0, 0, 0, 0, 0]
+        return row
+
+    def add(self, event):
+        second = self._clock.second(event)
+        row = self._row(second // 60)
+        event_type = event["type"]
+        if event_type == "keystroke":
+            row[0] += event.get("count", 1)
+        elif event_type == "mouse_move":
+            row[1] += event.get("distance_px", 0)
+        elif event_type == "mouse_click":
+            row[2] += 1
+        elif event_type == "scroll":
+            row[3] += abs(event.get("delta", 0))
+        elif event_type == "focus_change":
+            row[4] += 1
+            self._close_focus(second)
+            app = event.get("title", "Unknown")
+            code = self._app_index.get(app)
+            if code is None:
+                code = self._app_index[app] = len(self.apps)
+                self.apps.append(app)
+            self._focus = (code, second)
+        self._last_second = second
+
+    def _close_focus(self, end):
+        """Attribute the open focus span up to `end`, split at minute boundaries"""
+        if self._focus is None:
+            return
+        code, start = self._focus
+        while start < end:
+            minute = start // 60
+            stop = min(end, (minute + 1) * 60)
+            seconds = self.app_seconds.setdefault(minute, {})
+            seconds[code] = seconds.get(code, 0) + stop - start
+            start = stop
+        self._focus = (code, max(start, end))
+
+    def rollup(self, date_str):
+        """The rollup.json document; the open focus span ends at the last event"""
+        if self._last_second is not None:
+            self._close_focus(self._last_second)
+        minutes, hours = {}, {}
+        for minute in sorted(self.minutes.keys() | self.app_seconds.keys()):
+            row = self.minutes.get(minute, [0, 0, 0, 0, 0])
+            seconds = self.app_seconds.get(minute, {})
+            minutes[f"{minute // 60:02d}:{minute % 60:02d}"] = row + [{str(c): s for c, s in seconds.items()}]
+            hour = hours.setdefault(f"{minute // 60:02d}", [0, 0, 0, 0, 0, {}])
+            for i, value in enumerate(row):
+                hour[i] += value
+            for code, s in seconds.items():
+                hour[5][str(code)] = hour[5].get(str(code), 0) + s
+        return {
+            "version": ROLLUP_VERSION,
+            "date": date_str,
+            "fields": FIELDS,
+            "apps": self.apps,
+            "hours": hours,
+            "minutes": minutes,
+        }
+
+    def write(self, path, date_str):
+        rollup = self.rollup(date_str)
+        with atomic_open(path, 'w') as f:
+            json.dump(rollup, f, separators=(",", ":"))
+        return rollup
+
+def load_rollup(day_dir):
+    """A day's rollup.json (from its folder or archive), or None if missing/unreadable"""
+    return load_day_json(day_dir, ROLLUP_FILE, ROLLUP_VERSION)
+
+def hourly(rollup, field):
+    """24-slot list of one field's per-hour totals (e.g. "keystrokes")"""
+    i = FIELDS.index(field)
+    values = [0] * 24
+    for hour, row in rollup["hours"].items():
+        values[int(hour)] = row[i]
+    return values
+
+def rollup_day(day_dir, force=False):
+    """Write rollup.json for one day; returns False if it was up to date"""
+    return write_sidecar(day_dir, ROLLUP_FILE, RollupBuilder(), force)
+
+def rollup_tree(root, force=False):
+    """rollup.json for every day folder under root (or for root itself if it is a day folder)"""
+    return backfill_tree(root, lambda day_dir: rollup_day(day_dir, force), "rolling up")
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    root = Path(args[0]) if args else OUTPUT_DIR
+    written, skipped = rollup_tree(root, force="--force" in sys.argv)
+    print(f"✓ Rolled up {written} days ({skipped} already up to date) under {root}")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Focus sessions of a day (sessions.json)
+Usage: python sessions.py [--force] [--min-seconds 300] [--idle-gap 30] [data_dir | day_dir]
+
+A focus span runs from one focus_change to the next (the last one ends at
+the day's final event) and carries the keystrokes, mouse pixels, clicks,
+scroll and idle gaps (silences longer than --idle-gap) recorded during it.
+Sessions are built from spans in one pass: spans shorter than --min-seconds
+are micro-switches and fold into the session around them, as do spans of
+the session's own app, so Code -> Slack (20 s) -> Code stays one Code
+session. A day of thousands of events becomes a few dozen sessions, which
+Lachesis sends to the model instead of the raw event log. The generator
+writes sessions.json for every day; run this script to backfill a tree.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from archive import load_day_json
+from telemetry_io import DayClock, atomic_open, backfill_tree, write_sidecar
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+SESSIONS_FILE = "sessions.json"
+SESSIONS_VERSION = 1
+MIN_SESSION_SECONDS = 300  # shorter focus spans are micro-switches
+IDLE_GAP_SECONDS = 30      # a longer silence between two events is an idle gap
+COUNTERS = ["keystrokes", "mouse_px", "clicks", "scroll", "idle_gaps", "idle_seconds"]
+OTHER_APPS = 3             # apps listed besides the main one, by focus time
+
+class SessionBuilder:
+    """Segments focus sessions; feed add(event) in time order (either schema), then document()"""
+
+    def __init__(self, min_seconds=MIN_SESSION_SECONDS, idle_gap=IDLE_GAP_SECONDS):
+        self.min_seconds = min_seconds
+        self.idle_gap = idle_gap
+        self.sessions = []     # finished sessions
+        self.events = 0
+        self._session = None   # open session: {"anchor", "start", "end", "apps", "counts", "switches"}
+        self._span = None      # (app, start second, counters) of the open focus span
+        self._last_second = None
+        self._clock = DayClock()
+
+    def add(self, event):
+        second = self._clock.second(event)
+        self.events += 1
+        if self._span is None:
+            # Events before the first focus_change belong to an unknown app
+            self._span = (None, second, [0] * len(COUNTERS))
+        elif second - self._last_second > self.idle_gap:
+            counts = self._span[2]
+            counts[4] += 1
+            counts[5] += second - self._last_second
+        counts = self._span[2]
+        event_type = event["type"]
+        if event_type == "keystroke":
+            counts[0] += event.get("count", 1)
+        elif event_type == "mouse_move":
+            counts[1] += event.get("distance_px", 0)
+        elif event_type == "mouse_click":
+            counts[2] += 1
+        elif event_type == "scroll":
+            counts[3] += abs(event.get("delta", 0))
+        elif event_type == "focus_change":
+            self._close_span(second)
+            self._span = (event.get("title", "Unknown"), second, [0] * len(COUNTERS))
+        self._last_second = second
+
+    def _close_span(self, end):
+        """Fold the open span into the open session, or finish that session and start another"""
+        app, start, counts = self._span
+        session = self._session
+        if session is None:
+            self._session = {"anchor": app, "start": start, "end": end, "apps": {app: end - start},
+                             "counts": counts, "switches": 0}
+            return
+        if app != session["anchor"] and end - start >= self.min_seconds:
+            if session["end"] - session["start"] >= self.min_seconds:
+                self.sessions.append(session)
+                self._session = {"anchor": app, "start": start, "end": end, "apps": {app: end - start},
+                                 "counts": counts, "switches": 0}
+                return
+            # Only micro-switches so far: they lead into this app's session
+            session["anchor"] = app
+        session["end"] = end
+        session["apps"][app] = session["apps"].get(app, 0) + end - start
+        session["counts"] = [a + b for a, b in zip(session["counts"], counts)]
+        session["switches"] += 1
+
+    def document(self, date_str):
+        """The sessions.json document; the open span ends at the last event"""
+        if self._span is not None:
+            self._close_span(self._last_second)
+            self.sessions.append(self._session)
+            self._span = self._session = None
+        return {
+            "version": SESSIONS_VERSION,
+            "date": date_str,
+            "min_seconds": self.min_seconds,
+            "idle_gap": self.idle_gap,
+            "events": self.events,
+            "sessions": [_session_entry(session, date_str) for session in self.sessions],
+        }
+
+    def write(self, path, date_str):
+        document = self.document(date_str)
+        with atomic_open(path, 'w') as f:
+            json.dump(document, f, separators=(",", ":"))
+        return document
+
+def _clock(date_str, second):
+    return f"{date_str}T{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}Z"
+
+def _session_entry(session, date_str):
+    # The main app is the one that held focus longest (spans before any focus_change have none)
+    apps = sorted(((seconds, app) for app, seconds in session["apps"].items() if app is not None), reverse=True)
+    entry = {
+        "app": apps[0][1] if apps else "Unknown",
+        "start": _clock(date_str, session["start"]),
+        "end": _clock(date_str, session["end"]),
+        "seconds": session["end"] - session["start"],
+        "focus_seconds": apps[0][0] if apps else 0,
+        "switches": session["switches"],
+    }
+    entry.update(zip(COUNTERS, session["counts"]))
+    entry["other_apps"] = [app for _, app in apps[1:OTHER_APPS + 1]]
+    return entry
+
+def load_sessions(day_dir):
+    """A day's sessions.json (from its folder or archive), or None if missing/unreadable"""
+    return load_day_json(day_dir, SESSIONS_FILE, SESSIONS_VERSION)
+
+def sessions_day(day_dir, force=False, min_seconds=MIN_SESSION_SECONDS, idle_gap=IDLE_GAP_SECONDS):
+    """Write sessions.json for one day; returns False if it was up to date"""
+    def same_params():
+        current = load_sessions(day_dir)
+        return current and (current["min_seconds"], current["idle_gap"]) == (min_seconds, idle_gap)
+    return write_sidecar(day_dir, SESSIONS_FILE, SessionBuilder(min_seconds, idle_gap), force, same_params)
+
+def sessions_tree(root, force=False, min_seconds=MIN_SESSION_SECONDS, idle_gap=IDLE_GAP_SECONDS):
+    """sessions.json for every day folder under root (or for root itself if it is a day folder)"""
+    return backfill_tree(root, lambda day_dir: sessions_day(day_dir, force, min_seconds, idle_gap), "segmenting")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Segment Atropos day files into focus sessions (sessions.json)")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR,
+                        help="data root, or one YYYY-MM-DD day folder (default: assets/demo_data)")
+    parser.add_argument("--min-seconds", type=int, default=MIN_SESSION_SECONDS,
+                        help=f"focus spans shorter than this fold into the session around them "
+                             f"(default: {MIN_SESSION_SECONDS})")
+    parser.add_argument("--idle-gap", type=int, default=IDLE_GAP_SECONDS,
+                        help=f"seconds without events that count as an idle gap (default: {IDLE_GAP_SECONDS})")
+    parser.add_argument("--force", action="store_true", help="rewrite sessions.json even if it is up to date")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    written, skipped = sessions_tree(args.data_dir, args.force, args.min_seconds, args.idle_gap)
+    print(f"✓ Segmented {written} days ({skipped} already up to date) under {args.data_dir}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Mergeable per-day distribution sketches (sketches.json)
+Usage: python sketches.py [--force] [data_dir | day_dir]
+
+Each sketch is a log-bucket histogram: a positive value v lands in bucket
+ceil(log(v) / log(gamma)), gamma = (1 + ALPHA) / (1 - ALPHA), so any
+quantile read back is within ALPHA (1%) of a true sample, and two sketches
+merge by adding their bucket counts. A day keeps:
+
+    keystrokes_per_min  keystrokes in each minute that has events
+    event_gap_s         seconds between successive event times (events
+                        sharing a timestamp count once)
+
+A few hundred buckets stand in for thousands of samples, so the analyzer
+answers p50/p90/p99 over any date range by merging day sketches (and the
+pyramid's month/quarter/year sketches for whole periods) without holding
+events in memory. The generator writes sketches.json for every day; run
+this script to backfill a tree.
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+from archive import load_day_json
+from telemetry_io import DayClock, atomic_open, backfill_tree, write_sidecar
+
+OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
+SKETCHES_FILE = "sketches.json"
+SKETCHES_VERSION = 1
+ALPHA = 0.01  # relative accuracy of quantiles
+SKETCHES = {
+    "keystrokes_per_min": "Keystrokes/min",
+    "event_gap_s": "Event gap (s)",
+}
+QUANTILES = [0.5, 0.9, 0.99]
+
+class LogHistogram:
+    """Fixed log-bucket histogram of non-negative values; merge() adds bucket counts"""
+
+    def __init__(self, alpha=ALPHA):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}  # bucket index -> count
+        self.zeros = 0
+        self.count = 0
+        self.min = self.max = None
+
+    def add(self, value, n=1):
+        if value <= 0:
+            self.zeros += n
+        else:
+            i = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        self.count += n
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if other.alpha != self.alpha:
+            raise ValueError(f"Cannot merge sketches of accuracy {other.alpha} into {self.alpha}")
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q (0-1), within alpha of a sample; None when empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if rank < seen:
+                value = 2 * self.gamma ** i / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        """JSON form: bucket counts as a dense list starting at bucket `offset`"""
+        offset = min(self.buckets, default=0)
+        counts = [0] * (max(self.buckets, default=-1) - offset + 1)
+        for i, n in self.buckets.items():
+            counts[i - offset] = n
+        return {"alpha": self.alpha, "count": self.count, "zeros": self.zeros, "min": self.min, "max": self.max,
+                "offset": offset, "counts": counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["alpha"])
+        sketch.buckets = {data["offset"] + i: n for i, n in enumerate(data["counts"]) if n}
+        sketch.zeros = data["zeros"]
+        sketch.count = data["count"]
+        sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+def merge_sketch_dicts(into, other):
+    """Fold one {name: sketch dict} into another (sketches.json / pyramid form); returns `into`"""
+    for name, data in other.items():
+        into[name] = (LogHistogram.from_dict(into[name]).merge(LogHistogram.from_dict(data)).to_dict()
+                      if name in into else data)
+    return into
+
+class SketchBuilder:
+    """Per-day sketches; feed add(event) in time order (either schema), then document()"""
+
+    def __init__(self, alpha=ALPHA):
+        self.sketches = {name: LogHistogram(alpha) for name in SKETCHES}
+        self._minute = None
+        self._keystrokes = 0
+        self._last_ms = None
+        self._clock = DayClock()
+
+    def add(self, event):
+        ms = self._clock.ms(event)
+        minute = ms // 60000
+        if minute != self._minute:
+            if self._minute is not None:
+                self.sketches["keystrokes_per_min"].add(self._keystrokes)
+            self._minute, self._keystrokes = minute, 0
+        if event["type"] == "keystroke":
+            self._keystrokes += event.get("count", 1)
+        if ms != self._last_ms:
+            if self._last_ms is not None:
+                self.sketches["event_gap_s"].add((ms - self._last_ms) / 1000)
+            self._last_ms = ms
+
+    def document(self, date_str):
+        """The sketches.json document; the last minute closes at the last event"""
+        if self._minute is not None:
+            self.sketches["keystrokes_per_min"].add(self._keystrokes)
+            self._minute = None
+        return {
+            "version": SKETCHES_VERSION,
+            "date": date_str,
+            "sketches": {name: sketch.to_dict() for name, sketch in self.sketches.items()},
+        }
+
+    def write(self, path, date_str):
+        document = self.document(date_str)
+        with atomic_open(path, 'w') as f:
+            json.dump(document, f, separators=(",", ":"))
+        return document
+
+def load_sketches(day_dir):
+    """A day's sketches.json (from its folder or archive), or None if missing/unreadable"""
+    return load_day_json(day_dir, SKETCHES_FILE, SKETCHES_VERSION)
+
+def sketches_day(day_dir, force=False):
+    """Write sketches.json for one day; returns False if it was up to date"""
+    return write_sidecar(day_dir, SKETCHES_FILE, SketchBuilder(), force)
+
+def sketches_tree(root, force=False):
+    """sketches.json for every day folder under root (or for root itself if it is a day folder)"""
+    return backfill_tree(root, lambda day_dir: sketches_day(day_dir, force), "sketching")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Per-day mergeable distribution sketches (sketches.json)")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=OUTPUT_DIR,
+                        help="data root, or one YYYY-MM-DD day folder (default: assets/demo_data)")
+    parser.add_argument("--force", action="store_true", help="rewrite sketches.json even if it is up to date")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    written, skipped = sketches_tree(args.data_dir, args.force)
+    print(f"✓ Sketched {written} days ({skipped} already up to date) under {args.data_dir}")
@@ -0,0 +1,532 @@
+"""
+Shared readers and writers for Atropos day files (raw_telemetry.json)
+
+Day files may be stored compressed (raw_telemetry.json.gz/.bz2/.xz). Readers
+locate them with telemetry_path() and open them with open_telemetry(), which
+decompresses as a stream, so plain and compressed days read the same way.
+
+Two event schemas exist (meta.version): 1.0.0 events carry an ISO "ts"
+string; 2.0.0 events carry "t", integer milliseconds since meta.base (the
+epoch milliseconds of 00:00 UTC on meta.date). The event_* helpers read the
+time of an event in either schema.
+
+Either schema may also be dictionary-encoded: meta.strings lists the day's
+event types, window titles, process names and mouse buttons, and events
+refer to them by index ("type": 1, "title": 3). Readers decode through an
+interned copy of the table, so every occurrence of a string is the same
+object instead of one fresh str per event.
+
+The per-day files derived from the events (rollup.json, sessions.json,
+activity.json, sketches.json) share their plumbing: DayClock gives a
+builder each event's time of day, write_sidecar() rebuilds a day's file
+once the day file is newer, and backfill_tree() runs that over a tree.
+"""
+
+import bz2
+import codecs
+import gzip
+import io
+import json
+import lzma
+import os
+import re
+import sys
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from pathlib import Path
+
+TELEMETRY_FILE = "raw_telemetry.json"
+SUMMARY_FILE = "daily_summary.md"
+
+def _gzip_file(path, mode):
+    # A fixed header mtime keeps compressed output reproducible
+    if hasattr(path, "read") or hasattr(path, "write"):
+        return gzip.GzipFile(fileobj=path, mode=mode, mtime=0)
+    return gzip.GzipFile(path, mode, mtime=0)
+
+# Compressed day files, by suffix (stdlib codecs only); each opener takes a
+# path or a binary file object
+CODECS = {".gz": _gzip_file, ".bz2": bz2.BZ2File, ".xz": lzma.LZMAFile}
+COMPRESSIONS = [suffix[1:] for suffix in CODECS]
+# Codecs the Electron app decodes too (Node's zlib has no bz2/xz): the only
+# ones offered by tools that write into a data root
+APP_COMPRESSIONS = ["gz"]
+TELEMETRY_NAMES = [TELEMETRY_FILE] + [TELEMETRY_FILE + suffix for suffix in CODECS]
+
+DATE_DIR_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Per-device data roots (devices/<device_id>/YYYY/MM/...) under a data root;
+# merge_devices.py combines them into the root's own day folders
+DEVICES_DIR = "devices"
+
+# On-disk layouts for raw_telemetry.json
+#   lines   - compact JSON, one event per line (default, append/seek friendly)
+#   compact - compact JSON on a single line
+#   pretty  - legacy json.dump(indent=2) output
+LAYOUTS = ["lines", "compact", "pretty"]
+
+SCHEMA_VERSION = "1.0.0"        # ISO "ts" per event
+EPOCH_SCHEMA_VERSION = "2.0.0"  # meta.base + integer "t" per event
+SCHEMA_VERSIONS = [SCHEMA_VERSION, EPOCH_SCHEMA_VERSION]
+
+_EPOCH = datetime(1970, 1, 1)
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+def iso_to_epoch_ms(ts):
+    """'2025-01-02T09:23:00Z' -> epoch milliseconds (UTC)"""
+    delta = datetime.fromisoformat(ts.replace("Z", "")) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+def epoch_ms_to_iso(ms):
+    """Inverse of iso_to_epoch_ms, in the generator's 'ts' format"""
+    return (_EPOCH + timedelta(milliseconds=ms)).isoformat() + "Z"
+
+def day_base(date_str):
+    """meta.base for a 'YYYY-MM-DD' day: epoch milliseconds of its 00:00 UTC"""
+    return iso_to_epoch_ms(date_str + "T00:00:00")
+
+def schema_base(meta):
+    """meta.base of a 2.0.0 day file, None for 1.0.0 files"""
+    return meta.get("base") if meta and meta.get("version") == EPOCH_SCHEMA_VERSION else None
+
+def epoch_events(events, base):
+    """Re-encode 1.0.0 events as 2.0.0: "ts" becomes "t", milliseconds since base"""
+    last = (None, 0)
+    for event in events:
+        ts = event["ts"]
+        # Events arrive in runs sharing a tick, so memoise the last parse
+        if ts != last[0]:
+            last = (ts, iso_to_epoch_ms(ts) - base)
+        encoded = {"t": last[1]}
+        encoded.update(event)
+        del encoded["ts"]
+        yield encoded
+
+def iso_event(event, base):
+    """1.0.0 copy of an event: "t" is formatted back into "ts" (no-op for 1.0.0 events)"""
+    t = event.get("t")
+    if t is None:
+        return event
+    decoded = {"ts": epoch_ms_to_iso(base + t)}
+    decoded.update(event)
+    del decoded["t"]
+    return decoded
+
+def event_ms(event, base=None):
+    """An event's time as epoch milliseconds, in either schema"""
+    t = event.get("t")
+    return base + t if t is not None else iso_to_epoch_ms(event["ts"])
+
+def event_ts(event, base=None):
+    """An event's ISO 'ts' string, formatted on demand for 2.0.0 events"""
+    ts = event.get("ts")
+    return ts if ts is not None else epoch_ms_to_iso(base + event["t"])
+
+def event_datetime(event, base=None):
+    """An event's time as a naive UTC datetime, in either schema"""
+    t = event.get("t")
+    if t is None:
+        return datetime.fromisoformat(event["ts"].replace("Z", ""))
+    return _EPOCH + timedelta(milliseconds=base + t)
+
+def event_times(events, base=None, as_datetime=False):
+    """
+    Yield each event's time: epoch-millisecond ints, or datetimes with
+    as_datetime=True. Datetimes are built one at a time as the caller
+    consumes them; for 2.0.0 days the ints cost one addition per event.
+    """
+    convert = event_datetime if as_datetime else event_ms
+    for event in events:
+        yield convert(event, base)
+
+def second_of_day(ts):
+    """'2025-01-02T09:23:15Z' -> 33795"""
+    return int(ts[11:13]) * 3600 + int(ts[14:16]) * 60 + int(ts[17:19])
+
+class DayClock:
+    """
+    Time of day of a day's events, fed in time order (either schema). 2.0.0
+    "t" already counts milliseconds from 00:00 UTC; 1.0.0 events arrive in
+    runs sharing a "ts" tick, so the last parse is memoised.
+    """
+
+    def __init__(self):
+        self._last_ts = (None, 0)
+
+    def second(self, event):
+        t = event.get("t")
+        if t is not None:
+            return t // 1000
+        ts = event["ts"]
+        if ts != self._last_ts[0]:
+            self._last_ts = (ts, second_of_day(ts))
+        return self._last_ts[1]
+
+    def ms(self, event):
+        t = event.get("t")
+        if t is not None:
+            return t
+        ts = event["ts"]
+        if ts != self._last_ts[0]:
+            self._last_ts = (ts, second_of_day(ts))
+        return self._last_ts[1] * 1000
+
+class StringTable:
+    """
+    Dictionary encoding for the string fields of a day's events; the table
+    is written as meta.strings and events carry indexes into it.
+    """
+
+    FIELDS = ("type", "title", "process", "button")
+
+    def __init__(self, strings=()):
+        self.strings = []
+        self.index = {}
+        for value in strings:
+            self.code(value)
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def encode(self, event):
+        """Copy of an event with its string fields replaced by table indexes"""
+        encoded = event
+        for key in self.FIELDS:
+            value = event.get(key)
+            if value is not None:
+                if encoded is event:
+                    encoded = dict(event)
+                encoded[key] = self.code(value)
+        return encoded
+
+def string_table(meta):
+    """Interned meta.strings of a dictionary-encoded day, None for plain days"""
+    strings = meta.get("strings") if meta else None
+    return None if strings is None else [sys.intern(value) for value in strings]
+
+def decode_event(event, table):
+    """Swap table indexes back for strings, in place; returns the event"""
+    for key in StringTable.FIELDS:
+        value = event.get(key)
+        if type(value) is int:
+            event[key] = table[value]
+    return event
+
+def decode_day(data):
+    """Decode a parsed day document's events in place if it is dictionary-encoded"""
+    table = string_table(data.get("meta"))
+    if table is not None:
+        for event in data.get("events", []):
+            decode_event(event, table)
+    return data
+
+def telemetry_path(day_dir):
+    """The day's telemetry file: plain if present, else a compressed one; None if neither"""
+    for name in TELEMETRY_NAMES:
+        path = Path(day_dir) / name
+        if path.exists():
+            return path
+    return None
+
+def open_telemetry(path, mode="rb"):
+    """
+    Open a day file for reading or writing, (de)compressing transparently
+    by suffix. Binary modes return a file object; text modes wrap it as UTF-8.
+    """
+    return _open_as(path, mode, Path(path).suffix)
+
+def _open_as(path, mode, suffix):
+    opener = CODECS.get(suffix)
+    if opener is None:
+        return open(path, mode) if "b" in mode else open(path, mode, encoding="utf-8")
+    f = opener(path, mode.replace("b", "").replace("t", ""))
+    return f if "b" in mode else io.TextIOWrapper(f, encoding="utf-8")
+
+@contextmanager
+def atomic_open(path, mode="wb"):
+    """
+    open_telemetry() for writing through a ".tmp" sibling that replaces
+    `path` only once the block completes, so a crash or an exception never
+    leaves a half-written file behind. Compression follows `path`'s suffix.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with _open_as(tmp_path, mode, path.suffix) as f:
+            yield f
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+def load_telemetry(path):
+    """Parse a whole day file, plain or compressed (string fields decoded)"""
+    with open_telemetry(path) as f:
+        return decode_day(json.load(f))
+
+def write_telemetry_stream(path, meta, events, on_event=None, metrics=None, layout="lines",
+                           on_offset=None, strings=None):
+    """
+    Write a day file from an event iterable without materialising it.
+    `path` is replaced atomically (see atomic_open); an already open binary
+    file may be passed instead.
+
+    Events are encoded and written one at a time; `on_event` sees each one
+    as it goes by (e.g. to accumulate totals) and `metrics` is a zero-arg
+    callable evaluated after the last event. The metrics block is therefore
+    written after "events" - key order is irrelevant to JSON.parse and to
+    Clotho's DailyPayload, which both read the object by key.
+    `on_offset(byte_offset, event)` receives where each event starts (in the
+    uncompressed stream when `path` has a compressed suffix).
+    With a StringTable as `strings`, the file is dictionary-encoded: the table
+    goes out first as meta.strings, so it must already hold every string the
+    events use. Callbacks still see the plain events.
+    Returns the metrics dict.
+    """
+    if layout not in ("lines", "compact"):
+        raise ValueError(f"Streaming layout must be 'lines' or 'compact', not {layout!r}")
+    encode = _ENCODER.encode
+    separator = b",\n" if layout == "lines" else b","
+    newline = "\n" if layout == "lines" else ""
+    if strings is not None:
+        meta = dict(meta, strings=list(strings.strings))
+
+    with (nullcontext(path) if hasattr(path, "write") else atomic_open(path)) as f:
+        position = f.write(('{"meta":' + encode(meta) + "," + newline + '"events":[' + newline).encode("utf-8"))
+        first = True
+        for event in events:
+            if on_event:
+                on_event(event)
+            if not first:
+                position += f.write(separator)
+            if on_offset:
+                on_offset(position, event)
+            position += f.write(encode(strings.encode(event) if strings else event).encode("utf-8"))
+            first = False
+        if strings is not None and len(strings.strings) != len(meta["strings"]):
+            raise ValueError("Events used strings missing from the table written in meta")
+        block = metrics() if metrics else {}
+        f.write((newline + "]," + newline + '"metrics":' + encode(block) + "}\n").encode("utf-8"))
+    return block
+
+class EventStream:
+    """
+    Incremental parser for the "events" array of a day file.
+
+    Reads a binary file in chunks and decodes one event at a time, so memory
+    is bounded by the chunk size whatever the layout, and yields each event
+    with its byte offset so a reader can later seek straight back to it.
+    Pass `offset` (a byte offset previously yielded, or one just past an
+    event) to resume inside the array without reading what precedes it.
+
+        with open(path, "rb") as f:
+            for byte_offset, event in EventStream(f):
+                ...
+
+    Top-level values that precede "events" (meta, and metrics in the pretty
+    layout) are collected in `header`, also when resuming from an offset.
+    Events of dictionary-encoded days come out decoded. A truncated file
+    stops cleanly and sets `truncated`; `end_offset` is the byte offset just
+    past "]".
+    """
+
+    def __init__(self, f, offset=None, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.header = {}
+        self.truncated = False
+        self.end_offset = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        # Byte offset of _text[_mark]; advanced lazily so each char is encoded once
+        self._mark = 0
+        self._mark_bytes = 0
+        f.seek(0)
+        self._seek_events_array()
+        if offset is not None:
+            # The header is small and always first; now jump to the event
+            self._decoder.reset()
+            self._text = ""
+            self._pos = self._mark = 0
+            self._eof = self._done = False
+            self._mark_bytes = offset
+            f.seek(offset)
+        self.strings = string_table(self.header.get("meta"))
+
+    def offset(self):
+        """Byte offset of the parser's current position"""
+        if self._pos != self._mark:
+            self._mark_bytes += len(self._text[self._mark:self._pos].encode("utf-8"))
+            self._mark = self._pos
+        return self._mark_bytes
+
+    def _fill(self):
+        self.offset()
+        self._text = self._text[self._pos:]
+        self._pos = self._mark = 0
+        data = self.f.read(self.chunk_size)
+        if data:
+            self._text += self._decoder.decode(data)
+        else:
+            self._text += self._decoder.decode(b"", final=True)
+            self._eof = True
+
+    def _peek(self):
+        """Next non-whitespace character ("" at end of file)"""
+        while True:
+            text, pos = self._text, self._pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(text):
+                return text[pos]
+            if self._eof:
+                return ""
+            self._fill()
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number ending at the buffer edge may continue in the next chunk
+            if end == len(self._text) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _seek_events_array(self):
+        if self._peek() != "{":
+            raise ValueError("Day file is not a JSON object")
+        self._pos += 1
+        while True:
+            c = self._peek()
+            if c == ",":
+                self._pos += 1
+                continue
+            if c in ("}", ""):
+                self._done = True
+                return
+            key = self._value()
+            if self._peek() != ":":
+                raise ValueError(f"Malformed day file near key {key!r}")
+            self._pos += 1
+            if key == "events":
+                if self._peek() != "[":
+                    raise ValueError('"events" is not an array')
+                self._pos += 1
+                return
+            self.header[key] = self._value()
+
+    def __iter__(self):
+        strings = self.strings
+        while not self._done:
+            c = self._peek()
+            if c == ",":
+                self._pos += 1
+                continue
+            if c == "]":
+                self._pos += 1
+                self.end_offset = self.offset()
+                self._done = True
+                return
+            if c == "":
+                self.truncated = True
+                return
+            start = self.offset()
+            try:
+                event = self._value()
+            except ValueError:
+                self.truncated = True
+                return
+            if strings is not None:
+                decode_event(event, strings)
+            yield start, event
+
+def stream_events(path, offset=None):
+    """Yield a day file's events one at a time (optionally from a byte offset)"""
+    with open_telemetry(path) as f:
+        for _, event in EventStream(f, offset):
+            yield event
+
+def day_dir_for(root, date_str):
+    """YYYY/MM/YYYY-MM-DD folder for a date string under a data root"""
+    return Path(root) / date_str[:4] / date_str[5:7] / date_str
+
+def _date_dirs(folder):
+    """Date-named folders anywhere below folder (not descending into them)"""
+    for child in folder.iterdir():
+        if not child.is_dir():
+            continue
+        if DATE_DIR_RE.match(child.name):
+            yield child
+        else:
+            yield from _date_dirs(child)
+
+def iter_day_dirs(root):
+    """
+    Yield every day folder under root, in date order. Besides the
+    YYYY/MM/YYYY-MM-DD layout used here, this finds Clotho's own
+    YYYY/Qn/Month/Week_n/YYYY-MM-DD folders under ~/Moirai_Data.
+    """
+    root = Path(root)
+    for year_dir in sorted(root.glob("*")):
+        if not year_dir.is_dir() or not year_dir.name.isdigit():
+            continue
+        yield from sorted(_date_dirs(year_dir), key=lambda d: d.name)
+
+def write_sidecar(day_dir, name, builder, force=False, is_current=None):
+    """
+    Feed the day's events to `builder` (RollupBuilder, SessionBuilder, ...)
+    and write its per-day file `name`, unless that file is at least as new
+    as the day file and is_current() (if given, e.g. a parameter check)
+    agrees. Returns False if nothing was written.
+    """
+    day_dir = Path(day_dir)
+    source = telemetry_path(day_dir)
+    target = day_dir / name
+    if source is None:
+        return False
+    if not force and target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        if is_current is None or is_current():
+            return False
+    with open_telemetry(source) as f:
+        for _, event in EventStream(f):
+            builder.add(event)
+    builder.write(target, day_dir.name)
+    return True
+
+def backfill_tree(root, day_fn, action):
+    """
+    day_fn(day_dir) for every day folder under root (or for root itself if it
+    is a day folder); returns (written, skipped) from its True/False results.
+    A failing day is reported as "Error <action> <day_dir>" and skipped.
+    """
+    root = Path(root)
+    day_dirs = [root] if DATE_DIR_RE.match(root.name) else iter_day_dirs(root)
+    written = skipped = 0
+    for day_dir in day_dirs:
+        try:
+            if day_fn(day_dir):
+                written += 1
+            else:
+                skipped += 1
+        except Exception as e:
+            print(f"Error {action} {day_dir}: {e}")
+    return written, skipped
@@ -3,33 +3,85 @@
 Quick demo data test - View a random sample day
 """
 
-import json
+import argparse
+import math
 import random
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from multiprocessing import Pool
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from archive import load_day_telemetry, read_day_file
+from columnar import ColumnarDay, fresh_columnar
+from manifest import available_dates, date_exists, refresh_manifest, manifest_dates
+from telemetry_io import iso_event, iter_day_dirs, schema_base, telemetry_path
+
 OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
 
 def get_random_day():
-    """Get a random day from the dataset"""
-    # Get all date directories
-    all_dates = []
-    
-    for year_dir in OUTPUT_DIR.glob("*"):
-        if not year_dir.is_dir() or year_dir.name == "user.json":
-            continue
-        for month_dir in year_dir.glob("*"):
-            if not month_dir.is_dir():
-                continue
-            for day_dir in month_dir.glob("*"):
-                if day_dir.is_dir() and (day_dir / "raw_telemetry.json").exists():
-                    all_dates.append(day_dir.name)
-    
-    if not all_dates:
+    """
+    Get a random day from the dataset.
+    Picks from manifest.json (refreshed first) instead of walking the tree;
+    if the pick is deleted in between, the pick is retried.
+    """
+    dates = sample_days(1)
+    if not dates:
         print("❌ No demo data found!")
         return None
-    
-    return random.choice(all_dates)
+    return dates[0]
+
+def sample_days(count):
+    """Sample up to `count` distinct dates that still exist on disk"""
+    all_dates = available_dates(OUTPUT_DIR)
+    picks = random.sample(all_dates, min(count, len(all_dates)))
+    if all(date_exists(OUTPUT_DIR, d) for d in picks):
+        return picks
+    all_dates = manifest_dates(refresh_manifest(OUTPUT_DIR)[0])
+    return random.sample(all_dates, min(count, len(all_dates)))
+
+def load_day(date_str):
+    """Load one day's headline figures; used as a parallel smoke check"""
+    day_dir = OUTPUT_DIR / date_str[:4] / date_str[5:7] / date_str
+    try:
+        columnar_file = fresh_columnar(day_dir)
+        if columnar_file:
+            with ColumnarDay(columnar_file) as day:
+                metrics, total_events = day.metrics, day.rows
+        else:
+            data = load_day_telemetry(day_dir)
+            metrics, total_events = data.get("metrics", {}), len(data.get("events", []))
+        return {"date": date_str, "metrics": metrics, "events": total_events, "error": None}
+    except Exception as e:
+        return {"date": date_str, "metrics": {}, "events": 0, "error": str(e)}
+
+def smoke_test(count, workers=4):
+    """Load `count` distinct random days in parallel and report each one"""
+    dates = sorted(sample_days(count))
+    if not dates:
+        print("❌ No demo data found!")
+        return False
+    with Pool(max(1, min(workers, len(dates)))) as pool:
+        results = pool.map(load_day, dates)
+
+    print("\n" + "=" * 70)
+    print(f"🎲 {len(results)} RANDOM DAYS")
+    print("=" * 70)
+    failures = 0
+    for r in results:
+        if r["error"] or not r["events"]:
+            failures += 1
+            print(f"  ✗ {r['date']}  {r['error'] or 'no events'}")
+            continue
+        m = r["metrics"]
+        print(f"  ✓ {r['date']}  flow {m.get('flow_score_estimate', 0):>3}/100  "
+              f"{m.get('total_keystrokes', 0):>8,} keys  {r['events']:>7,} events  {m.get('top_window', 'Unknown')}")
+    print("=" * 70)
+    print("✓ All days loaded" if not failures else f"✗ {failures} day(s) failed to load")
+    print("=" * 70 + "\n")
+    return failures == 0
 
 def quick_view(date_str):
     """Quick view of a day's data"""
@@ -38,14 +90,19 @@ def quick_view(date_str):
     month = date.strftime("%m")
     day_dir = OUTPUT_DIR / year / month / date_str
     
-    telemetry_file = day_dir / "raw_telemetry.json"
-    summary_file = day_dir / "daily_summary.md"
-    
-    with open(telemetry_file, 'r') as f:
-        data = json.load(f)
-    
-    metrics = data.get("metrics", {})
-    events = data.get("events", [])
+    # The columnar file lets us decode just the rows we show
+    columnar_file = fresh_columnar(day_dir)
+    if columnar_file:
+        with ColumnarDay(columnar_file) as day:
+            metrics = day.metrics
+            total_events = day.rows
+            events = list(day.iter_events(0, 5))
+    else:
+        data = load_day_telemetry(day_dir)
+        metrics = data.get("metrics", {})
+        base = schema_base(data.get("meta"))
+        total_events = len(data.get("events", []))
+        events = [iso_event(event, base) for event in data.get("events", [])[:5]]
     
     print("\n" + "=" * 70)
     print(f"🎲 RANDOM DAY: {date.strftime('%A, %B %d, %Y').upper()}")
@@ -54,7 +111,7 @@ def quick_view(date_str):
     print(f"\n⚡ Quick Stats:")
     print(f"  • Flow Score: {metrics.get('flow_score_estimate', 0)}/100")
     print(f"  • Keystrokes: {metrics.get('total_keystrokes', 0):,}")
-    print(f"  • Events: {len(events):,}")
+    print(f"  • Events: {total_events:,}")
     print(f"  • Top App: {metrics.get('top_window', 'Unknown')}")
     print(f"  • Active Time: {1440 - metrics.get('idle_minutes', 0):,} minutes")
     
@@ -78,10 +135,8 @@ def quick_view(date_str):
             print(f"  {i}. [{time}] {event_type}")
     
     # Show summary excerpt
-    if summary_file.exists():
-        with open(summary_file, 'r') as f:
-            summary = f.read()
-        
+    summary = read_day_file(day_dir, "daily_summary.md")
+    if summary:
         # Extract overview
         lines = summary.split('\n')
         overview_start = False
@@ -100,7 +155,150 @@ def quick_view(date_str):
     print(f"✨ Try another? Run: python scripts/test_demo_data.py")
     print("=" * 70 + "\n")
 
+def _ks_statistic(a, b):
+    """Two-sample Kolmogorov-Smirnov statistic D"""
+    a, b = sorted(a), sorted(b)
+    i = j = 0
+    d = 0.0
+    while i < len(a) and j < len(b):
+        x = min(a[i], b[j])
+        while i < len(a) and a[i] == x:
+            i += 1
+        while j < len(b) and b[j] == x:
+            j += 1
+        d = max(d, abs(i / len(a) - j / len(b)))
+    return d
+
+def _mean_z(a, b):
+    """z-score of the difference between the means of two samples"""
+    def moments(xs):
+        m = sum(xs) / len(xs)
+        return m, sum((x - m) ** 2 for x in xs) / max(1, len(xs) - 1)
+    (ma, va), (mb, vb) = moments(a), moments(b)
+    se = math.sqrt(va / len(a) + vb / len(b))
+    return ma, mb, (ma - mb) / se if se else 0.0
+
+def compare_engines(days=60):
+    """
+    Check that the batched NumPy engine matches the scalar reference engine:
+    per-type event counts per day, calculate_metrics output and the
+    per-event payload distributions must agree statistically.
+    """
+    import generate_demo_data as gen
+
+    start = datetime(2025, 3, 3)
+    samples = {engine: {"counts": [], "metrics": [], "values": {}} for engine in gen.ENGINES}
+    for engine in gen.ENGINES:
+        for i in range(days):
+            date = start + timedelta(days=i)
+            random.seed(gen.day_seed(gen.MASTER_SEED, date))
+            events = gen.generate_events_for_day(date, engine=engine)
+            samples[engine]["counts"].append(Counter(e["type"] for e in events))
+            samples[engine]["metrics"].append(gen.calculate_metrics(events, date))
+            values = samples[engine]["values"]
+            for e in events:
+                for field in ("count", "distance_px", "delta"):
+                    if field in e:
+                        values.setdefault(field, []).append(e[field])
+                if e["type"] == "mouse_click":
+                    values.setdefault("right_click", []).append(e["button"] == "right")
+
+    py, vec = samples["python"], samples["numpy"]
+    failures = 0
+    print("=" * 70)
+    print(f"🧪 ENGINE EQUIVALENCE ({days} days, python vs numpy)")
+    print("=" * 70)
+
+    print(f"\n  {'per-day mean':28s} {'python':>10s} {'numpy':>10s} {'z':>7s}")
+    rows = [(f"{t} events", [c[t] for c in py["counts"]], [c[t] for c in vec["counts"]])
+            for t in gen.EVENT_TYPES]
+    rows += [(key, [m[key] for m in py["metrics"]], [m[key] for m in vec["metrics"]])
+             for key in ("total_keystrokes", "total_mouse_dist_pixels", "idle_minutes", "flow_score_estimate")]
+    for name, a, b in rows:
+        ma, mb, z = _mean_z(a, b)
+        ok = abs(z) < 4
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {name:26s} {ma:10.1f} {mb:10.1f} {z:7.2f}")
+
+    print(f"\n  {'payload distribution':28s} {'KS D':>10s} {'limit':>10s}")
+    for field in ("count", "distance_px", "delta", "right_click"):
+        a, b = py["values"][field], vec["values"][field]
+        d = _ks_statistic(a, b)
+        limit = 1.95 * math.sqrt((len(a) + len(b)) / (len(a) * len(b)))  # alpha = 0.001
+        ok = d < limit
+        failures += not ok
+        print(f"  {'✓' if ok else '✗'} {field:26s} {d:10.4f} {limit:10.4f}")
+
+    print("\n" + "=" * 70)
+    print("✓ Engines are equivalent" if not failures else f"✗ {failures} check(s) failed")
+    print("=" * 70 + "\n")
+    return failures == 0
+
+def clotho_day_dir(root, date_str):
+    """Day folder as Clotho and Lachesis lay it out: YYYY/Qn/Month/Week_n/YYYY-MM-DD"""
+    date = datetime.strptime(date_str, "%Y-%m-%d")
+    quarter = (date.month - 1) // 3 + 1
+    week = date.isocalendar()[1]
+    return Path(root) / str(date.year) / f"Q{quarter}" / date.strftime("%B") / f"Week_{week}" / date_str
+
+def check_clotho_layout(days=5):
+    """
+    Copy a few demo days into Clotho's folder layout, run sessions.py on the
+    copy's root and check that every day got a sessions.json in the folder
+    Lachesis reads, covering all of the day's events.
+    """
+    from sessions import load_sessions, sessions_tree
+
+    sources = [d for d in iter_day_dirs(OUTPUT_DIR) if telemetry_path(d)][:days]
+    print("=" * 70)
+    print(f"🧪 CLOTHO LAYOUT ({len(sources)} days, YYYY/Qn/Month/Week_n)")
+    print("=" * 70)
+    if not sources:
+        print("❌ No demo data found!")
+        return False
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as root:
+        for day_dir in sources:
+            target = clotho_day_dir(root, day_dir.name)
+            target.mkdir(parents=True)
+            shutil.copy2(telemetry_path(day_dir), target)
+        sessions_tree(root)
+        for day_dir in sources:
+            target = clotho_day_dir(root, day_dir.name)
+            sessions = load_sessions(target)
+            events = len(load_day_telemetry(target).get("events", []))
+            ok = sessions is not None and sessions["events"] == events
+            failures += not ok
+            found = f"{len(sessions['sessions'])} sessions, {sessions['events']:,} events" if sessions else "no sessions.json"
+            print(f"  {'✓' if ok else '✗'} {target.relative_to(root)}  {found}")
+
+    print("=" * 70)
+    print("✓ sessions.json written where Lachesis reads it" if not failures else f"✗ {failures} day(s) failed")
+    print("=" * 70 + "\n")
+    return failures == 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Spot-check generated demo data")
+    parser.add_argument("--compare-engines", action="store_true",
+                        help="check the NumPy event engine against the scalar one")
+    parser.add_argument("--clotho-layout", action="store_true",
+                        help="check sessions.py on a copy of a few days in Clotho's folder layout")
+    parser.add_argument("--count", type=int, default=0,
+                        help="load K distinct random days in parallel instead of viewing one")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="processes used by --count (default: 4)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.compare_engines:
+        sys.exit(0 if compare_engines() else 1)
+    if args.clotho_layout:
+        sys.exit(0 if check_clotho_layout() else 1)
+    if args.count:
+        sys.exit(0 if smoke_test(args.count, args.workers) else 1)
+
     random_date = get_random_day()
     if random_date:
         quick_view(random_date)
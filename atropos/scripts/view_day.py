@@ -2,13 +2,19 @@
 """
 View demo data for a specific date
 Usage: python view_day.py 2025-06-15
+       python view_day.py 2025-06-15 --from 14:00 --to 14:05
+       python view_day.py 2025-06-15 --offset 20000 --limit 50
 """
 
-import json
-import sys
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+from archive import day_exists, find_archive, read_day_file
+from day_events import load_day_events
+from event_index import read_page, read_window
+from telemetry_io import epoch_ms_to_iso, telemetry_path
+
 OUTPUT_DIR = Path(__file__).parent.parent / "assets" / "demo_data"
 
 def view_day(date_str):
@@ -24,24 +30,27 @@ def view_day(date_str):
     month = date.strftime("%m")
     day_dir = OUTPUT_DIR / year / month / date_str
     
-    if not day_dir.exists():
+    # Days of closed quarters live in archive/YYYY-Qn.zip once compacted
+    archive = None if day_dir.exists() else find_archive(day_dir)
+    if not day_dir.exists() and archive is None:
         print(f"❌ No data found for {date_str}")
         print(f"   Looking in: {day_dir}")
         return
     
-    telemetry_file = day_dir / "raw_telemetry.json"
-    summary_file = day_dir / "daily_summary.md"
-    
-    if not telemetry_file.exists():
+    if archive is None and telemetry_path(day_dir) is None:
         print(f"❌ Telemetry file not found for {date_str}")
         return
     
-    # Load telemetry
-    with open(telemetry_file, 'r') as f:
-        data = json.load(f)
-    
-    metrics = data.get("metrics", {})
-    events = data.get("events", [])
+    # Column-backed events: a fresh raw_telemetry.col is copied as-is, a
+    # day file is parsed once and kept as typed columns
+    day = load_day_events(day_dir)
+    metrics = day.metrics
+    total_events = len(day)
+    event_types = day.type_counts()
+    titles = [title or "Unknown" for _, _, title, _ in day.focus_segments()]
+    span = day.span()
+    first_event = epoch_ms_to_iso(span[0]) if span else ""
+    last_event = epoch_ms_to_iso(span[1]) if span else ""
     
     # Display
     print("=" * 70)
@@ -59,25 +68,18 @@ def view_day(date_str):
     
     print(f"\n📝 EVENTS")
     print("─" * 70)
-    print(f"  Total Events:      {len(events):,}")
-    
-    # Event breakdown
-    event_types = {}
-    for event in events:
-        event_type = event.get("type", "unknown")
-        event_types[event_type] = event_types.get(event_type, 0) + 1
+    print(f"  Total Events:      {total_events:,}")
     
     for event_type, count in sorted(event_types.items(), key=lambda x: x[1], reverse=True):
-        percentage = (count / len(events)) * 100 if events else 0
+        percentage = (count / total_events) * 100 if total_events else 0
         print(f"    - {event_type:15s} {count:6,} ({percentage:5.1f}%)")
     
     # App switching
-    focus_changes = [e for e in events if e.get("type") == "focus_change"]
-    unique_apps = set(e.get("title", "Unknown") for e in focus_changes)
+    unique_apps = set(titles)
     
     print(f"\n🔄 APPLICATION ACTIVITY")
     print("─" * 70)
-    print(f"  Focus Changes:     {len(focus_changes):,}")
+    print(f"  Focus Changes:     {len(titles):,}")
     print(f"  Unique Apps Used:  {len(unique_apps)}")
     
     if unique_apps:
@@ -88,10 +90,7 @@ def view_day(date_str):
             print(f"    ... and {len(unique_apps) - 15} more")
     
     # Time range
-    if events:
-        first_event = events[0].get("ts", "")
-        last_event = events[-1].get("ts", "")
-        
+    if total_events:
         try:
             first_time = datetime.fromisoformat(first_event.replace("Z", ""))
             last_time = datetime.fromisoformat(last_event.replace("Z", ""))
@@ -106,26 +105,86 @@ def view_day(date_str):
             pass
     
     # Summary
-    if summary_file.exists():
+    summary = read_day_file(day_dir, "daily_summary.md")
+    if summary:
         print(f"\n📄 DAILY SUMMARY")
         print("─" * 70)
-        with open(summary_file, 'r') as f:
-            summary = f.read()
         # Print first few lines
         lines = summary.split('\n')
         for line in lines[:15]:
             print(f"  {line}")
         if len(lines) > 15:
-            print(f"\n  ... (view full summary in {summary_file})")
+            print(f"\n  ... (view full summary in {archive or day_dir / 'daily_summary.md'})")
     
     print("\n" + "=" * 70)
-    print(f"✓ Data loaded from: {day_dir}")
+    print(f"✓ Data loaded from: {archive or day_dir}")
     print("=" * 70 + "\n")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python view_day.py YYYY-MM-DD")
-        print("Example: python view_day.py 2025-06-15")
-        sys.exit(1)
+def format_event(event):
+    """One-line rendering of an event for the paged listing"""
+    event_type = event.get("type", "unknown")
+    if event_type == "focus_change":
+        detail = f"{event.get('title')} ({event.get('process')})"
+    elif event_type == "keystroke":
+        detail = f"{event.get('count', 0)} keys"
+    elif event_type == "mouse_move":
+        detail = f"{event.get('distance_px', 0)} px"
+    elif event_type == "mouse_click":
+        detail = f"{event.get('button', '')} button"
+    elif event_type == "scroll":
+        detail = f"delta {event.get('delta', 0)}"
+    else:
+        detail = ""
+    return f"{event.get('ts', '')[11:19]}  {event_type:13s} {detail}"
+
+def view_events(date_str, start=None, end=None, offset=0, limit=100):
+    """
+    List a slice of the day's events: a time window (--from/--to, HH:MM[:SS])
+    or a page (--offset/--limit). Only the part of the file around the slice
+    is read, via the offset sidecar or the columnar ts column.
+    """
+    day_dir = OUTPUT_DIR / date_str[:4] / date_str[5:7] / date_str
+    if not day_exists(day_dir):
+        print(f"❌ No data found for {date_str}")
+        print(f"   Looking in: {day_dir}")
+        return
+    
+    if start or end:
+        events = read_window(day_dir,
+                             f"{date_str}T{start}" if start else None,
+                             f"{date_str}T{end}" if end else None)
+        events = events[offset:offset + limit]
+        label = f"{start or '00:00'} - {end or '24:00'}"
+    else:
+        events = read_page(day_dir, offset, limit)
+        label = f"events {offset:,} - {offset + len(events):,}"
     
-    view_day(sys.argv[1])
+    print("=" * 70)
+    print(f"📅 {date_str} · {label}")
+    print("=" * 70)
+    for number, event in events:
+        print(f"  #{number:<7,} {format_event(event)}")
+    if not events:
+        print("  (no events)")
+    print("=" * 70)
+    print(f"✓ {len(events)} events shown\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="View demo data for a specific date")
+    parser.add_argument("date", help="date to view (YYYY-MM-DD)")
+    parser.add_argument("--from", dest="start", metavar="HH:MM[:SS]",
+                        help="list events from this time of day")
+    parser.add_argument("--to", dest="end", metavar="HH:MM[:SS]",
+                        help="list events before this time of day")
+    parser.add_argument("--offset", type=int, default=None,
+                        help="list events starting at this event number")
+    parser.add_argument("--limit", type=int, default=100,
+                        help="maximum events to list (default: 100)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.start or args.end or args.offset is not None:
+        view_events(args.date, args.start, args.end, args.offset or 0, args.limit)
+    else:
+        view_day(args.date)
@@ -1,5 +1,5 @@
 export interface TelemetryEvent {
-    ts: string;
+    ts: string | number; // ISO string, or epoch ms for schema 2.0.0 day files
     type: string;
     title?: string;
     details?: string;
@@ -77,10 +77,14 @@ func getQuarter(date time.Time) int {
 	}
 }
 
-// TelemetryData matches the structure produced by Clotho
+// TelemetryData matches the structure produced by Clotho. Days written with a
+// string table (atropos/scripts/convert_schema.py --string-table) list their
+// strings once in meta.strings and store an index in place of an event's
+// title and type, so those two fields are decoded with Text.
 type TelemetryData struct {
 	Meta struct {
-		Date string `json:"date"`
+		Date    string   `json:"date"`
+		Strings []string `json:"strings"`
 	} `json:"meta"`
 	Metrics struct {
 		TotalKeystrokes int     `json:"total_keystrokes"`
@@ -89,11 +93,31 @@ type TelemetryData struct {
 		TopWindow       string  `json:"top_window"`
 	} `json:"metrics"`
 	Events []struct {
-		Title string `json:"title"`
-		Type  string `json:"type"`
+		Title json.RawMessage `json:"title"`
+		Type  json.RawMessage `json:"type"`
 	} `json:"events"`
 }
 
+// Text decodes an event field that is either a string or an index into
+// meta.strings (a missing or null field is "").
+func (d *TelemetryData) Text(field json.RawMessage) (string, error) {
+	if len(field) == 0 {
+		return "", nil
+	}
+	var text string
+	if err := json.Unmarshal(field, &text); err == nil {
+		return text, nil
+	}
+	var index int
+	if err := json.Unmarshal(field, &index); err != nil {
+		return "", fmt.Errorf("event field %s is neither a string nor a string-table index", field)
+	}
+	if index < 0 || index >= len(d.Meta.Strings) {
+		return "", fmt.Errorf("string-table index %d outside meta.strings (%d entries)", index, len(d.Meta.Strings))
+	}
+	return d.Meta.Strings[index], nil
+}
+
 func (p *Processor) AnalyzeDay() (string, *models.DailySummary, error) {
 	// 1. Read Telemetry
 	content, err := os.ReadFile(p.DataPath)
@@ -105,7 +129,7 @@ func (p *Processor) AnalyzeDay() (string, *models.DailySummary, error) {
 	systemPrompt := `You are Lachesis, the Digital Biographer. You analyze raw telemetry data (mouse movement, window focus) to write a daily summary.
     
 Your Task:
-1. Analyze the provided JSON telemetry.
+1. Analyze the provided JSON telemetry (raw events, or focus sessions with per-session activity counts).
 2. Identify "Flow State" periods (long focus on one app).
 3. Identify "Context Switching" (rapid changes).
 4. Determine the dominant emotion (Focus, Frustration, Exploration).
@@ -120,10 +144,11 @@ JSON Format:
     "top_activities": ["App 1", "App 2"]
 }`
 
-	userPrompt := fmt.Sprintf("Here is the telemetry data for %s:\n\n%s", p.Date.Format("2006-01-02"), string(content))
+	promptData := p.promptContext(content)
+	userPrompt := fmt.Sprintf("Here is the telemetry data for %s:\n\n%s", p.Date.Format("2006-01-02"), string(promptData))
 
 	// 3. Check token budget before API call
-	estimatedTokens := len(content)/4 + 500 // rough estimate: ~4 chars per token + response
+	estimatedTokens := len(promptData)/4 + 500 // rough estimate: ~4 chars per token + response
 	if !p.budget.CanSpend(estimatedTokens) {
 		log.Println("TOKEN BUDGET EXHAUSTED. Falling back to offline mode.")
 		return p.offlineFallback(content)
@@ -158,6 +183,62 @@ JSON Format:
 	return markdown, &summary, nil
 }
 
+// promptContext returns the telemetry sent to the model. When the day folder
+// has a sessions.json (focus sessions written by atropos/scripts/sessions.py),
+// the day's meta, metrics and sessions replace the raw event log, which cuts
+// a day from thousands of events to a few dozen sessions. Clotho appends to
+// today's file every 30 seconds, so sessions.json is only used while it is at
+// least as new as the day file and covers the same number of events.
+func (p *Processor) promptContext(content []byte) []byte {
+	sessionsPath := filepath.Join(p.DailyDir, "sessions.json")
+	sessionsInfo, err := os.Stat(sessionsPath)
+	if err != nil {
+		return content
+	}
+	if dataInfo, err := os.Stat(p.DataPath); err == nil && sessionsInfo.ModTime().Before(dataInfo.ModTime()) {
+		log.Printf("CONTEXT: sessions.json is older than the telemetry, sending raw events")
+		return content
+	}
+	sessions, err := os.ReadFile(sessionsPath)
+	if err != nil {
+		return content
+	}
+
+	var raw struct {
+		Meta    json.RawMessage   `json:"meta"`
+		Metrics json.RawMessage   `json:"metrics"`
+		Events  []json.RawMessage `json:"events"`
+	}
+	if err := json.Unmarshal(content, &raw); err != nil {
+		log.Printf("WARN: Could not parse telemetry header, sending raw events: %v", err)
+		return content
+	}
+	var covered struct {
+		Events int `json:"events"`
+	}
+	if err := json.Unmarshal(sessions, &covered); err != nil {
+		log.Printf("WARN: Could not parse sessions.json, sending raw events: %v", err)
+		return content
+	}
+	if covered.Events != len(raw.Events) {
+		log.Printf("CONTEXT: sessions.json covers %d of %d events, sending raw events", covered.Events, len(raw.Events))
+		return content
+	}
+
+	compact, err := json.Marshal(map[string]json.RawMessage{
+		"meta":     raw.Meta,
+		"metrics":  raw.Metrics,
+		"sessions": sessions,
+	})
+	if err != nil {
+		log.Printf("WARN: Could not use sessions.json, sending raw events: %v", err)
+		return content
+	}
+
+	log.Printf("CONTEXT: Sending focus sessions (%d bytes) instead of raw events (%d bytes)", len(compact), len(content))
+	return compact
+}
+
 // analyzeScreenshots reads up to 3 most recent screenshots from visual_snaps/
 // and sends them to the vision model for context analysis.
 func (p *Processor) analyzeScreenshots() string {
@@ -260,8 +341,13 @@ func (p *Processor) offlineFallback(rawData []byte) (string, *models.DailySummar
 	// Count unique apps from events
 	uniqueApps := make(map[string]bool)
 	for _, e := range data.Events {
-		if e.Title != "" {
-			uniqueApps[e.Title] = true
+		title, err := data.Text(e.Title)
+		if err != nil {
+			log.Printf("ERROR parsing telemetry in offline mode: %v", err)
+			return "", nil, err
+		}
+		if title != "" {
+			uniqueApps[title] = true
 		}
 	}
 